@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Add the listing GSI attributes to canvas items written before the indexes existed.
+
+Canvases and versions only appear in the paged listings once the canvas table
+has both listing indexes and its items carry ``customer_canvas_id`` (and, for
+drafts, ``draft_updated_at``). New writes set the attributes; run this once to
+cover an existing table: it first adds any missing index and waits until it is
+ACTIVE, then writes the attributes to older items.
+
+Usage:
+    python scripts/backfill_canvas_listing_index.py
+"""
+
+import os
+import sys
+import logging
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from src.infra.dynamodb.manager import add_missing_indexes
+from src.infra.dynamodb.tables import CANVAS_TABLE
+from src.storage.dynamodb.canvas_dao import CanvasDAO
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    dao = CanvasDAO()
+    for index_name in add_missing_indexes(dao.manager.client, CANVAS_TABLE):
+        logger.info(f"Added index {index_name}")
+    updated = dao.backfill_listing_attributes()
+    logger.info(f"Backfilled listing attributes on {updated} canvas items")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Measure event-loop latency while N Bedrock generations are in flight.
+
+The Bedrock client is replaced by a stub whose ``invoke_model`` blocks the calling
+thread for ``--delay`` seconds, the same way a real boto3 call does. A probe coroutine
+wakes up every 10 ms and records how late it was scheduled; if generation blocked the
+event loop, the probe lag would grow with the generation time and count.
+
+Usage:
+    python scripts/benchmarks/bedrock_event_loop_latency.py --generations 32 --delay 1.0
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.inference.bedrock_inference import BedrockInference
+
+
+class SlowBedrockClient:
+    """Stand-in for the bedrock-runtime client that blocks like a real invoke_model call."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def invoke_model(self, modelId: str, body: str):
+        time.sleep(self.delay)
+        payload = json.dumps({"content": [{"text": "<Code>print('hello')</Code>"}]})
+        return {"body": io.BytesIO(payload.encode("utf-8"))}
+
+
+async def probe_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> list:
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run(generations: int, delay: float, max_concurrency: int) -> None:
+    inference = BedrockInference(max_concurrency=max_concurrency, queue_timeout=3600)
+    inference.client = SlowBedrockClient(delay)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(stop))
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(inference.generate("prompt") for _ in range(generations)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    lags = await probe
+    errors = [r.error for r in responses if r.error]
+
+    print(f"generations:      {generations} (max concurrency {max_concurrency}, {delay:.2f}s each)")
+    print(f"wall clock:       {elapsed:.2f}s")
+    print(f"errors:           {len(errors)}")
+    print(f"loop lag p50:     {statistics.median(lags) * 1000:.2f} ms")
+    print(f"loop lag p95:     {sorted(lags)[int(len(lags) * 0.95) - 1] * 1000:.2f} ms")
+    print(f"loop lag max:     {max(lags) * 1000:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generations", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=1.0)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args.generations, args.delay, args.max_concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Compare CodeParser.parse against the previous multi-regex implementation.
+
+Builds a synthetic response of roughly ``--size-kb`` kilobytes made of reasoning
+steps and many code files spread over the new/updated/deleted sections, checks
+that both parsers agree, and reports the mean time per parse.
+
+Usage:
+    python scripts/benchmarks/code_parser_throughput.py --size-kb 200 --files 100
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.agents.llm_response_parsers.code_parser import CodeParser
+from src.api.models.dataplane_models import ProgrammingLanguage, LanguageName, CodeFile
+
+LANGUAGE = ProgrammingLanguage(name=LanguageName.PYTHON, version="3.11")
+
+
+def regex_parse(response: str, node_id: str):
+    """The previous implementation: one non-greedy DOTALL scan per tag and section."""
+    sections = {}
+    for section in ("NewCodeFiles", "UpdatedCodeFiles", "DeletedCodeFiles"):
+        files = []
+        section_match = re.search(rf'<{section}>(.*?)</{section}>', response, re.DOTALL)
+        if section_match:
+            for match in re.finditer(r'<CodeFile>(.*?)</CodeFile>', section_match.group(1), re.DOTALL):
+                file_path_match = re.search(r'<FilePath>(.*?)</FilePath>', match.group(1), re.DOTALL)
+                code_match = re.search(r'<Code>(.*?)</Code>', match.group(1), re.DOTALL)
+                if file_path_match and code_match:
+                    files.append(CodeFile(
+                        nodeId=node_id,
+                        filePath=file_path_match.group(1).strip(),
+                        code=code_match.group(1).strip(),
+                        programmingLanguage=LANGUAGE
+                    ))
+        sections[section] = files
+    reasoning = []
+    reasoning_match = re.search(r'<Reasoning>(.*?)</Reasoning>', response, re.DOTALL)
+    if reasoning_match:
+        for match in re.finditer(r'<Step>(.*?)</Step>', reasoning_match.group(1), re.DOTALL):
+            reason_match = re.search(r'<Reason>(.*?)</Reason>', match.group(1), re.DOTALL)
+            if reason_match:
+                reasoning.append(reason_match.group(1).strip())
+    return sections, reasoning
+
+
+def build_response(size_kb: int, files: int) -> str:
+    line = "    value = compute(items[index]) if index < limit else default  # keep going\n"
+    lines_per_file = max(1, (size_kb * 1024) // files // len(line))
+    body = "def handler(items, limit, default):\n" + line * lines_per_file
+
+    def code_files(prefix: str, count: int) -> str:
+        return "".join(
+            f"<CodeFile><FilePath>{prefix}/module_{i}.py</FilePath><Code>{body}</Code></CodeFile>\n"
+            for i in range(count)
+        )
+
+    reasoning = "".join(f"<Step><Reason>Step {i}: update the module layout</Reason></Step>\n" for i in range(20))
+    return (
+        f"<Reasoning>\n{reasoning}</Reasoning>\n"
+        f"<NewCodeFiles>\n{code_files('new', files // 2)}</NewCodeFiles>\n"
+        f"<UpdatedCodeFiles>\n{code_files('updated', files - files // 2 - 1)}</UpdatedCodeFiles>\n"
+        f"<DeletedCodeFiles>\n{code_files('deleted', 1)}</DeletedCodeFiles>\n"
+    )
+
+
+def time_per_call(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=200)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    response = build_response(args.size_kb, args.files)
+    code_parser = CodeParser(canvas_id="canvas", node_id="node")
+
+    parsed = code_parser.parse(response, LANGUAGE)
+    sections, reasoning = regex_parse(response, "node")
+    assert parsed.addedFiles == sections["NewCodeFiles"]
+    assert parsed.updatedFiles == sections["UpdatedCodeFiles"]
+    assert parsed.deletedFiles == sections["DeletedCodeFiles"]
+    assert [step.reason for step in parsed.reasoningSteps] == reasoning
+
+    regex_seconds = time_per_call(lambda: regex_parse(response, "node"), args.iterations)
+    single_pass_seconds = time_per_call(lambda: code_parser.parse(response, LANGUAGE), args.iterations)
+
+    print(f"response size:    {len(response) / 1024:.0f} KB, {args.files} files")
+    print(f"regex parse:      {regex_seconds * 1000:.2f} ms")
+    print(f"single pass:      {single_pass_seconds * 1000:.2f} ms")
+    print(f"speedup:          {regex_seconds / single_pass_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
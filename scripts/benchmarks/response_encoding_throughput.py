@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Compare API response encoding against the previous handle_response walk.
+
+Builds a GetCanvasResponse with ``--nodes`` nodes of every type plus edges,
+checks that each encoder produces the expected JSON document,
+and reports the mean time to encode one response body against the previous
+``to_dict``-then-JSONResponse path. The orjson encoder is skipped when orjson is not installed.
+
+Usage:
+    python scripts/benchmarks/response_encoding_throughput.py --nodes 500
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import dataclasses
+from enum import Enum
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from fastapi.responses import JSONResponse
+
+from src.api.models.canvas_models import GetCanvasResponse
+from src.api.models.edge_models import CanvasEdge, CanvasEdgeType
+from src.api.models.node_models import CanvasNode, CanvasNodeType, NodePosition
+from src.api.models.node_configs.ddb_node_config import DynamoDbNodeConfig, DynamoDBAttributeConfig, DynamoDBAttributeType
+from src.api.models.node_configs.s3_node_config import S3BucketNodeConfig, S3BucketDirectory
+from src.api.models.node_configs.api_service_node_config import ApiServiceNodeConfig, ApiEndpoint
+from src.api.models.node_configs.custom_service_node_config import CustomServiceNodeConfig
+from src.api.response_encoder import CompiledJSONEncoder, OrjsonEncoder, dataclass_keys, orjson
+
+
+def legacy_encode(data) -> bytes:
+    """The previous implementation: a recursive to_dict walk rendered by JSONResponse."""
+    def serialize_data(obj):
+        if isinstance(obj, list):
+            return [serialize_data(item) for item in obj]
+        elif isinstance(obj, dict):
+            return {k: serialize_data(v) for k, v in obj.items()}
+        elif hasattr(obj, 'to_dict'):
+            return obj.to_dict()
+        return obj
+
+    return JSONResponse(content=serialize_data(data)).body
+
+
+def reference_json(obj):
+    """The expected document, built by a plain walk. The previous path rendered enums as {}
+    because the node enums are also dataclasses; both encoders render their values."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj):
+        return {key: reference_json(getattr(obj, name)) for name, key in dataclass_keys(obj.__class__)}
+    if isinstance(obj, list):
+        return [reference_json(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: reference_json(value) for key, value in obj.items()}
+    return obj
+
+
+def build_node(index: int) -> CanvasNode:
+    kind = index % 4
+    if kind == 0:
+        node_type = CanvasNodeType.DYNAMO_DB
+        config = DynamoDbNodeConfig(
+            hashKey="customerId",
+            attributes=[
+                DynamoDBAttributeConfig(name="customerId", type=DynamoDBAttributeType.STRING),
+                DynamoDBAttributeConfig(name="createdAt", type=DynamoDBAttributeType.NUMBER)
+            ]
+        )
+    elif kind == 1:
+        node_type = CanvasNodeType.S3_BUCKET
+        config = S3BucketNodeConfig(directories=[
+            S3BucketDirectory(path=f"uploads/{index}/", description="User uploads"),
+            S3BucketDirectory(path=f"exports/{index}/", description="Nightly exports")
+        ])
+    elif kind == 2:
+        node_type = CanvasNodeType.API_SERVICE
+        config = ApiServiceNodeConfig(apiEndpoints=[
+            ApiEndpoint(path=f"/items/{index}", method="GET", description="Fetch an item"),
+            ApiEndpoint(path="/items", method="POST", description="Create an item, with \"quotes\" and ünïcode")
+        ])
+    else:
+        node_type = CanvasNodeType.CUSTOM_SERVICE
+        config = CustomServiceNodeConfig(description=f"Worker {index} that reconciles orders\nevery hour")
+    return CanvasNode(
+        nodeId=f"node-{index}",
+        nodeName=f"Node {index}",
+        nodeType=node_type,
+        nodePosition=NodePosition(x=index * 12.5, y=index % 40 * 30),
+        nodeConfig=config
+    )
+
+
+def build_response(nodes: int) -> dict:
+    response = GetCanvasResponse(
+        canvasId="canvas-1",
+        canvasVersion="7",
+        canvasName="Benchmark canvas",
+        createdAt="2024-01-01T00:00:00",
+        updatedAt="2024-01-02T00:00:00",
+        nodes=[build_node(i) for i in range(nodes)],
+        edges=[
+            CanvasEdge(edgeType=CanvasEdgeType.COMPOSITION, source=f"node-{i}", target=f"node-{i + 1}")
+            for i in range(nodes - 1)
+        ]
+    )
+    # Shaped as CanvasApiHandler.get_canvas returns it
+    return response.__dict__
+
+
+def time_per_call(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    data = build_response(args.nodes)
+    encoders = [CompiledJSONEncoder()]
+    if orjson is not None:
+        encoders.append(OrjsonEncoder())
+
+    legacy_body = legacy_encode(data)
+    expected = reference_json(data)
+    for encoder in encoders:
+        assert json.loads(encoder.encode(data)) == expected, f"{encoder.name} output differs"
+
+    legacy_seconds = time_per_call(lambda: legacy_encode(data), args.iterations)
+    print(f"response size:    {len(legacy_body) / 1024:.0f} KB, {args.nodes} nodes")
+    print(f"previous walk:    {legacy_seconds * 1000:.2f} ms")
+    for encoder in encoders:
+        seconds = time_per_call(lambda: encoder.encode(data), args.iterations)
+        print(f"{encoder.name + ':':<18}{seconds * 1000:.2f} ms ({legacy_seconds / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Load-test GET /api/v1/canvas/{id} at increasing concurrency.
+
+Requests go through the real FastAPI app over an in-process ASGI transport. The
+DynamoDB and S3 DAOs are replaced by stubs that block their thread for
+``--delay`` seconds per call, like boto3 does. The test runs twice: once with
+storage calls made inline on the event loop (the old behaviour) and once on the
+bounded storage I/O pool. Inline, latency grows with the number of requests in
+flight; on the pool it stays flat until the pool is saturated.
+
+Usage:
+    python scripts/benchmarks/storage_concurrency_load_test.py --concurrency 1 10 50 100 --delay 0.02
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import statistics
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import httpx
+from src.app import app
+from src.api import canvas_api
+from src.api.auth.cognito_auth import CognitoAuth
+from src.storage.coordinator.base_coordinator import BaseCoordinator
+from src.storage.models.models import CanvasDO
+from src.storage.canvas_definition_cache import CanvasDefinitionCache
+
+
+class SlowCanvasDAO:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def get_canvas(self, customer_id: str, canvas_id: str, canvas_version: str) -> CanvasDO:
+        time.sleep(self.delay)
+        return CanvasDO(
+            canvas_name="Load test",
+            customer_id=customer_id,
+            canvas_id=canvas_id,
+            canvas_version=canvas_version,
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T00:00:00",
+            canvas_definition_s3_uri=f"s3://bucket/canvas-definitions/{customer_id}/{canvas_id}/{canvas_version}.json"
+        )
+
+
+class SlowS3DAO:
+    bucket_name = "bucket"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def get_object(self, s3_uri: str) -> str:
+        time.sleep(self.delay)
+        return json.dumps({"nodes": [], "edges": []})
+
+    def get_object_with_etag(self, s3_uri: str, if_none_match=None):
+        return self.get_object(s3_uri), None
+
+
+async def run_inline(self, fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+async def measure(client: httpx.AsyncClient, concurrency: int, rounds: int) -> list:
+    latencies = []
+
+    async def one_request():
+        started = time.perf_counter()
+        response = await client.get("/api/v1/canvas/canvas-1")
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    for _ in range(rounds):
+        await asyncio.gather(*(one_request() for _ in range(concurrency)))
+    return latencies
+
+
+async def run(concurrency_levels: list, delay: float, rounds: int) -> None:
+    coordinator = canvas_api.canvas_handler.coordinator
+    coordinator.canvas_dao = SlowCanvasDAO(delay)
+    coordinator.s3_dao = SlowS3DAO(delay)
+    coordinator.definition_cache = CanvasDefinitionCache(max_bytes=0)
+    app.dependency_overrides[CognitoAuth.get_customer_id] = lambda: "load-test-customer"
+
+    offloaded_run_io = BaseCoordinator.run_io
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+        print(f"two blocking storage calls of {delay * 1000:.0f} ms per request, {rounds} rounds per level")
+        print(f"{'mode':<10} {'in flight':>9} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+        for mode, run_io in (("inline", run_inline), ("executor", offloaded_run_io)):
+            BaseCoordinator.run_io = run_io
+            for concurrency in concurrency_levels:
+                started = time.perf_counter()
+                latencies = sorted(await measure(client, concurrency, rounds))
+                elapsed = time.perf_counter() - started
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                print(
+                    f"{mode:<10} {concurrency:>9} {statistics.median(latencies) * 1000:>9.1f} "
+                    f"{p99 * 1000:>9.1f} {len(latencies) / elapsed:>9.0f}"
+                )
+    BaseCoordinator.run_io = offloaded_run_io
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.concurrency, args.delay, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
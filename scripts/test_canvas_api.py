@@ -36,7 +36,7 @@ class CanvasApiTester:
         request = CreateCanvasRequest(
             canvasName="Test Canvas",
         )
-        return self.handler.create_canvas(self.customer_id, request)
+        return await self.handler.create_canvas(self.customer_id, request)
 
     async def test_get_canvas(self, canvas_id: str) -> Dict[str, Any]:
         """Test getting a canvas by ID."""
@@ -44,7 +44,7 @@ class CanvasApiTester:
             canvasId=canvas_id,
             canvasVersion="draft"
         )
-        return self.handler.get_canvas(self.customer_id, request)
+        return await self.handler.get_canvas(self.customer_id, request)
 
     async def test_update_canvas(self, canvas_id: str) -> Dict[str, Any]:
         """Test updating a canvas."""
@@ -52,31 +52,31 @@ class CanvasApiTester:
             canvasId=canvas_id,
             canvasName="Updated Test Canvas"
         )
-        return self.handler.update_canvas(self.customer_id, request)
+        return await self.handler.update_canvas(self.customer_id, request)
 
     async def test_delete_canvas(self, canvas_id: str) -> Dict[str, Any]:
         """Test deleting a canvas."""
         request = DeleteCanvasRequest(
             canvasId=canvas_id
         )
-        return self.handler.delete_canvas(self.customer_id, request)
+        return await self.handler.delete_canvas(self.customer_id, request)
 
     async def test_list_canvases(self) -> Dict[str, Any]:
         """Test listing all canvases."""
         request = ListCanvasRequest()
-        return self.handler.list_canvases(self.customer_id, request)
+        return await self.handler.list_canvases(self.customer_id, request)
 
     async def test_list_canvas_versions(self, canvas_id: str) -> Dict[str, Any]:
         """Test listing canvas versions."""
         request = ListCanvasVersionsRequest(
             canvasId=canvas_id,
         )
-        return self.handler.list_canvas_versions(self.customer_id, request)
+        return await self.handler.list_canvas_versions(self.customer_id, request)
 
     async def test_create_canvas_version(self, canvas_id: str) -> Dict[str, Any]:
         """Test creating a new canvas version."""
         request = CreateCanvasVersionRequest(canvasId=canvas_id)
-        return self.handler.create_canvas_version(self.customer_id, request)
+        return await self.handler.create_canvas_version(self.customer_id, request)
 
     async def run_all_tests(self):
         """Run all tests in sequence."""
@@ -1,18 +1,57 @@
 from typing import Any
-from src.inference.openai_inference import OpenAIInference
-from src.inference.bedrock_inference import BedrockInference
+from src.inference.client_registry import inference_client_registry
+from src.inference import BaseLLMInference
+from src.inference.rate_limiter import RateLimitedInference, rate_limiter_registry
+from src.inference.router import RoutingInference
+from src.inference.response_cache import CachingInference, ResponseCacheMetrics, create_response_cache_backend
 from src.storage.coordinator.base_coordinator import StorageCoordinatorError
 from src.api.models.node_models import CanvasNode
 from src.api.models.dataplane_models import ProgrammingLanguage
 from src.agents.node_agents.coding_agent import CodingAgent
+from src.agents.coordinator.canvas_generation_scheduler import CanvasGenerationScheduler, CanvasGenerationResult
 from src.storage.models.models import CanvasDefinitionDO, CanvasDO
 from src.agents.models.agent_models import InvokeAgentRequest, InvokeAgentQuerySource
-from src.api.models.dataplane_models import CodeFile
+from src.api.models.dataplane_models import CodeFile, CodeStreamEvent
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json, LetterCase
-from typing import List
+from typing import List, Optional, Set, AsyncIterator
 from src.agents.models.parser_models import CodeParserResponse
 import logging
+from src.config.settings import CANVAS_GENERATION_MAX_PARALLELISM, INFERENCE_PROVIDER, INFERENCE_ROUTER_PROVIDERS
+
+logger = logging.getLogger(__name__)
+
+# Shared by every request so identical prompts are served from one cache
+response_cache_backend = create_response_cache_backend()
+response_cache_metrics = ResponseCacheMetrics()
+
+# Created on first use so its latency statistics are shared by every request
+inference_router: Optional[RoutingInference] = None
+
+
+def get_rate_limited_client(provider: str) -> BaseLLMInference:
+    """Get the shared client for a provider behind its admission control."""
+    client = inference_client_registry.get(provider)
+    limiter = rate_limiter_registry.get(provider, client.get_model_info().get("model"))
+    return RateLimitedInference(client, limiter)
+
+
+def get_inference_router() -> RoutingInference:
+    """Get the shared router over INFERENCE_ROUTER_PROVIDERS.
+
+    Providers whose client cannot be created, e.g. OpenAI without an API key,
+    are left out.
+    """
+    global inference_router
+    if inference_router is None:
+        providers = {}
+        for provider in INFERENCE_ROUTER_PROVIDERS:
+            try:
+                providers[provider] = get_rate_limited_client(provider)
+            except Exception as e:
+                logger.warning(f"Inference provider {provider} unavailable for routing: {str(e)}")
+        inference_router = RoutingInference(providers)
+    return inference_router
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -25,11 +64,19 @@ class AgentCoordinator:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def _get_inference_client(self, provider: str = "bedrock"):
-        """Get the appropriate inference client based on provider."""
-        if provider == "openai":
-            return OpenAIInference()
-        return BedrockInference()
+    def _get_inference_client(self, provider: str = INFERENCE_PROVIDER, bypass_cache: bool = False):
+        """Get the shared inference client for the provider, behind admission control and the response cache.
+
+        Provider "auto" routes between providers by latency and health. Cache hits
+        never reach the router or rate limiters, so they do not use provider quota.
+        """
+        if provider == "auto":
+            client = get_inference_router()
+        else:
+            client = get_rate_limited_client(provider)
+        if response_cache_backend is None:
+            return client
+        return CachingInference(client, response_cache_backend, response_cache_metrics, bypass=bypass_cache)
 
   
     async def generate_code(
@@ -39,11 +86,12 @@ class AgentCoordinator:
         canvas: CanvasDO,
         language: ProgrammingLanguage,
         existing_code: List[CodeFile],
-        inference_provider: str = "bedrock"
+        inference_provider: str = INFERENCE_PROVIDER,
+        bypass_cache: bool = False
     ) -> AgentCoordinatorGenerateCodeResponse:
         try:
             agent = CodingAgent (
-                inference_client=self._get_inference_client(inference_provider),
+                inference_client=self._get_inference_client(inference_provider, bypass_cache),
                 node=node,
                 canvas_definition=canvas_definition,
                 canvas=canvas
@@ -58,10 +106,67 @@ class AgentCoordinator:
                 existing_code=existing_code
             )
 
+            if response.error_message:
+                raise StorageCoordinatorError(response.error_message)
+            if response.canvas_error_message:
+                self.logger.warning(f"Returning node code without canvas code: {response.canvas_error_message}")
+
             return AgentCoordinatorGenerateCodeResponse (
                 code_parser_response=response.code_parser_response
             )
 
         except Exception as e:
             self.logger.error(f"Error generating code: {str(e)}")
-            raise StorageCoordinatorError(f"Failed to generate code: {str(e)}") 
\ No newline at end of file
+            raise StorageCoordinatorError(f"Failed to generate code: {str(e)}") 
+
+    def stream_code(
+        self,
+        node: CanvasNode,
+        canvas_definition: CanvasDefinitionDO,
+        canvas: CanvasDO,
+        language: ProgrammingLanguage,
+        existing_code: List[CodeFile],
+        inference_provider: str = INFERENCE_PROVIDER,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[CodeStreamEvent]:
+        """Generate code for a node, streaming each file as soon as the model has written it."""
+        agent = CodingAgent(
+            inference_client=self._get_inference_client(inference_provider, bypass_cache),
+            node=node,
+            canvas_definition=canvas_definition,
+            canvas=canvas
+        )
+        return agent.stream_agent(
+            invoke_agent_request=InvokeAgentRequest(
+                query="Generate code for the node",
+                query_source=InvokeAgentQuerySource.USER
+            ),
+            language=language,
+            existing_code=existing_code
+        )
+
+    async def generate_canvas_code(
+        self,
+        canvas_definition: CanvasDefinitionDO,
+        canvas: CanvasDO,
+        language: ProgrammingLanguage,
+        existing_code: List[CodeFile],
+        max_parallelism: Optional[int] = None,
+        node_ids: Optional[Set[str]] = None,
+        inference_provider: str = INFERENCE_PROVIDER,
+        bypass_cache: bool = False
+    ) -> CanvasGenerationResult:
+        """Generate code for every node of a canvas (or the given subset), then the canvas itself."""
+        try:
+            parallelism = min(max_parallelism or CANVAS_GENERATION_MAX_PARALLELISM, CANVAS_GENERATION_MAX_PARALLELISM)
+            scheduler = CanvasGenerationScheduler(
+                inference_client=self._get_inference_client(inference_provider, bypass_cache),
+                canvas=canvas,
+                canvas_definition=canvas_definition,
+                language=language,
+                max_parallelism=parallelism
+            )
+            return await scheduler.run(existing_code, node_ids=node_ids)
+        except Exception as e:
+            self.logger.error(f"Error generating canvas code: {str(e)}")
+            raise StorageCoordinatorError(f"Failed to generate canvas code: {str(e)}")
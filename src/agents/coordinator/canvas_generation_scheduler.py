@@ -0,0 +1,201 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from src.inference import BaseLLMInference
+from src.agents.node_agents.coding_agent import CodingAgent
+from src.agents.prompt_formatters.code_formatter import CodePromptFormatter
+from src.agents.models.agent_models import InvokeAgentRequest, InvokeAgentQuerySource
+from src.agents.models.parser_models import CodeParserResponse
+from src.api.models.dataplane_models import CodeFile, ProgrammingLanguage
+from src.storage.models.models import CanvasDefinitionDO, CanvasDO
+
+logger = logging.getLogger(__name__)
+
+
+class CanvasCycleError(ValueError):
+    """Raised when the canvas edges do not form a DAG."""
+    pass
+
+
+@dataclass
+class NodeGenerationResult:
+    node_id: str
+    code_parser_response: Optional[CodeParserResponse] = None
+    error_message: Optional[str] = None
+
+
+@dataclass
+class CanvasGenerationResult:
+    # Keyed by node ID, in the order the nodes finished
+    node_results: Dict[str, NodeGenerationResult] = field(default_factory=dict)
+    canvas_parser_response: Optional[CodeParserResponse] = None
+    canvas_error_message: Optional[str] = None
+    # Existing code with every successful result applied, as the next prompt would see it
+    final_code: List[CodeFile] = field(default_factory=list)
+
+
+def apply_parser_response(code: List[CodeFile], owner_id: str, response: CodeParserResponse) -> List[CodeFile]:
+    """Return ``code`` with a generation result for ``owner_id`` applied."""
+    replaced_paths = {f.filePath for f in response.deletedFiles}
+    replaced_paths.update(f.filePath for f in response.updatedFiles)
+    replaced_paths.update(f.filePath for f in response.addedFiles)
+    merged = [
+        f for f in code
+        if not (f.nodeId == owner_id and f.filePath in replaced_paths)
+    ]
+    merged.extend(response.updatedFiles)
+    merged.extend(response.addedFiles)
+    return merged
+
+
+class CanvasGenerationScheduler:
+    """Generates code for a whole canvas, following the dependency DAG of its edges.
+
+    A node is generated once all of the nodes it depends on have finished, so its
+    prompt sees their fresh code as ``dependencies_code``. Independent nodes run
+    concurrently, at most ``max_parallelism`` at a time. The canvas-level prompt
+    runs last, against the combined result.
+    """
+
+    def __init__(
+        self,
+        inference_client: BaseLLMInference,
+        canvas: CanvasDO,
+        canvas_definition: CanvasDefinitionDO,
+        language: ProgrammingLanguage,
+        max_parallelism: int,
+    ):
+        self.inference_client = inference_client
+        self.canvas = canvas
+        self.canvas_definition = canvas_definition
+        self.language = language
+        self.max_parallelism = max(1, max_parallelism)
+        self.formatter = CodePromptFormatter()
+        self.invoke_agent_request = InvokeAgentRequest(
+            query="Generate code for the node",
+            query_source=InvokeAgentQuerySource.USER
+        )
+
+    def build_dependency_map(self) -> Dict[str, List[str]]:
+        """Map each node ID to the IDs of the nodes it depends on."""
+        return {
+            node.nodeId: [dep.nodeId for dep in self.formatter.find_dependency_nodes(node, self.canvas_definition)]
+            for node in self.canvas_definition.nodes
+        }
+
+    def topological_order(self) -> List[str]:
+        """Order node IDs so every node comes after its dependencies (Kahn's algorithm).
+
+        Raises:
+            CanvasCycleError: If the edges contain a cycle
+        """
+        dependencies = self.build_dependency_map()
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in dependencies}
+        remaining = {node_id: len(deps) for node_id, deps in dependencies.items()}
+        for node_id, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(node_id)
+
+        ready = [node_id for node_id, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            node_id = ready.pop(0)
+            order.append(node_id)
+            for dependent in dependents[node_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(dependencies):
+            cyclic = sorted(node_id for node_id, count in remaining.items() if count > 0)
+            raise CanvasCycleError(f"Canvas edges contain a cycle between nodes: {', '.join(cyclic)}")
+        return order
+
+    async def run(
+        self,
+        existing_code: List[CodeFile],
+        node_ids: Optional[Set[str]] = None,
+        include_canvas_prompt: bool = True,
+    ) -> CanvasGenerationResult:
+        """Generate the canvas.
+
+        Args:
+            existing_code: Current code of the canvas
+            node_ids: Only generate these nodes; the rest keep their existing code.
+                Defaults to every node on the canvas.
+            include_canvas_prompt: Whether to run the canvas-level prompt at the end
+
+        Returns:
+            CanvasGenerationResult: Per-node results and the canvas-level result
+        """
+        order = self.topological_order()
+        dependencies = self.build_dependency_map()
+        nodes_by_id = {node.nodeId: node for node in self.canvas_definition.nodes}
+        scheduled = [node_id for node_id in order if node_ids is None or node_id in node_ids]
+
+        result = CanvasGenerationResult(final_code=list(existing_code or []))
+        finished = {node_id: asyncio.Event() for node_id in scheduled}
+        slots = asyncio.Semaphore(self.max_parallelism)
+
+        async def generate_node(node_id: str) -> None:
+            try:
+                for dep in dependencies[node_id]:
+                    if dep in finished:
+                        await finished[dep].wait()
+                async with slots:
+                    agent = CodingAgent(
+                        inference_client=self.inference_client,
+                        node=nodes_by_id[node_id],
+                        canvas_definition=self.canvas_definition,
+                        canvas=self.canvas
+                    )
+                    response = await agent.run_node_prompt(
+                        self.invoke_agent_request,
+                        self.language,
+                        list(result.final_code)
+                    )
+                if response is None:
+                    result.node_results[node_id] = NodeGenerationResult(
+                        node_id=node_id,
+                        error_message="No text response received from inference"
+                    )
+                    return
+                result.final_code = apply_parser_response(result.final_code, node_id, response)
+                result.node_results[node_id] = NodeGenerationResult(node_id=node_id, code_parser_response=response)
+            except Exception as e:
+                logger.error(f"Error generating code for node {node_id}: {str(e)}")
+                # Dependents still run, against this node's existing code
+                result.node_results[node_id] = NodeGenerationResult(node_id=node_id, error_message=str(e))
+            finally:
+                finished[node_id].set()
+
+        tasks = [asyncio.create_task(generate_node(node_id)) for node_id in scheduled]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if include_canvas_prompt:
+            try:
+                agent = CodingAgent(
+                    inference_client=self.inference_client,
+                    node=None,
+                    canvas_definition=self.canvas_definition,
+                    canvas=self.canvas
+                )
+                canvas_response = await agent.run_canvas_prompt(
+                    self.invoke_agent_request,
+                    self.language,
+                    list(result.final_code)
+                )
+                if canvas_response is not None:
+                    result.canvas_parser_response = canvas_response
+                    result.final_code = apply_parser_response(result.final_code, self.canvas.canvas_id, canvas_response)
+            except Exception as e:
+                logger.warning(f"Canvas prompt failed for canvas {self.canvas.canvas_id}: {str(e)}")
+                result.canvas_error_message = str(e)
+
+        return result
@@ -1,13 +1,158 @@
-import re
 import logging
-from typing import List, Optional
-from dataclasses import dataclass
-from ..models.parser_models import CodeFile, CodeParserResponse, ReasoningStep
+from typing import Dict, List, Optional, Union
+from ..models.parser_models import CodeFile, CodeParserResponse, ReasoningStep, CodeFileAction, ParsedCodeFile
 from src.api.models.dataplane_models import ProgrammingLanguage
 
 logger = logging.getLogger(__name__)
 
 
+class IncrementalCodeParser:
+    """Parser for code generation responses that arrive in chunks.
+
+    A single left-to-right pass over the text drives a small state machine over the
+    known tags: the current section (``<Reasoning>`` or one of the code file
+    sections), the open element (``<CodeFile>`` or ``<Step>``) and the field being
+    captured (``<FilePath>``, ``<Code>`` or ``<Reason>``). Field contents are taken
+    verbatim up to their closing tag, so code may contain ``<`` freely.
+
+    ``feed`` returns each code file and reasoning step as soon as it is complete;
+    only the unfinished field or partial tag is kept between chunks. Missing
+    ``</CodeFile>``, ``</Step>`` and section closing tags are tolerated: the next
+    element, section or the end of the response completes the open element. A
+    field still open at the end of the response is truncated and dropped.
+    """
+
+    SECTION_ACTIONS = {
+        "Reasoning": None,
+        "NewCodeFiles": CodeFileAction.ADDED,
+        "UpdatedCodeFiles": CodeFileAction.UPDATED,
+        "DeletedCodeFiles": CodeFileAction.DELETED,
+    }
+    ELEMENTS = ("CodeFile", "Step")
+    # Field tag -> element it belongs to
+    FIELDS = {"FilePath": "CodeFile", "Code": "CodeFile", "Reason": "Step"}
+    _MAX_TAG_LENGTH = max(len(tag) for tag in (*SECTION_ACTIONS, *ELEMENTS, *FIELDS)) + len("</>")
+
+    def __init__(self, canvas_id: str, node_id: Optional[str], language: ProgrammingLanguage, isCanvas: bool = False):
+        self.owner_id = canvas_id if isCanvas else node_id
+        self.language = language
+        self._buffer = ""
+        self._section: Optional[str] = None
+        self._element: Optional[str] = None
+        self._element_fields: Dict[str, str] = {}
+        self._field: Optional[str] = None
+        self._field_parts: List[str] = []
+        self._files = {action: [] for action in CodeFileAction}
+        self._reasoning_steps: List[ReasoningStep] = []
+
+    def feed(self, text: str) -> List[Union[ParsedCodeFile, ReasoningStep]]:
+        """Consume the next chunk of the response and return the elements it completed."""
+        buffer = self._buffer + text
+        events = []
+        pos = 0
+        while True:
+            if self._field:
+                closing_tag = f"</{self._field}>"
+                end = buffer.find(closing_tag, pos)
+                if end < 0:
+                    # Hand over everything that cannot be the start of the closing tag
+                    keep_from = max(pos, len(buffer) - len(closing_tag) + 1)
+                    self._field_parts.append(buffer[pos:keep_from])
+                    pos = keep_from
+                    break
+                self._field_parts.append(buffer[pos:end])
+                self._element_fields[self._field] = "".join(self._field_parts).strip()
+                self._field = None
+                self._field_parts = []
+                pos = end + len(closing_tag)
+                continue
+
+            tag_start = buffer.find("<", pos)
+            if tag_start < 0:
+                pos = len(buffer)
+                break
+            tag_end = buffer.find(">", tag_start + 1, tag_start + self._MAX_TAG_LENGTH)
+            if tag_end < 0:
+                if len(buffer) - tag_start < self._MAX_TAG_LENGTH:
+                    # Possibly a tag split across chunks
+                    pos = tag_start
+                    break
+                pos = tag_start + 1
+                continue
+
+            name = buffer[tag_start + 1:tag_end]
+            is_closing = name.startswith("/")
+            event = self._handle_tag(name[1:] if is_closing else name, is_closing)
+            if event is not None:
+                events.append(event)
+            pos = tag_end + 1
+
+        self._buffer = buffer[pos:]
+        return events
+
+    def close(self) -> List[Union[ParsedCodeFile, ReasoningStep]]:
+        """Signal the end of the response and return any element it completed."""
+        if self._field:
+            logger.warning(f"Response ended inside an unclosed <{self._field}> tag, dropping it")
+            self._field = None
+            self._field_parts = []
+        self._buffer = ""
+        event = self._finish_element()
+        return [event] if event is not None else []
+
+    def _handle_tag(self, name: str, is_closing: bool) -> Optional[Union[ParsedCodeFile, ReasoningStep]]:
+        if name in self.SECTION_ACTIONS:
+            event = self._finish_element()
+            self._section = None if is_closing else name
+            return event
+        if name in self.ELEMENTS:
+            event = self._finish_element()
+            if not is_closing:
+                self._element = name
+            return event
+        if name in self.FIELDS and not is_closing and self.FIELDS[name] == self._element:
+            self._field = name
+            self._field_parts = []
+        # Anything else is text that happens to look like a tag
+        return None
+
+    def _finish_element(self) -> Optional[Union[ParsedCodeFile, ReasoningStep]]:
+        element, fields = self._element, self._element_fields
+        self._element = None
+        self._element_fields = {}
+
+        if element == "Step":
+            if self._section != "Reasoning" or "Reason" not in fields:
+                return None
+            step = ReasoningStep(reason=fields["Reason"])
+            self._reasoning_steps.append(step)
+            return step
+
+        if element == "CodeFile":
+            action = self.SECTION_ACTIONS.get(self._section)
+            if action is None or "FilePath" not in fields or "Code" not in fields:
+                return None
+            code_file = CodeFile(
+                nodeId=self.owner_id,
+                filePath=fields["FilePath"],
+                code=fields["Code"],
+                programmingLanguage=self.language
+            )
+            self._files[action].append(code_file)
+            return ParsedCodeFile(action=action, file=code_file)
+
+        return None
+
+    def response(self) -> CodeParserResponse:
+        """Everything parsed so far, as a regular parser response."""
+        return CodeParserResponse(
+            addedFiles=list(self._files[CodeFileAction.ADDED]),
+            updatedFiles=list(self._files[CodeFileAction.UPDATED]),
+            deletedFiles=list(self._files[CodeFileAction.DELETED]),
+            reasoningSteps=list(self._reasoning_steps)
+        )
+
+
 class CodeParser:
     """Parser for code generation responses."""
     
@@ -15,90 +160,25 @@ class CodeParser:
         self.canvas_id = canvas_id
         self.node_id = node_id
     
-    def _parse_reasoning(self, response: str) -> List[ReasoningStep]:
-        """Extract reasoning steps from XML tags."""
-        reasoning_steps = []
-        reasoning_match = re.search(r'<Reasoning>(.*?)</Reasoning>', response, re.DOTALL)
-        if reasoning_match:
-            step_matches = re.finditer(r'<Step>(.*?)</Step>', reasoning_match.group(1), re.DOTALL)
-            for match in step_matches:
-                reason_match = re.search(r'<Reason>(.*?)</Reason>', match.group(1), re.DOTALL)
-                if reason_match:
-                    reasoning_steps.append(ReasoningStep(reason=reason_match.group(1).strip()))
-        return reasoning_steps
-    
     def parse(self, response: str, language: ProgrammingLanguage, isCanvas: bool = False) -> CodeParserResponse:
-        """Extract code files and reasoning from XML tags."""
+        """Extract code files and reasoning from XML tags in a single pass."""
         try:
-            # Initialize lists for different types of files
-            added_files = []
-            updated_files = []
-            deleted_files = []
-
-            # Parse reasoning steps
-            reasoning_steps = self._parse_reasoning(response)
-
-            # Parse new code files
-            new_code_files_match = re.search(r'<NewCodeFiles>(.*?)</NewCodeFiles>', response, re.DOTALL)
-            if new_code_files_match:
-                code_file_matches = re.finditer(r'<CodeFile>(.*?)</CodeFile>', new_code_files_match.group(1), re.DOTALL)
-                for match in code_file_matches:
-                    file_path_match = re.search(r'<FilePath>(.*?)</FilePath>', match.group(1), re.DOTALL)
-                    code_match = re.search(r'<Code>(.*?)</Code>', match.group(1), re.DOTALL)
-                    if file_path_match and code_match:
-                        added_files.append(CodeFile(
-                            nodeId=self.canvas_id if isCanvas else self.node_id,
-                            filePath=file_path_match.group(1).strip(),
-                            code=code_match.group(1).strip(),
-                            programmingLanguage=language
-                        ))
-
-            # Parse updated code files
-            updated_code_files_match = re.search(r'<UpdatedCodeFiles>(.*?)</UpdatedCodeFiles>', response, re.DOTALL)
-            if updated_code_files_match:
-                code_file_matches = re.finditer(r'<CodeFile>(.*?)</CodeFile>', updated_code_files_match.group(1), re.DOTALL)
-                for match in code_file_matches:
-                    file_path_match = re.search(r'<FilePath>(.*?)</FilePath>', match.group(1), re.DOTALL)
-                    code_match = re.search(r'<Code>(.*?)</Code>', match.group(1), re.DOTALL)
-                    if file_path_match and code_match:
-                        updated_files.append(CodeFile(
-                            nodeId=self.canvas_id if isCanvas else self.node_id,
-                            filePath=file_path_match.group(1).strip(),
-                            code=code_match.group(1).strip(),
-                            programmingLanguage=language
-                        ))
-
-            # Parse deleted code files
-            deleted_code_files_match = re.search(r'<DeletedCodeFiles>(.*?)</DeletedCodeFiles>', response, re.DOTALL)
-            if deleted_code_files_match:
-                code_file_matches = re.finditer(r'<CodeFile>(.*?)</CodeFile>', deleted_code_files_match.group(1), re.DOTALL)
-                for match in code_file_matches:
-                    file_path_match = re.search(r'<FilePath>(.*?)</FilePath>', match.group(1), re.DOTALL)
-                    code_match = re.search(r'<Code>(.*?)</Code>', match.group(1), re.DOTALL)
-                    if file_path_match and code_match:
-                        deleted_files.append(CodeFile(
-                            nodeId=self.canvas_id if isCanvas else self.node_id,
-                            filePath=file_path_match.group(1).strip(),
-                            code=code_match.group(1).strip(),
-                            programmingLanguage=language
-                        ))
+            parser = IncrementalCodeParser(self.canvas_id, self.node_id, language, isCanvas=isCanvas)
+            parser.feed(response)
+            parser.close()
+            parsed = parser.response()
 
             # Log if no files were found
-            if not (added_files or updated_files or deleted_files):
+            if not (parsed.addedFiles or parsed.updatedFiles or parsed.deletedFiles):
                 logger.warning(f"No code files found in XML tags for {language}")
 
-            print(f"\nReasoning steps by {self.canvas_id if isCanvas else self.node_id}:")
-            for step in reasoning_steps:
-                print(step.reason)
-            print("\n\n")
-            
-            return CodeParserResponse(
-                addedFiles=added_files,
-                updatedFiles=updated_files,
-                deletedFiles=deleted_files,
-                reasoningSteps=reasoning_steps
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                owner_id = self.canvas_id if isCanvas else self.node_id
+                for step in parsed.reasoningSteps:
+                    logger.debug(f"Reasoning step by {owner_id}: {step.reason}")
+
+            return parsed
             
         except Exception as e:
             logger.error(f"Error parsing response for {language}: {str(e)}")
-            raise ValueError(f"Failed to parse response: {str(e)}") 
\ No newline at end of file
+            raise ValueError(f"Failed to parse response: {str(e)}") 
@@ -21,7 +21,10 @@ class AgentStep(Enum):
 
 @dataclass
 class AgentResponse:
-    agent_node_id: str
+    # None for an agent that only runs the canvas-level prompt
+    agent_node_id: Optional[str]
     code_parser_response: CodeParserResponse
     error_message: Optional[str] = None
+    # Set when the node result is returned without the canvas-level files
+    canvas_error_message: Optional[str] = None
     
@@ -1,3 +1,4 @@
+from enum import Enum
 from dataclasses import dataclass
 from typing import List
 from src.api.models.dataplane_models import CodeFile
@@ -13,4 +14,17 @@ class CodeParserResponse:
     addedFiles: List[CodeFile]
     updatedFiles: List[CodeFile]
     deletedFiles: List[CodeFile]
-    reasoningSteps: List[ReasoningStep]
\ No newline at end of file
+    reasoningSteps: List[ReasoningStep]
+
+
+class CodeFileAction(str, Enum):
+    ADDED = "added"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass
+class ParsedCodeFile:
+    """A code file emitted by the incremental parser as soon as its closing tag arrives."""
+    action: CodeFileAction
+    file: CodeFile
@@ -1,34 +1,122 @@
+import asyncio
 import logging
-from src.inference import BaseLLMInference
+from src.inference import BaseLLMInference, InferenceStreamError
+from src.inference.models.inference_models import InferenceResponse
 from src.agents.prompt_formatters.code_formatter import CodePromptFormatter
 from ..models.agent_models import AgentResponse
 from src.storage.models.models import CanvasDefinitionDO, CanvasDO
 from src.api.models.node_models import CanvasNode
 from src.agents.models.agent_models import InvokeAgentRequest
 from src.api.models.dataplane_models import ProgrammingLanguage
-from src.agents.llm_response_parsers.code_parser import CodeParser
-from typing import List
-from src.api.models.dataplane_models import CodeFile
+from src.agents.llm_response_parsers.code_parser import CodeParser, IncrementalCodeParser
+from typing import List, Optional, AsyncIterator, Union
+from src.api.models.dataplane_models import CodeFile, CodeStreamEvent, CodeStreamEventType
 from src.agents.models.agent_models import CodeParserResponse
+from src.agents.models.parser_models import ParsedCodeFile, ReasoningStep
+from src.config.settings import NODE_PROMPT_TIMEOUT_SECONDS, CANVAS_PROMPT_TIMEOUT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+
+class PromptExecutionError(Exception):
+    """Raised when a single generation prompt fails or times out."""
+    pass
+
+
+def empty_parser_response() -> CodeParserResponse:
+    return CodeParserResponse(addedFiles=[], updatedFiles=[], deletedFiles=[], reasoningSteps=[])
+
+
 class CodingAgent:
     def __init__(
         self,
         inference_client: BaseLLMInference,
-        node: CanvasNode,
+        node: Optional[CanvasNode],
         canvas_definition: CanvasDefinitionDO,
         canvas: CanvasDO,
+        node_prompt_timeout: float = NODE_PROMPT_TIMEOUT_SECONDS,
+        canvas_prompt_timeout: float = CANVAS_PROMPT_TIMEOUT_SECONDS,
     ):
         self.inference_client = inference_client
         self.canvas = canvas
         self.canvas_definition = canvas_definition
         self.node = node
-        self.code_parser = CodeParser(canvas_id=canvas.canvas_id, node_id=node.nodeId)
+        # node may be None for an agent that only runs the canvas-level prompt
+        self.code_parser = CodeParser(canvas_id=canvas.canvas_id, node_id=node.nodeId if node else None)
         self.formatter = CodePromptFormatter()
+        self.node_prompt_timeout = node_prompt_timeout
+        self.canvas_prompt_timeout = canvas_prompt_timeout
         self.logger = logger
-        
+
+    async def _generate(self, prompt: str, timeout: float, prompt_name: str) -> InferenceResponse:
+        """Run one prompt against the inference client with a time limit."""
+        try:
+            response = await asyncio.wait_for(self.inference_client.generate(prompt), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise PromptExecutionError(f"{prompt_name} prompt timed out after {timeout} seconds")
+        if response.error:
+            raise PromptExecutionError(f"Inference error: {response.error}")
+        return response
+
+    def format_node_prompt(
+        self,
+        invoke_agent_request: InvokeAgentRequest,
+        language: ProgrammingLanguage,
+        existing_code: List[CodeFile]
+    ) -> str:
+        """Format the node-level prompt.
+
+        Raises:
+            PromptExecutionError: If the agent has no node, i.e. only runs the canvas prompt
+        """
+        if self.node is None:
+            raise PromptExecutionError("Node prompt needs a node; this agent only runs the canvas prompt")
+        return self.formatter.format_prompt(
+            canvas=self.canvas,
+            node=self.node,
+            canvas_definition=self.canvas_definition,
+            language=language,
+            invoke_agent_request=invoke_agent_request,
+            existing_code=existing_code
+        )
+
+    async def run_node_prompt(
+        self,
+        invoke_agent_request: InvokeAgentRequest,
+        language: ProgrammingLanguage,
+        existing_code: List[CodeFile]
+    ) -> Optional[CodeParserResponse]:
+        """Format, generate and parse the node-level prompt.
+
+        Returns None when the model produced no text.
+        """
+        node_prompt = self.format_node_prompt(invoke_agent_request, language, existing_code)
+        response = await self._generate(node_prompt, self.node_prompt_timeout, "Node")
+        if not response.text_response:
+            return None
+        return self.code_parser.parse(response.text_response, language, isCanvas=False)
+
+    async def run_canvas_prompt(
+        self,
+        invoke_agent_request: InvokeAgentRequest,
+        language: ProgrammingLanguage,
+        existing_code: List[CodeFile]
+    ) -> Optional[CodeParserResponse]:
+        """Format, generate and parse the canvas-level prompt.
+
+        Returns None when the model produced no text.
+        """
+        canvas_prompt = self.formatter.format_canvas_prompt(
+            canvas=self.canvas,
+            canvas_definition=self.canvas_definition,
+            language=language,
+            invoke_agent_request=invoke_agent_request,
+            existing_code=existing_code
+        )
+        response = await self._generate(canvas_prompt, self.canvas_prompt_timeout, "Canvas")
+        if not response.text_response:
+            return None
+        return self.code_parser.parse(response.text_response, language, isCanvas=True)
 
     async def invoke_agent(
         self,
@@ -36,73 +124,173 @@ class CodingAgent:
         language: ProgrammingLanguage,
         existing_code: List[CodeFile]
     ) -> AgentResponse:
-        """Invoke the agent with instructions and return the response."""
-        try:
-            # Format prompt
-            node_prompt = self.formatter.format_prompt(
-                canvas=self.canvas,
-                node=self.node,
-                canvas_definition=self.canvas_definition,
-                language=language,
-                invoke_agent_request=invoke_agent_request,
-                existing_code=existing_code
-            )
-            canvas_prompt = self.formatter.format_canvas_prompt(    
-                canvas=self.canvas,
-                canvas_definition=self.canvas_definition,
-                language=language,
-                invoke_agent_request=invoke_agent_request,
-                existing_code=existing_code
-            )
-            node_response = await self.inference_client.generate(node_prompt)
-            canvas_response = await self.inference_client.generate(canvas_prompt)
+        """Invoke the agent with instructions and return the response.
 
-            # Handle different response types
-            if node_response.error or canvas_response.error:
+        The node and canvas prompts run concurrently, each formatting, generating and
+        parsing on its own, so one prompt's formatting and parsing overlap with the
+        other's in-flight request. A failed node prompt fails the whole invocation;
+        a failed canvas prompt still returns the node files and reports the failure
+        in ``canvas_error_message``.
+        """
+        node_id = self.node.nodeId if self.node else None
+        node_task = asyncio.create_task(self.run_node_prompt(invoke_agent_request, language, existing_code))
+        canvas_task = asyncio.create_task(self.run_canvas_prompt(invoke_agent_request, language, existing_code))
+        try:
+            try:
+                node_parser_response = await node_task
+            except Exception as e:
+                canvas_task.cancel()
+                self.logger.error(f"Error generating code: {str(e)}")
+                message = str(e) if isinstance(e, PromptExecutionError) else f"Failed to generate code: {str(e)}"
                 return AgentResponse(
-                    agent_node_id=self.node.nodeId,
-                    code_parser_response=CodeParserResponse(addedFiles=[], updatedFiles=[], deletedFiles=[]),
-                    error_message=f"Inference error: {node_response.error}"
+                    agent_node_id=node_id,
+                    code_parser_response=empty_parser_response(),
+                    error_message=message
                 )
 
-            if not node_response.text_response and not canvas_response.text_response:
+            canvas_error_message = None
+            try:
+                canvas_parser_response = await canvas_task
+            except Exception as e:
+                self.logger.warning(f"Canvas prompt failed, returning node result only: {str(e)}")
+                canvas_error_message = str(e)
+                canvas_parser_response = None
+
+            if node_parser_response is None and canvas_parser_response is None:
                 return AgentResponse(
-                    agent_node_id=self.node.nodeId,
-                    code_parser_response=CodeParserResponse(addedFiles=[], updatedFiles=[], deletedFiles=[]),
+                    agent_node_id=node_id,
+                    code_parser_response=empty_parser_response(),
                     error_message="No text response received from inference"
                 )
 
-            if node_response.text_response:
-                node_parser_response = self.code_parser.parse(node_response.text_response, language, isCanvas=False)
-            else:
-                node_parser_response = CodeParserResponse(addedFiles=[], updatedFiles=[], deletedFiles=[], reasoningSteps=[])
-
-            if canvas_response.text_response:
-                canvas_parser_response = self.code_parser.parse(canvas_response.text_response, language, isCanvas=True)
-            else:
-                canvas_parser_response = CodeParserResponse(addedFiles=[], updatedFiles=[], deletedFiles=[], reasoningSteps=[])
+            node_parser_response = node_parser_response or empty_parser_response()
+            canvas_parser_response = canvas_parser_response or empty_parser_response()
 
             # Parse and return the response directly
             return AgentResponse(
-                agent_node_id=self.node.nodeId,
+                agent_node_id=node_id,
                 code_parser_response=CodeParserResponse(
                     addedFiles=node_parser_response.addedFiles + canvas_parser_response.addedFiles,
                     updatedFiles=node_parser_response.updatedFiles + canvas_parser_response.updatedFiles,
                     deletedFiles=node_parser_response.deletedFiles + canvas_parser_response.deletedFiles,
                     reasoningSteps=node_parser_response.reasoningSteps + canvas_parser_response.reasoningSteps
-                )
+                ),
+                canvas_error_message=canvas_error_message
             )
+        finally:
+            # Never leave a prompt running if the caller was cancelled
+            for task in (node_task, canvas_task):
+                if not task.done():
+                    task.cancel()
 
-        except Exception as e:
-            self.logger.error(f"Error generating code: {str(e)}")
-            return AgentResponse(
-                agent_node_id=self.node.nodeId,
-                code_parser_response=CodeParserResponse(
-                    addedFiles=[],
-                    updatedFiles=[],
-                    deletedFiles=[],
-                    reasoningSteps=[]
-                ),
-                error_message=f"Failed to generate code: {str(e)}"
+    async def _stream_prompt(
+        self,
+        prompt: str,
+        timeout: float,
+        source: str,
+        language: ProgrammingLanguage,
+        isCanvas: bool
+    ) -> AsyncIterator[CodeStreamEvent]:
+        """Stream one prompt, yielding each file and reasoning step as soon as it is complete."""
+        parser = IncrementalCodeParser(
+            canvas_id=self.canvas.canvas_id,
+            node_id=self.node.nodeId if self.node else None,
+            language=language,
+            isCanvas=isCanvas
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        chunks = self.inference_client.generate_stream(prompt)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise PromptExecutionError(f"{source.capitalize()} prompt timed out after {timeout} seconds")
+                except InferenceStreamError as e:
+                    raise PromptExecutionError(f"Inference error: {str(e)}")
+                for parsed in parser.feed(chunk):
+                    yield self._stream_event(parsed, source)
+            # An unterminated final file is only emitted once the parser knows the response ended
+            for parsed in parser.close():
+                yield self._stream_event(parsed, source)
+        finally:
+            await chunks.aclose()
+
+    @staticmethod
+    def _stream_event(parsed: Union[ParsedCodeFile, ReasoningStep], source: str) -> CodeStreamEvent:
+        if isinstance(parsed, ParsedCodeFile):
+            return CodeStreamEvent(
+                eventType=CodeStreamEventType.FILE,
+                source=source,
+                fileAction=parsed.action.value,
+                file=parsed.file
             )
+        return CodeStreamEvent(eventType=CodeStreamEventType.REASONING, source=source, reason=parsed.reason)
+
+    async def stream_agent(
+        self,
+        invoke_agent_request: InvokeAgentRequest,
+        language: ProgrammingLanguage,
+        existing_code: List[CodeFile]
+    ) -> AsyncIterator[CodeStreamEvent]:
+        """Invoke the agent, streaming events from the node and canvas prompts as they arrive.
+
+        Both prompts run concurrently and their events are interleaved. Errors are
+        reported as ``error`` events; as with ``invoke_agent``, a node prompt failure
+        stops the canvas prompt. The stream always ends with a ``done`` event.
+        """
+        try:
+            node_prompt = self.format_node_prompt(invoke_agent_request, language, existing_code)
+        except PromptExecutionError as e:
+            yield CodeStreamEvent(eventType=CodeStreamEventType.ERROR, source="node", errorMessage=str(e))
+            yield CodeStreamEvent(eventType=CodeStreamEventType.DONE)
+            return
+        canvas_prompt = self.formatter.format_canvas_prompt(
+            canvas=self.canvas,
+            canvas_definition=self.canvas_definition,
+            language=language,
+            invoke_agent_request=invoke_agent_request,
+            existing_code=existing_code
+        )
+        # Items are (source, event); an event of None marks the end of that source
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def pump(source: str, stream: AsyncIterator[CodeStreamEvent]) -> None:
+            try:
+                async for event in stream:
+                    events.put_nowait((source, event))
+            except Exception as e:
+                self.logger.error(f"Error streaming {source} prompt: {str(e)}")
+                message = str(e) if isinstance(e, PromptExecutionError) else f"Failed to generate code: {str(e)}"
+                events.put_nowait((source, CodeStreamEvent(eventType=CodeStreamEventType.ERROR, source=source, errorMessage=message)))
+            finally:
+                events.put_nowait((source, None))
 
+        node_task = asyncio.create_task(pump(
+            "node", self._stream_prompt(node_prompt, self.node_prompt_timeout, "node", language, isCanvas=False)
+        ))
+        canvas_task = asyncio.create_task(pump(
+            "canvas", self._stream_prompt(canvas_prompt, self.canvas_prompt_timeout, "canvas", language, isCanvas=True)
+        ))
+        try:
+            streaming = {"node", "canvas"}
+            while streaming:
+                source, event = await events.get()
+                if source not in streaming:
+                    continue
+                if event is None:
+                    streaming.discard(source)
+                    continue
+                if event.eventType == CodeStreamEventType.ERROR and source == "node":
+                    canvas_task.cancel()
+                    streaming.discard("canvas")
+                yield event
+            yield CodeStreamEvent(eventType=CodeStreamEventType.DONE)
+        finally:
+            # Never leave a prompt running if the client went away
+            for task in (node_task, canvas_task):
+                if not task.done():
+                    task.cancel()
@@ -14,6 +14,9 @@ import json
 class CodePromptFormatter:
     """Formatter for code generation prompts."""
 
+    # Bump whenever a prompt template changes; it is part of every node's generation fingerprint
+    TEMPLATE_VERSION = "1"
+
     def get_prompt_template(self, node: CanvasNode, language: ProgrammingLanguage) -> str:
         """Get the appropriate prompt template based on node type and language."""
         if node.nodeType == CanvasNodeType.DYNAMO_DB:
@@ -1,12 +1,14 @@
 from fastapi import Request, HTTPException, Depends
 import os
-from jose import jwt
-import requests
+from jose import jwt, JWTError
 from typing import Optional, Dict, Any
 import logging
 import json
 import base64
 import time
+from src.api.auth.jwks_cache import JWKSCache, http_jwks_fetcher
+from src.api.auth.token_cache import VerifiedTokenCache
+from src.config.settings import COGNITO_VERIFY_SIGNATURE
 
 logger = logging.getLogger(__name__)
 
@@ -17,175 +19,170 @@ class CognitoAuth:
     COGNITO_REGION = os.getenv('COGNITO_REGION', 'us-east-1')
     COGNITO_USER_POOL_ID = os.getenv('COGNITO_USER_POOL_ID')
     COGNITO_APP_CLIENT_ID = os.getenv('COGNITO_APP_CLIENT_ID')
-    
+    VERIFY_SIGNATURE = COGNITO_VERIFY_SIGNATURE
+
+    # Created on first use, once the environment has been loaded
+    _jwks_cache: Optional[JWKSCache] = None
+    token_cache = VerifiedTokenCache()
+
     @staticmethod
-    def get_cognito_public_keys() -> dict:
-        """Get public keys from Cognito."""
-        url = f'https://cognito-idp.{CognitoAuth.COGNITO_REGION}.amazonaws.com/{CognitoAuth.COGNITO_USER_POOL_ID}/.well-known/jwks.json'
-        response = requests.get(url)
-        return response.json()
+    def get_issuer() -> str:
+        region = os.getenv('COGNITO_REGION', CognitoAuth.COGNITO_REGION)
+        user_pool_id = os.getenv('COGNITO_USER_POOL_ID', CognitoAuth.COGNITO_USER_POOL_ID)
+        return f'https://cognito-idp.{region}.amazonaws.com/{user_pool_id}'
+
+    @classmethod
+    def get_jwks_cache(cls) -> JWKSCache:
+        """Get the process-wide cache of the user pool's signing keys."""
+        if cls._jwks_cache is None:
+            cls._jwks_cache = JWKSCache(http_jwks_fetcher(f'{cls.get_issuer()}/.well-known/jwks.json'))
+        return cls._jwks_cache
+
+    @classmethod
+    async def close(cls) -> None:
+        """Stop any JWKS refresh still in flight."""
+        if cls._jwks_cache is not None:
+            await cls._jwks_cache.close()
     
+    @staticmethod
+    def _decode_segment(segment: str) -> Dict[str, Any]:
+        padding = '=' * (-len(segment) % 4)
+        return json.loads(base64.urlsafe_b64decode(segment + padding))
+
     @staticmethod
     def extract_token_header(token: str) -> Optional[Dict[str, Any]]:
         """Extract and decode the JWT header."""
         try:
-            # Split the token and get the header part
             parts = token.split('.')
             if len(parts) != 3:
-                logger.error("Invalid token format")
+                logger.warning("Invalid token format")
                 return None
-                
-            # Decode the header
-            header_b64 = parts[0]
-            # Add padding if needed
-            padding = '=' * (4 - len(header_b64) % 4)
-            header_bytes = base64.urlsafe_b64decode(header_b64 + padding)
-            header = json.loads(header_bytes)
-            
-            logger.info("Token Header Information:")
-            logger.info(f"Algorithm: {header.get('alg', 'N/A')}")
-            logger.info(f"Key ID: {header.get('kid', 'N/A')}")
-            logger.info(f"Type: {header.get('typ', 'JWT')}")
-            
-            return header
+            return CognitoAuth._decode_segment(parts[0])
         except Exception as e:
-            logger.error(f"Error decoding token header: {str(e)}")
+            logger.warning(f"Error decoding token header: {str(e)}")
             return None
     
     @staticmethod
     def extract_token_payload(token: str) -> Optional[Dict[str, Any]]:
         """Extract and decode the JWT payload."""
         try:
-            # Split the token and get the payload part
             parts = token.split('.')
             if len(parts) != 3:
-                logger.error("Invalid token format")
+                logger.warning("Invalid token format")
                 return None
-                
-            # Decode the payload
-            payload_b64 = parts[1]
-            # Add padding if needed
-            padding = '=' * (4 - len(payload_b64) % 4)
-            payload_bytes = base64.urlsafe_b64decode(payload_b64 + padding)
-            payload = json.loads(payload_bytes)
-            
-            logger.info("\nToken Payload Information:")
-            logger.info(f"Subject (sub): {payload.get('sub', 'N/A')}")
-            logger.info(f"Token Use: {payload.get('token_use', 'N/A')}")
-            logger.info(f"Client ID: {payload.get('client_id', 'N/A')}")
-            logger.info(f"Issuer: {payload.get('iss', 'N/A')}")
-            logger.info(f"Username: {payload.get('username', 'N/A')}")
-            logger.info(f"Groups: {payload.get('cognito:groups', [])}")
-            logger.info(f"Scope: {payload.get('scope', 'N/A')}")
-            logger.info(f"Issued At: {payload.get('iat', 'N/A')}")
-            logger.info(f"Expiration: {payload.get('exp', 'N/A')}")
-            
-            return payload
+            return CognitoAuth._decode_segment(parts[1])
         except Exception as e:
-            logger.error(f"Error decoding token payload: {str(e)}")
+            logger.warning(f"Error decoding token payload: {str(e)}")
             return None
     
     @staticmethod
     def extract_token_signature(token: str) -> Optional[str]:
         """Extract the JWT signature."""
-        try:
-            # Split the token and get the signature part
-            parts = token.split('.')
-            if len(parts) != 3:
-                logger.error("Invalid token format")
-                return None
-                
-            signature = parts[2]
-            
-            logger.info("\nToken Signature Information:")
-            logger.info(f"Signature Length: {len(signature)} characters")
-            logger.info("Note: Signature is a cryptographic hash and cannot be decoded")
-            
-            return signature
-        except Exception as e:
-            logger.error(f"Error extracting token signature: {str(e)}")
+        parts = token.split('.')
+        if len(parts) != 3:
+            logger.warning("Invalid token format")
             return None
+        return parts[2]
+
+    @staticmethod
+    def verify_token_claims(token: str) -> Optional[Dict[str, Any]]:
+        """Decode a token without checking its signature, returning its claims if it has not expired."""
+        payload = CognitoAuth.extract_token_payload(token)
+        if not isinstance(payload, dict):
+            return None
+
+        exp_time = payload.get('exp')
+        if not isinstance(exp_time, (int, float)):
+            logger.warning("Token missing 'exp' claim")
+            return None
+        if int(time.time()) >= exp_time:
+            logger.warning("Token has expired")
+            return None
+        if not payload.get('sub'):
+            logger.warning("Token missing 'sub' claim")
+            return None
+        return payload
     
     @staticmethod
     def verify_cognito_token(token: str) -> Optional[str]:
         """Verify Cognito token and return customer ID if token is not expired."""
+        claims = CognitoAuth.verify_token_claims(token)
+        return claims['sub'] if claims else None
+    
+    @staticmethod
+    async def verify_token_signature(token: str, jwks_cache: Optional[JWKSCache] = None) -> Optional[Dict[str, Any]]:
+        """Verify a Cognito token's signature and claims, returning its claims if valid.
+
+        Checks the signature against the user pool's published keys, the expiry, the
+        issuer and, when an app client is configured, that the token was issued to it.
+        """
+        jwks_cache = jwks_cache or CognitoAuth.get_jwks_cache()
         try:
-            # Extract token information
-            header = CognitoAuth.extract_token_header(token)
-            payload = CognitoAuth.extract_token_payload(token)
-            CognitoAuth.extract_token_signature(token)
-            
-            if not payload:
-                logger.error("Failed to extract token payload")
-                return None
-                
-            # Get expiration time and check if token is still valid
-            exp_time = payload.get('exp')
-            if not exp_time:
-                logger.error("Token missing 'exp' claim")
-                return None
-                
-            # Get current time
-            current_time = int(time.time())
-            
-            # Check if token is expired
-            if current_time >= exp_time:
-                logger.error("Token has expired")
+            header = jwt.get_unverified_header(token)
+            key = await jwks_cache.get_key(header.get('kid', ''))
+            if key is None:
+                logger.warning("Token signed with an unknown key")
                 return None
-                
-            # Return customer ID from sub claim
-            customer_id = payload.get('sub')
-            if not customer_id:
-                logger.error("Token missing 'sub' claim")
-                return None
-                
-            logger.info(f"Token verified for customer: {customer_id}")
-            return customer_id
-            
-        except Exception as e:
-            logger.error(f"Error verifying token: {str(e)}")
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=['RS256'],
+                issuer=CognitoAuth.get_issuer(),
+                # Access tokens carry the app client in client_id rather than aud; checked below
+                options={'verify_aud': False}
+            )
+        except JWTError as e:
+            logger.warning(f"Token failed verification: {str(e)}")
             return None
-    
+
+        if claims.get('token_use') not in ('access', 'id'):
+            logger.warning(f"Unexpected token use: {claims.get('token_use')}")
+            return None
+        app_client_id = os.getenv('COGNITO_APP_CLIENT_ID', CognitoAuth.COGNITO_APP_CLIENT_ID)
+        token_client_id = claims.get('client_id') if claims.get('token_use') == 'access' else claims.get('aud')
+        if app_client_id and token_client_id != app_client_id:
+            logger.warning("Token was issued to a different app client")
+            return None
+        if not claims.get('sub'):
+            logger.warning("Token missing 'sub' claim")
+            return None
+        return claims
+
     @staticmethod
     async def get_customer_id(request: Request) -> str:
         """Get customer ID from request.
         
         In development mode, returns a mock customer ID.
         In production mode, verifies Cognito token and returns customer ID.
+        Tokens that already passed verification are answered from ``token_cache``
+        until they expire, without decoding them again.
         """
-        # Get environment and log it
-        env = os.getenv('FLASK_ENV', 'production').lower()
-        logger.info(f"Environment check - FLASK_ENV: {env}")
-        
-        if env == 'development':
-            mock_id = os.getenv('MOCK_CUSTOMER_ID', 'test-customer-123')
-            logger.info(f"Development mode - Using mock customer ID: {mock_id}")
-            return mock_id
-            
-        # Log all headers for debugging
-        logger.info(f"Request headers: {dict(request.headers)}")
+        if os.getenv('FLASK_ENV', 'production').lower() == 'development':
+            return os.getenv('MOCK_CUSTOMER_ID', 'test-customer-123')
         
         # Get token from Authorization header
         auth_header = request.headers.get('Authorization')
         if not auth_header:
-            logger.warning("Authorization header is missing")
             raise HTTPException(status_code=401, detail="Missing Authorization header")
             
         if not auth_header.startswith('Bearer '):
-            logger.warning(f"Invalid Authorization header format: {auth_header[:20]}...")
             raise HTTPException(status_code=401, detail="Invalid Authorization header format")
             
-        token = auth_header.split(' ')[1]
+        token = auth_header[len('Bearer '):]
         if token == 'null':
-            logger.warning("Token is null - user is not logged in")
             raise HTTPException(status_code=401, detail="User is not logged in")
-            
-        logger.info(f"Token length: {len(token)}")
-        
-        customer_id = CognitoAuth.verify_cognito_token(token)
-        if not customer_id:
-            logger.warning("Invalid or expired token")
+
+        customer_id = CognitoAuth.token_cache.get(token)
+        if customer_id:
+            return customer_id
+
+        if CognitoAuth.VERIFY_SIGNATURE:
+            claims = await CognitoAuth.verify_token_signature(token)
+        else:
+            claims = CognitoAuth.verify_token_claims(token)
+        if not claims:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
-            
-        logger.info(f"Successfully verified token for customer: {customer_id}")
-        return customer_id 
\ No newline at end of file
+
+        if isinstance(claims.get('exp'), (int, float)):
+            CognitoAuth.token_cache.put(token, claims['sub'], claims['exp'])
+        return claims['sub']
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Optional
+import httpx
+from src.config.settings import (
+    COGNITO_HTTP_TIMEOUT_SECONDS,
+    COGNITO_HTTP_CONNECT_TIMEOUT_SECONDS,
+    COGNITO_HTTP_MAX_CONNECTIONS,
+    COGNITO_HTTP_MAX_RETRIES,
+    COGNITO_HTTP_RETRY_BASE_DELAY_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying for requests that are safe to repeat
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CognitoHttpClient:
+    """Async HTTP client for Cognito's OAuth and JWKS endpoints.
+
+    One client is shared by every request so TLS connections to Cognito are kept
+    alive and reused. Connection failures are retried by the transport, since the
+    request never reached Cognito. Requests marked ``idempotent`` are also retried
+    with jittered backoff on throttling and server errors. Token exchanges are
+    not idempotent: Cognito may have consumed the authorization code, or a
+    refresh token when refresh token rotation is on.
+    """
+
+    def __init__(
+        self,
+        timeout: float = COGNITO_HTTP_TIMEOUT_SECONDS,
+        connect_timeout: float = COGNITO_HTTP_CONNECT_TIMEOUT_SECONDS,
+        max_connections: int = COGNITO_HTTP_MAX_CONNECTIONS,
+        max_retries: int = COGNITO_HTTP_MAX_RETRIES,
+        retry_base_delay: float = COGNITO_HTTP_RETRY_BASE_DELAY_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport or httpx.AsyncHTTPTransport(retries=max_retries)
+        )
+
+    async def request(self, method: str, url: str, idempotent: bool = False, **kwargs: Any) -> httpx.Response:
+        """Send a request, raising ``httpx.HTTPStatusError`` for error responses."""
+        attempts = self.max_retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == attempts - 1:
+                break
+            delay = random.uniform(0, self.retry_base_delay * (2 ** attempt))
+            logger.warning(f"Cognito returned {response.status_code}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        response.raise_for_status()
+        return response
+
+    async def post_form(
+        self,
+        url: str,
+        data: Dict[str, str],
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False
+    ) -> httpx.Response:
+        return await self.request("POST", url, idempotent=idempotent, data=data, headers=headers)
+
+    async def get_json(self, url: str) -> Any:
+        response = await self.request("GET", url, idempotent=True)
+        return response.json()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_shared_client: Optional[CognitoHttpClient] = None
+
+
+def get_cognito_http_client() -> CognitoHttpClient:
+    """Get the process-wide Cognito HTTP client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = CognitoHttpClient()
+    return _shared_client
+
+
+async def close_cognito_http_client() -> None:
+    """Close the process-wide Cognito HTTP client, if one was created."""
+    global _shared_client
+    client, _shared_client = _shared_client, None
+    if client is not None:
+        await client.close()
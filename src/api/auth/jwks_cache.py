@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from jose import jwk
+from jose.backends.base import Key
+from src.api.auth.cognito_http import CognitoHttpClient, get_cognito_http_client
+from src.config.settings import JWKS_REFRESH_INTERVAL_SECONDS, JWKS_MIN_REFRESH_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Returns the parsed JWKS document, e.g. {"keys": [{"kid": ..., "kty": "RSA", ...}]}
+FetchJWKS = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+def http_jwks_fetcher(url: str, client: Optional[CognitoHttpClient] = None) -> FetchJWKS:
+    """Fetch a JWKS document over the shared Cognito HTTP client."""
+    async def fetch() -> Dict[str, Any]:
+        return await (client or get_cognito_http_client()).get_json(url)
+
+    return fetch
+
+
+class JWKSCache:
+    """Public signing keys from a JWKS endpoint, parsed once and keyed by ``kid``.
+
+    Lookups for known keys never wait on the network. Once the key set is older
+    than ``refresh_interval`` a lookup starts a refresh in the background and keeps
+    answering from the current keys. A lookup for an unknown ``kid`` (for example
+    after the pool rotated its keys) waits for a refresh; concurrent lookups share
+    one fetch. Unknown kids are remembered for ``min_refresh_interval`` seconds and
+    unknown-kid refreshes are spaced at least that far apart, so tokens with made-up
+    kids cannot make us hammer the endpoint.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        fetch: FetchJWKS,
+        refresh_interval: float = JWKS_REFRESH_INTERVAL_SECONDS,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self._keys: Dict[str, Key] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt_at: Optional[float] = None
+        self._unknown_kids: Dict[str, float] = {}
+        self._refresh: Optional[asyncio.Task] = None
+
+    async def get_key(self, kid: str) -> Optional[Key]:
+        """Get the key for ``kid``, or None if the endpoint does not publish it."""
+        now = self.clock()
+        key = self._keys.get(kid)
+        if key is not None:
+            if self._fetched_at is None or now - self._fetched_at >= self.refresh_interval:
+                self._start_refresh()
+            return key
+
+        missed_at = self._unknown_kids.get(kid)
+        if missed_at is not None and now - missed_at < self.min_refresh_interval:
+            return None
+        if self._refresh is None and self._last_attempt_at is not None \
+                and now - self._last_attempt_at < self.min_refresh_interval:
+            self._unknown_kids[kid] = now
+            return None
+
+        try:
+            await asyncio.shield(self._start_refresh())
+        except Exception as e:
+            logger.warning(f"Failed to refresh JWKS: {str(e)}")
+        key = self._keys.get(kid)
+        if key is None:
+            self._unknown_kids[kid] = self.clock()
+        return key
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Start fetching the key set, or join the fetch already in flight."""
+        if self._refresh is None:
+            self._last_attempt_at = self.clock()
+            self._refresh = asyncio.create_task(self._do_refresh())
+            self._refresh.add_done_callback(self._refresh_done)
+        return self._refresh
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh = None
+        # Retrieve the exception so a failed background refresh is not reported as unhandled
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background JWKS refresh failed: {str(task.exception())}")
+
+    async def _do_refresh(self) -> None:
+        document = await self.fetch()
+        keys = {}
+        for key_data in document.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, key_data.get("alg", "RS256"))
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWKS key {kid}: {str(e)}")
+        self._keys = keys
+        self._fetched_at = self.clock()
+        self._unknown_kids = {kid: t for kid, t in self._unknown_kids.items() if kid not in keys}
+
+    async def close(self) -> None:
+        """Cancel a refresh that is still in flight."""
+        if self._refresh is not None:
+            self._refresh.cancel()
+            await asyncio.gather(self._refresh, return_exceptions=True)
@@ -3,7 +3,8 @@ from fastapi.responses import JSONResponse
 from typing import Optional, Dict
 import os
 from .cognito_auth import CognitoAuth
-import requests
+from .cognito_http import get_cognito_http_client
+import httpx
 from urllib.parse import urlencode
 import logging
 import base64
@@ -91,13 +92,16 @@ async def handle_cognito_error(
         operation: Description of the operation that failed
         sensitive_data: Whether the error might contain sensitive data
     """
-    if isinstance(e, requests.exceptions.HTTPError):
-        error_response = e.response.json() if e.response else {}
+    if isinstance(e, httpx.HTTPStatusError):
+        try:
+            error_response = e.response.json()
+        except ValueError:
+            error_response = {}
         error_type = error_response.get('error', 'unknown_error')
         error_description = error_response.get('error_description', str(e))
         
         logger.error(f"{operation} failed: {error_type}")
-        if e.response:
+        if e.response is not None:
             logger.error(f"Response status: {e.response.status_code}")
             if not sensitive_data:
                 logger.error(f"Response body: {error_response}")
@@ -116,7 +120,8 @@ async def handle_cognito_error(
 async def exchange_token(
     config: CognitoConfig,
     data: Dict[str, str],
-    operation: str = "token exchange"
+    operation: str = "token exchange",
+    idempotent: bool = False
 ) -> OAuthTokenResponse:
     """Common function to exchange tokens with Cognito
     
@@ -124,6 +129,7 @@ async def exchange_token(
         config: Cognito configuration
         data: Request data for token exchange
         operation: Description of the operation for logging
+        idempotent: Whether the request may be retried after Cognito received it
     """
     # Construct the token endpoint URL
     token_url = f"https://{config.domain}/oauth2/token"
@@ -132,15 +138,10 @@ async def exchange_token(
     headers = create_auth_headers(config)
     
     try:
-        # Make the request to exchange the token
-        response = requests.post(token_url, headers=headers, data=data)
-        
-        # Log only non-sensitive response information
-        logger.info(f"{operation} response status: {response.status_code}")
+        # Make the request to exchange the token; raises for bad status codes
+        response = await get_cognito_http_client().post_form(token_url, data, headers=headers, idempotent=idempotent)
         logger.info(f"{operation} successful")
         
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
         # Parse the token response
         token_data = response.json()
         
@@ -178,8 +179,8 @@ async def logout(
         }
         
         logger.info(f"Revoke URL: {revoke_url}")
-        revoke_response = requests.post(revoke_url, headers=headers, data=revoke_data)
-        revoke_response.raise_for_status()
+        # Revoking a token twice is harmless, so the request may be retried
+        await get_cognito_http_client().post_form(revoke_url, revoke_data, headers=headers, idempotent=True)
         logger.info("Refresh token successfully revoked")
         
         return LogoutResponse(
@@ -218,6 +219,7 @@ async def refresh_token(
         "client_id": config.app_client_id,
         "refresh_token": refresh_request.refresh_token
     }
+    # Not retried: with refresh token rotation, Cognito may have consumed the token
     return await exchange_token(config, data, "token refresh")
 
 @router.post("/get/token", response_model=OAuthTokenResponse)
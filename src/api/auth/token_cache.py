@@ -0,0 +1,54 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from src.config.settings import VERIFIED_TOKEN_CACHE_MAX_ENTRIES
+
+
+class VerifiedTokenCache:
+    """Customer IDs of tokens that already passed verification, until the tokens expire.
+
+    Entries are keyed by a SHA-256 of the token, so raw tokens are never held in
+    memory longer than the request. The least recently used entry is evicted once
+    ``max_entries`` is reached, and expired entries are dropped when looked up.
+
+    Only used from the event loop, so it takes no lock.
+    """
+
+    def __init__(self, max_entries: int = VERIFIED_TOKEN_CACHE_MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        """Get the customer ID of a verified, unexpired token."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        customer_id, expires_at = entry
+        if self.clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return customer_id
+
+    def put(self, token: str, customer_id: str, expires_at: float) -> None:
+        """Remember a verified token until ``expires_at`` (seconds since the epoch)."""
+        if self.max_entries <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (customer_id, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
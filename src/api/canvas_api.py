@@ -1,10 +1,8 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, Body
-from fastapi.responses import JSONResponse, Response
+from fastapi import APIRouter, HTTPException, Request, Depends, Body, Query
+from fastapi.responses import Response, StreamingResponse
 from typing import Optional, Dict, Any
 import logging
-from dataclasses import asdict
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 
 from src.api.models.canvas_models import (
     CreateCanvasRequest,
@@ -19,11 +17,15 @@ from src.api.models.canvas_models import (
     CreateCanvasResponse,
     UpdateCanvasResponse,
     DeleteCanvasResponse,
+    GetCanvasDeletionRequest,
+    GetCanvasDeletionResponse,
     GetCanvasResponse,
     CreateCanvasVersionResponse
 )
 from src.api.handlers.canvas_handler import CanvasApiHandler
 from src.api.auth.cognito_auth import CognitoAuth
+from src.api.response_encoder import encode_response
+from src.config.settings import LIST_PAGE_MAX_LIMIT
 
 router = APIRouter(prefix="/api/v1/canvas")
 canvas_handler = CanvasApiHandler()
@@ -33,29 +35,9 @@ def handle_response(result: Dict[str, Any]) -> Response:
     if "error" in result:
         raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
     
-    # Convert the result to a dictionary if it's a dataclass
-    data = result.get("data", {})
-    if hasattr(data, '__dataclass_fields__'):
-        data = asdict(data)
-    
-    # Handle CanvasNode objects in the response
-    def serialize_node(node):
-        if hasattr(node, 'to_dict'):
-            return node.to_dict()
-        return node
-    
-    # Recursively serialize any CanvasNode objects in the response
-    def serialize_data(obj):
-        if isinstance(obj, list):
-            return [serialize_data(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {k: serialize_data(v) for k, v in obj.items()}
-        else:
-            return serialize_node(obj)
-    
-    serialized_data = serialize_data(data)
-    return JSONResponse(
-        content=serialized_data,
+    # Dataclasses, including nodes and edges, are encoded directly without converting to dicts first
+    return Response(
+        content=encode_response(result.get("data", {})),
         status_code=result.get("status_code", 200),
         media_type="application/json"
     )
@@ -69,7 +51,7 @@ async def create_canvas(
 ):
     """Create a new canvas with the given name and optional canvas definition."""
     try:
-        result = canvas_handler.create_canvas(customer_id, request_model)
+        result = await canvas_handler.create_canvas(customer_id, request_model)
         return handle_response(result)
     except Exception as e:
         logger.exception("Failed to create canvas")
@@ -77,34 +59,49 @@ async def create_canvas(
 
 @router.get('', response_model=ListCanvasResponse)
 async def list_canvases(
+    limit: Optional[int] = Query(None, ge=1, le=LIST_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
     request: Request = None,
     customer_id: str = Depends(CognitoAuth.get_customer_id)
 ):
-    """List all canvases for the current customer."""
+    """List the current customer's canvases, most recently updated first.
+
+    Results are paged; pass ``nextCursor`` from a response as ``cursor`` to get the next page.
+    """
+    request_model = ListCanvasRequest(limit=limit, cursor=cursor)
     try:
-        request_model = ListCanvasRequest()
-        result = canvas_handler.list_canvases(customer_id, request_model)
-        return handle_response(result)
+        result = await canvas_handler.list_canvases(customer_id, request_model)
     except Exception as e:
         logger.exception("Failed to list canvases")
         raise HTTPException(status_code=500, detail=f"Failed to list canvases: {str(e)}")
+    return handle_response(result)
 
 # Individual Canvas Operations
 @router.get('/{canvas_id}', response_model=GetCanvasResponse)
 async def get_canvas(
     canvas_id: str,
     version: Optional[str] = 'draft',
+    raw: bool = False,
     request: Request = None,
     customer_id: str = Depends(CognitoAuth.get_customer_id)
 ):
-    """Get a specific canvas by ID and version, including its definition if available."""
+    """Get a specific canvas by ID and version, including its definition if available.
+
+    With ``raw=true`` the stored definition is streamed into the response as is,
+    without being parsed and re-encoded. Meant for read-only views of large canvases.
+    """
     try:
-        request_model = GetCanvasRequest(canvasId=canvas_id, canvasVersion=version)
-        result = canvas_handler.get_canvas(customer_id, request_model)
-        return handle_response(result)
+        request_model = GetCanvasRequest(canvasId=canvas_id, canvasVersion=version, raw=raw)
+        if request_model.raw:
+            result = await canvas_handler.stream_canvas(customer_id, request_model)
+        else:
+            result = await canvas_handler.get_canvas(customer_id, request_model)
     except Exception as e:
         logger.exception("Failed to get canvas")
         raise HTTPException(status_code=500, detail=f"Failed to get canvas: {str(e)}")
+    if isinstance(result, dict):
+        return handle_response(result)
+    return StreamingResponse(result, media_type="application/json")
 
 @router.put('', response_model=UpdateCanvasResponse)
 async def update_canvas(
@@ -125,7 +122,7 @@ async def update_canvas(
         logger.info(f"Nodes count: {len(request_model.nodes) if request_model.nodes else 0}")
         logger.info(f"Edges count: {len(request_model.edges) if request_model.edges else 0}")
         
-        result = canvas_handler.update_canvas(customer_id, request_model)
+        result = await canvas_handler.update_canvas(customer_id, request_model)
         return handle_response(result)
     except RequestValidationError as e:
         logger.error(f"Request validation error: {str(e)}")
@@ -134,36 +131,56 @@ async def update_canvas(
         logger.exception("Failed to update canvas")
         raise HTTPException(status_code=500, detail=f"Failed to update canvas: {str(e)}")
 
-@router.delete('/{canvas_id}', response_model=DeleteCanvasResponse)
+@router.delete('/{canvas_id}', response_model=DeleteCanvasResponse, status_code=202)
 async def delete_canvas(
     canvas_id: str,
     request: Request = None,
     customer_id: str = Depends(CognitoAuth.get_customer_id)
 ):
-    """Delete a canvas and all its versions, including their definitions in S3."""
+    """Start deleting a canvas, all its versions and their objects in S3.
+
+    The deletion runs in the background; poll the returned job for its outcome.
+    """
     try:
         request_model = DeleteCanvasRequest(canvasId=canvas_id)
-        result = canvas_handler.delete_canvas(customer_id, request_model)
+        result = await canvas_handler.delete_canvas(customer_id, request_model)
         return handle_response(result)
     except Exception as e:
         logger.exception("Failed to delete canvas")
         raise HTTPException(status_code=500, detail=f"Failed to delete canvas: {str(e)}")
 
+@router.get('/{canvas_id}/deletions/{job_id}', response_model=GetCanvasDeletionResponse)
+async def get_canvas_deletion(
+    canvas_id: str,
+    job_id: str,
+    request: Request = None,
+    customer_id: str = Depends(CognitoAuth.get_customer_id)
+):
+    """Get the status of a canvas deletion started by DELETE /{canvas_id}."""
+    request_model = GetCanvasDeletionRequest(canvasId=canvas_id, jobId=job_id)
+    result = await canvas_handler.get_canvas_deletion(customer_id, request_model)
+    return handle_response(result)
+
 # Canvas Version Operations
 @router.get('/{canvas_id}/versions', response_model=ListCanvasVersionsResponse)
 async def list_canvas_versions(
     canvas_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
     request: Request = None,
     customer_id: str = Depends(CognitoAuth.get_customer_id)
 ):
-    """List all versions of a specific canvas."""
+    """List the versions of a specific canvas, most recently updated first.
+
+    Results are paged; pass ``nextCursor`` from a response as ``cursor`` to get the next page.
+    """
+    request_model = ListCanvasVersionsRequest(canvasId=canvas_id, limit=limit, cursor=cursor)
     try:
-        request_model = ListCanvasVersionsRequest(canvasId=canvas_id)
-        result = canvas_handler.list_canvas_versions(customer_id, request_model)
-        return handle_response(result)
+        result = await canvas_handler.list_canvas_versions(customer_id, request_model)
     except Exception as e:
         logger.exception("Failed to list canvas versions")
         raise HTTPException(status_code=500, detail=f"Failed to list canvas versions: {str(e)}")
+    return handle_response(result)
 
 @router.post('/{canvas_id}/version', response_model=CreateCanvasVersionResponse)
 async def create_canvas_version(
@@ -174,7 +191,7 @@ async def create_canvas_version(
     """Create a new version of a canvas from the current draft, including its definition."""
     try:
         request_model = CreateCanvasVersionRequest(canvasId=canvas_id)
-        result = canvas_handler.create_canvas_version(customer_id, request_model)
+        result = await canvas_handler.create_canvas_version(customer_id, request_model)
         return handle_response(result)
     except Exception as e:
         logger.exception("Failed to create canvas version")
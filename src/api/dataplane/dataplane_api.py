@@ -1,8 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request, Depends, Body
-from fastapi.responses import JSONResponse, Response
-from typing import Optional, Dict, Any
+from fastapi.responses import Response, StreamingResponse
+from typing import Optional, Dict, Any, AsyncIterator
 import logging
-from dataclasses import asdict
 from fastapi.exceptions import RequestValidationError
 from src.api.models.dataplane_models import CodeChange
 
@@ -10,6 +9,11 @@ from src.api.models.dataplane_models import CodeChange
 from src.api.models.dataplane_models import (
     GenerateCodeRequest,
     GenerateCodeResponse,
+    CodeStreamEvent,
+    GenerateCanvasCodeRequest,
+    GenerateCanvasCodeResponse,
+    RegenerateDirtyCodeRequest,
+    RegenerateDirtyCodeResponse,
     ApplyCodeChangesRequest,
     ApplyCodeChangesResponse,
     GetCodeRequest,
@@ -17,7 +21,12 @@ from src.api.models.dataplane_models import (
     CodeFile
 )
 from src.api.handlers.dataplane_handler import DataplaneApiHandler
+from src.agents.coordinator import agent_coordinator
+from src.agents.coordinator.agent_coordinator import response_cache_metrics
+from src.inference.rate_limiter import rate_limiter_registry
+from src.storage.canvas_definition_cache import canvas_definition_cache
 from src.api.auth.cognito_auth import CognitoAuth
+from src.api.response_encoder import encode_response
 
 router = APIRouter(prefix="/api/v1/dataplane", tags=["dataplane"])
 dataplane_handler = DataplaneApiHandler()
@@ -27,13 +36,8 @@ def handle_response(result: Dict[str, Any]) -> Response:
     if "error" in result:
         raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
     
-    # Convert the result to a dictionary if it's a dataclass
-    data = result.get("data", {})
-    if hasattr(data, '__dataclass_fields__'):
-        data = asdict(data)
-    
-    return JSONResponse(
-        content=data,
+    return Response(
+        content=encode_response(result.get("data", {})),
         status_code=result.get("status_code", 200),
         media_type="application/json"
     )
@@ -55,6 +59,71 @@ async def generate_code(
         logger.exception("Failed to generate code")
         raise HTTPException(status_code=500, detail=f"Failed to generate code: {str(e)}")
 
+async def encode_ndjson(events: AsyncIterator[CodeStreamEvent]) -> AsyncIterator[str]:
+    async for event in events:
+        yield event.to_json() + "\n"
+
+@router.post('/generate-code/stream')
+async def stream_code(
+    request_model: GenerateCodeRequest = Body(...),
+    request: Request = None,
+    customer_id: str = Depends(CognitoAuth.get_customer_id)
+):
+    """Generate code for a specific node, streaming each file as newline-delimited JSON as soon as it is complete.
+
+    Every line is a CodeStreamEvent. The stream ends with a "done" event; prompt
+    failures arrive as "error" events because the status code has already been sent.
+    """
+    try:
+        result = await dataplane_handler.stream_code(customer_id, request_model)
+    except RequestValidationError as e:
+        logger.error(f"Request validation error: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception("Failed to stream code")
+        raise HTTPException(status_code=500, detail=f"Failed to stream code: {str(e)}")
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    return StreamingResponse(encode_ndjson(result), media_type="application/x-ndjson")
+
+@router.post('/generate-canvas-code', response_model=GenerateCanvasCodeResponse)
+async def generate_canvas_code(
+    request_model: GenerateCanvasCodeRequest = Body(...),
+    request: Request = None,
+    customer_id: str = Depends(CognitoAuth.get_customer_id)
+):
+    """Generate code for every node of a canvas, independent nodes in parallel, then the canvas entrypoints."""
+    try:
+        result = await dataplane_handler.generate_canvas_code(customer_id, request_model)
+    except RequestValidationError as e:
+        logger.error(f"Request validation error: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception("Failed to generate canvas code")
+        raise HTTPException(status_code=500, detail=f"Failed to generate canvas code: {str(e)}")
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    return result
+
+@router.post('/regenerate-dirty', response_model=RegenerateDirtyCodeResponse)
+async def regenerate_dirty(
+    request_model: RegenerateDirtyCodeRequest = Body(...),
+    request: Request = None,
+    customer_id: str = Depends(CognitoAuth.get_customer_id)
+):
+    """Regenerate and save only the nodes whose inputs changed since their code was generated."""
+    try:
+        result = await dataplane_handler.regenerate_dirty(customer_id, request_model)
+    except RequestValidationError as e:
+        logger.error(f"Request validation error: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception("Failed to regenerate dirty nodes")
+        raise HTTPException(status_code=500, detail=f"Failed to regenerate dirty nodes: {str(e)}")
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    return result
+
 def deserialize_codefile_list(lst):
     return [CodeFile.from_dict(f) if isinstance(f, dict) else f for f in lst or []]
 
@@ -75,7 +144,6 @@ async def apply_code_changes(
         request_model.codeChange.deletedFiles = deserialize_codefile_list(request_model.codeChange.deletedFiles)
 
         result = await dataplane_handler.apply_code_changes(customer_id, request_model)
-        return ApplyCodeChangesResponse(success=True)
 
     except RequestValidationError as e:
         logger.error(f"Request validation error: {str(e)}")
@@ -84,6 +152,9 @@ async def apply_code_changes(
     except Exception as e:
         logger.exception("Failed to apply code changes")
         raise HTTPException(status_code=500, detail=f"Failed to apply code changes: {str(e)}")
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    return result
 
 @router.post('/get-code', response_model=GetCodeResponse)
 async def get_code(
@@ -100,4 +171,26 @@ async def get_code(
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.exception("Failed to get code")
-        raise HTTPException(status_code=500, detail=f"Failed to get code: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get code: {str(e)}")
+
+@router.get('/inference-metrics')
+async def get_inference_metrics(
+    customer_id: str = Depends(CognitoAuth.get_customer_id)
+):
+    """Get process-wide inference metrics: LLM response cache hits and misses, rate
+    limiter queue depths and wait times, and router latency and error rates per provider."""
+    router = agent_coordinator.inference_router
+    return {
+        "responseCache": response_cache_metrics.to_dict(),
+        "rateLimiters": rate_limiter_registry.metrics(),
+        "router": router.get_stats() if router else {}
+    }
+
+@router.get('/storage-metrics')
+async def get_storage_metrics(
+    customer_id: str = Depends(CognitoAuth.get_customer_id)
+):
+    """Get process-wide storage metrics: canvas definition cache hits, misses and size."""
+    return {
+        "canvasDefinitionCache": canvas_definition_cache.stats()
+    }
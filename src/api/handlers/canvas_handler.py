@@ -1,8 +1,12 @@
-from typing import Dict, Any, Optional
+from typing import AsyncGenerator, AsyncIterator, Dict, Any, Optional, Union
 from datetime import datetime
 import uuid
 from src.storage.coordinator.canvas_coordinator import CanvasCoordinator
 from src.storage.models.models import CanvasDO, CanvasDefinitionDO
+from src.storage.deletion_jobs import canvas_deletion_jobs
+from src.storage.dynamodb.base_dao import InvalidContinuationTokenError
+from src.config.settings import LIST_PAGE_DEFAULT_LIMIT, LIST_PAGE_MAX_LIMIT
+from src.api.response_encoder import encode_response
 from src.api.models.canvas_models import (
     CreateCanvasRequest,
     CreateCanvasResponse,
@@ -12,6 +16,8 @@ from src.api.models.canvas_models import (
     GetCanvasResponse,
     DeleteCanvasRequest,
     DeleteCanvasResponse,
+    GetCanvasDeletionRequest,
+    GetCanvasDeletionResponse,
     ListCanvasVersionsRequest,
     ListCanvasVersionsResponse,
     ListCanvasVersionsResponseItem,
@@ -22,11 +28,45 @@ from src.api.models.canvas_models import (
     ListCanvasResponseItem
 )
 
+def get_page_limit(limit: Optional[int]) -> int:
+    """Page size to use for a listing, bounded by LIST_PAGE_MAX_LIMIT."""
+    if not limit or limit < 1:
+        return LIST_PAGE_DEFAULT_LIMIT
+    return min(limit, LIST_PAGE_MAX_LIMIT)
+
+async def splice_definition(envelope: bytes, chunks: AsyncGenerator[bytes, None]) -> AsyncIterator[bytes]:
+    """Merge the members of a stored JSON object into ``envelope``, an encoded JSON object, without parsing it.
+
+    Only the stored object's opening brace is inspected. It is read before this
+    returns, so a document that is not a JSON object fails before the response starts.
+    """
+    head = b""
+    rest = b""
+    async for chunk in chunks:
+        head = (head + chunk).lstrip()
+        if head and not head.startswith(b"{"):
+            break
+        rest = head[1:].lstrip()
+        if rest:
+            break
+    if not rest or not head.startswith(b"{"):
+        await chunks.aclose()
+        raise ValueError("Stored canvas definition is not a JSON object")
+
+    separator = b"" if rest.startswith(b"}") or envelope == b"{}" else b","
+
+    async def spliced() -> AsyncIterator[bytes]:
+        yield envelope[:-1] + separator + rest
+        async for chunk in chunks:
+            yield chunk
+
+    return spliced()
+
 class CanvasApiHandler:
     def __init__(self):
         self.coordinator = CanvasCoordinator()
     
-    def create_canvas(self, customer_id: str, request: CreateCanvasRequest) -> Dict[str, Any]:
+    async def create_canvas(self, customer_id: str, request: CreateCanvasRequest) -> Dict[str, Any]:
         try:
             canvas_id = str(uuid.uuid4())
             canvas_version = "draft"
@@ -51,7 +91,7 @@ class CanvasApiHandler:
                 )
             
 
-            success = self.coordinator.save_canvas(canvas_do, canvas_definition)
+            success = await self.coordinator.run_io(self.coordinator.save_canvas, canvas_do, canvas_definition)
             if success:
                 response = CreateCanvasResponse(canvasId=canvas_id)
                 return {"data": response.__dict__, "status_code": 201}
@@ -60,9 +100,9 @@ class CanvasApiHandler:
             import traceback
             return {"error": f"Failed to create canvas: {str(e)}", "status_code": 500}
     
-    def get_canvas(self, customer_id: str, request: GetCanvasRequest) -> Dict[str, Any]:
+    async def get_canvas(self, customer_id: str, request: GetCanvasRequest) -> Dict[str, Any]:
         try:
-            canvas, definition = self.coordinator.get_canvas(
+            canvas, definition = await self.coordinator.load_canvas(
                 customer_id, 
                 request.canvasId, 
                 request.canvasVersion
@@ -82,10 +122,38 @@ class CanvasApiHandler:
             return {"data": response.__dict__, "status_code": 200}
         except Exception as e:
             return {"error": f"Failed to get canvas: {str(e)}", "status_code": 500}
+
+    async def stream_canvas(self, customer_id: str, request: GetCanvasRequest) -> Union[AsyncIterator[bytes], Dict[str, Any]]:
+        """Like ``get_canvas``, but splices the stored definition into the response without decoding it.
+
+        Returns the response body as chunks, or a result dict if there is no
+        definition to stream.
+        """
+        try:
+            canvas, definition_chunks = await self.coordinator.open_canvas_definition(
+                customer_id,
+                request.canvasId,
+                request.canvasVersion
+            )
+            if not canvas:
+                return {"error": "Canvas not found", "status_code": 404}
+
+            metadata = {
+                "canvasId": canvas.canvas_id,
+                "canvasVersion": canvas.canvas_version,
+                "canvasName": canvas.canvas_name,
+                "createdAt": canvas.created_at,
+                "updatedAt": canvas.updated_at
+            }
+            if definition_chunks is None:
+                return {"data": {**metadata, "nodes": None, "edges": None}, "status_code": 200}
+            return await splice_definition(encode_response(metadata), definition_chunks)
+        except Exception as e:
+            return {"error": f"Failed to get canvas: {str(e)}", "status_code": 500}
     
-    def update_canvas(self, customer_id: str, request: UpdateCanvasRequest) -> Dict[str, Any]:
+    async def update_canvas(self, customer_id: str, request: UpdateCanvasRequest) -> Dict[str, Any]:
         try:
-            canvas, definition = self.coordinator.get_canvas(
+            canvas, definition = await self.coordinator.load_canvas(
                 customer_id, 
                 request.canvasId, 
                 "draft"
@@ -102,7 +170,7 @@ class CanvasApiHandler:
                     edges=request.edges
                 )
 
-            success = self.coordinator.save_canvas(canvas, definition)
+            success = await self.coordinator.run_io(self.coordinator.save_canvas, canvas, definition)
             if success:
                 response = UpdateCanvasResponse(canvasId=canvas.canvas_id)
                 return {"data": response.__dict__, "status_code": 200}
@@ -110,33 +178,63 @@ class CanvasApiHandler:
         except Exception as e:
             return {"error": f"Failed to update canvas: {str(e)}", "status_code": 500}
     
-    def delete_canvas(self, customer_id: str, request: DeleteCanvasRequest) -> Dict[str, Any]:
+    async def delete_canvas(self, customer_id: str, request: DeleteCanvasRequest) -> Dict[str, Any]:
         try:
-            if self.coordinator.delete_canvas_all_versions(customer_id, request.canvasId):
-                response = DeleteCanvasResponse(canvasId=request.canvasId)
-                return {"data": response.__dict__, "status_code": 200}
-            return {"error": "Failed to delete canvas", "status_code": 500}
+            job = canvas_deletion_jobs.start(
+                customer_id,
+                request.canvasId,
+                lambda: self.coordinator.delete_canvas_all_versions(customer_id, request.canvasId)
+            )
+            response = DeleteCanvasResponse(canvasId=request.canvasId, jobId=job.job_id, status=job.status.value)
+            return {"data": response.__dict__, "status_code": 202}
         except Exception as e:
             return {"error": f"Failed to delete canvas: {str(e)}", "status_code": 500}
+
+    async def get_canvas_deletion(self, customer_id: str, request: GetCanvasDeletionRequest) -> Dict[str, Any]:
+        job = canvas_deletion_jobs.get(customer_id, request.jobId)
+        if not job or job.canvas_id != request.canvasId:
+            return {"error": "Deletion job not found", "status_code": 404}
+        response = GetCanvasDeletionResponse(
+            canvasId=job.canvas_id,
+            jobId=job.job_id,
+            status=job.status.value,
+            createdAt=job.created_at,
+            finishedAt=job.finished_at,
+            deletedItems=job.deleted_items,
+            deletedObjects=job.deleted_objects,
+            errorMessage=job.error_message
+        )
+        return {"data": response.__dict__, "status_code": 200}
     
-    def list_canvas_versions(self, customer_id: str, request: ListCanvasVersionsRequest) -> Dict[str, Any]:
+    async def list_canvas_versions(self, customer_id: str, request: ListCanvasVersionsRequest) -> Dict[str, Any]:
         try:
-            versions = self.coordinator.list_canvas_versions(customer_id, request.canvasId)
+            versions, next_cursor = await self.coordinator.run_io(
+                self.coordinator.list_canvas_versions_page,
+                customer_id,
+                request.canvasId,
+                get_page_limit(request.limit),
+                request.cursor
+            )
             response = ListCanvasVersionsResponse(
                 canvasVersions=[
                     ListCanvasVersionsResponseItem(
                         canvasId=request.canvasId,
-                        canvasVersion=version
+                        canvasVersion=version.canvas_version,
+                        createdAt=version.created_at,
+                        updatedAt=version.updated_at
                     ) for version in versions
-                ]
+                ],
+                nextCursor=next_cursor
             )
             return {"data": response.to_dict(), "status_code": 200}
+        except InvalidContinuationTokenError as e:
+            return {"error": str(e), "status_code": 400}
         except Exception as e:
             return {"error": f"Failed to list canvas versions: {str(e)}", "status_code": 500}
     
-    def create_canvas_version(self, customer_id: str, request: CreateCanvasVersionRequest) -> Dict[str, Any]:
+    async def create_canvas_version(self, customer_id: str, request: CreateCanvasVersionRequest) -> Dict[str, Any]:
         try:
-            new_version = self.coordinator.create_canvas_version(customer_id, request.canvasId)
+            new_version = await self.coordinator.run_io(self.coordinator.create_canvas_version, customer_id, request.canvasId)
             if new_version:
                 response = CreateCanvasVersionResponse(
                     canvasId=request.canvasId,
@@ -147,9 +245,14 @@ class CanvasApiHandler:
         except Exception as e:
             return {"error": f"Failed to create new version: {str(e)}", "status_code": 500}
     
-    def list_canvases(self, customer_id: str, request: ListCanvasRequest) -> Dict[str, Any]:
+    async def list_canvases(self, customer_id: str, request: ListCanvasRequest) -> Dict[str, Any]:
         try:
-            canvases = self.coordinator.get_unique_canvases(customer_id)
+            canvases, next_cursor = await self.coordinator.run_io(
+                self.coordinator.list_canvases_page,
+                customer_id,
+                get_page_limit(request.limit),
+                request.cursor
+            )
             response = ListCanvasResponse (
                 canvases=[
                     ListCanvasResponseItem(
@@ -159,8 +262,11 @@ class CanvasApiHandler:
                         createdAt=canvas.created_at,
                         updatedAt=canvas.updated_at
                     ) for canvas in canvases
-                ]
+                ],
+                nextCursor=next_cursor
             )
             return {"data": response.to_dict(), "status_code": 200}
+        except InvalidContinuationTokenError as e:
+            return {"error": str(e), "status_code": 400}
         except Exception as e:
-            return {"error": f"Failed to list canvases: {str(e)}", "status_code": 500} 
\ No newline at end of file
+            return {"error": f"Failed to list canvases: {str(e)}", "status_code": 500}
\ No newline at end of file
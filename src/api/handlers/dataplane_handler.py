@@ -1,6 +1,10 @@
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Union
 from src.api.models.dataplane_models import GenerateCodeRequest, GenerateCodeResponse, ApplyCodeChangesRequest, ApplyCodeChangesResponse, GetCodeRequest, GetCodeResponse
+from src.api.models.dataplane_models import GenerateCanvasCodeRequest, GenerateCanvasCodeResponse
+from src.api.models.dataplane_models import RegenerateDirtyCodeRequest, RegenerateDirtyCodeResponse
+from src.api.models.dataplane_models import CodeStreamEvent
 from src.storage.coordinator.dataplane_coordinator import DataplaneCoordinator
+from src.storage.coordinator.base_coordinator import CodeConflictError, ImmutableVersionError
 from src.storage.models.models import CodeDO
 
 class DataplaneApiHandler:
@@ -17,10 +21,64 @@ class DataplaneApiHandler:
                 "status_code": 500
             } 
 
+    async def stream_code(self, customer_id: str, request: GenerateCodeRequest) -> Union[AsyncIterator[CodeStreamEvent], Dict[str, Any]]:
+        try:
+            return await self.coordinator.open_code_stream(customer_id, request)
+        except Exception as e:
+            return {
+                "error": str(e),
+                "status_code": 500
+            }
+
+    async def generate_canvas_code(self, customer_id: str, request: GenerateCanvasCodeRequest) -> GenerateCanvasCodeResponse:
+        try:
+            response = await self.coordinator.generate_canvas_code(customer_id, request)
+            return response
+        except ImmutableVersionError as e:
+            return {
+                "error": str(e),
+                "status_code": 400
+            }
+        except CodeConflictError as e:
+            return {
+                "error": str(e),
+                "status_code": 409
+            }
+        except Exception as e:
+            return {
+                "error": str(e),
+                "status_code": 500
+            }
+
+    async def regenerate_dirty(self, customer_id: str, request: RegenerateDirtyCodeRequest) -> RegenerateDirtyCodeResponse:
+        try:
+            response = await self.coordinator.regenerate_dirty(customer_id, request)
+            return response
+        except ImmutableVersionError as e:
+            return {
+                "error": str(e),
+                "status_code": 400
+            }
+        except CodeConflictError as e:
+            return {
+                "error": str(e),
+                "status_code": 409
+            }
+        except Exception as e:
+            return {
+                "error": str(e),
+                "status_code": 500
+            }
+
     async def apply_code_changes(self, customer_id: str, request: ApplyCodeChangesRequest) -> ApplyCodeChangesResponse:
         try:
-            response = await self.coordinator.apply_code_changes(customer_id, request)
-            return ApplyCodeChangesResponse(success=True)
+            code_version = await self.coordinator.apply_code_changes(customer_id, request)
+            return ApplyCodeChangesResponse(success=True, codeVersion=code_version)
+        except CodeConflictError as e:
+            return {
+                "error": str(e),
+                "status_code": 409
+            }
         except Exception as e:
             return {
                 "error": str(e),
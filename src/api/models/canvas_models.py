@@ -39,6 +39,7 @@ class GetCanvasRequest:
     """Request model for getting a canvas."""
     canvasId: str
     canvasVersion: str
+    raw: bool = False  # Return the stored definition as is, without parsing it; for read-only views
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -61,14 +62,37 @@ class DeleteCanvasRequest:
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
 class DeleteCanvasResponse:
-    """Canvas metadata stored in DynamoDB."""
+    """Response model for deleting a canvas; the deletion runs in the background."""
+    canvasId: str
+    jobId: Optional[str] = None
+    status: Optional[str] = None
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class GetCanvasDeletionRequest:
+    """Request model for polling a canvas deletion."""
     canvasId: str
+    jobId: str
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class GetCanvasDeletionResponse:
+    """Response model for polling a canvas deletion."""
+    canvasId: str
+    jobId: str
+    status: str
+    createdAt: str
+    finishedAt: Optional[str] = None
+    deletedItems: int = 0
+    deletedObjects: int = 0
+    errorMessage: Optional[str] = None
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
 class ListCanvasRequest:
     """Request model for listing canvases."""
-    pass
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -84,6 +108,7 @@ class ListCanvasResponseItem:
 class ListCanvasResponse:
     """Response model for listing canvases."""
     canvases: List[ListCanvasResponseItem]  # List of {canvasId, canvasName}
+    nextCursor: Optional[str] = None  # Pass as cursor to get the next page; None on the last page
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -103,17 +128,22 @@ class CreateCanvasVersionResponse:
 class ListCanvasVersionsRequest:
     """Request model for listing canvas versions."""
     canvasId: str
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
 class ListCanvasVersionsResponseItem:
     canvasId: str
     canvasVersion: str
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
 class ListCanvasVersionsResponse:
     """Response model for listing canvas versions."""
     canvasVersions: List[ListCanvasVersionsResponseItem]  # List of {canvasVersion, createdAt}
+    nextCursor: Optional[str] = None  # Pass as cursor to get the next page; None on the last page
 
 
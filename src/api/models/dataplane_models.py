@@ -76,6 +76,8 @@ class GenerateCodeRequest:
     canvasVersion: str
     nodeId: str
     programmingLanguage: ProgrammingLanguage
+    # Skip cached LLM responses and always call the model
+    bypassCache: bool = False
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -84,6 +86,25 @@ class GenerateCodeResponse:
     updatedFiles: List[CodeFile]
     deletedFiles: List[CodeFile]
 
+class CodeStreamEventType(str, Enum):
+    FILE = "file"
+    REASONING = "reasoning"
+    ERROR = "error"
+    DONE = "done"
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class CodeStreamEvent:
+    """One line of the streamed generate-code response."""
+    eventType: CodeStreamEventType
+    # "node" or "canvas": which of the two prompts produced the event
+    source: Optional[str] = None
+    # "added", "updated" or "deleted" for file events
+    fileAction: Optional[str] = None
+    file: Optional[CodeFile] = None
+    reason: Optional[str] = None
+    errorMessage: Optional[str] = None
+
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
 class CodeChange:
@@ -97,8 +118,58 @@ class ApplyCodeChangesRequest:
     canvasId: str
     canvasVersion: str
     codeChange: CodeChange
+    # Code version the change was made against; if set, the change is rejected
+    # instead of rebased when the code has moved on since
+    expectedCodeVersion: Optional[int] = None
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
 class ApplyCodeChangesResponse:
     success: bool
+    # Code version after the change; sequential changes get increasing versions
+    codeVersion: Optional[int] = None
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class GenerateCanvasCodeRequest:
+    canvasId: str
+    canvasVersion: str
+    programmingLanguage: ProgrammingLanguage
+    # Nodes generated at the same time; capped by the server-side limit
+    maxParallelism: Optional[int] = None
+    bypassCache: bool = False
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class NodeGenerationError:
+    nodeId: str
+    errorMessage: str
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class GenerateCanvasCodeResponse:
+    addedFiles: List[CodeFile]
+    updatedFiles: List[CodeFile]
+    deletedFiles: List[CodeFile]
+    nodeErrors: List[NodeGenerationError]
+    canvasErrorMessage: Optional[str] = None
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class RegenerateDirtyCodeRequest:
+    canvasId: str
+    canvasVersion: str
+    programmingLanguage: ProgrammingLanguage
+    maxParallelism: Optional[int] = None
+    bypassCache: bool = False
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class RegenerateDirtyCodeResponse:
+    # Nodes whose inputs changed, plus their transitive dependents
+    regeneratedNodeIds: List[str]
+    addedFiles: List[CodeFile]
+    updatedFiles: List[CodeFile]
+    deletedFiles: List[CodeFile]
+    nodeErrors: List[NodeGenerationError]
+    canvasErrorMessage: Optional[str] = None
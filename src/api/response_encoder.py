@@ -0,0 +1,236 @@
+import dataclasses
+import math
+import threading
+from enum import Enum
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+from dataclasses_json import DataClassJsonMixin
+from src.config.settings import RESPONSE_JSON_ENCODER
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+# Appends the JSON text of a value to a list of parts
+Writer = Callable[[Any, List[str]], None]
+
+_key_tables: Dict[type, List[Tuple[str, str]]] = {}
+_key_tables_lock = threading.Lock()
+
+
+def dataclass_keys(cls: type) -> List[Tuple[str, str]]:
+    """(attribute name, JSON key) for each field of a dataclass, computed once per class.
+
+    Keys follow the class's dataclasses_json letter case, as ``to_dict`` would.
+    """
+    keys = _key_tables.get(cls)
+    if keys is None:
+        config = getattr(cls, 'dataclass_json_config', None) or {}
+        letter_case = config.get('letter_case')
+        keys = []
+        for field in dataclasses.fields(cls):
+            field_case = field.metadata.get('dataclasses_json', {}).get('letter_case', letter_case)
+            keys.append((field.name, field_case(field.name) if field_case else field.name))
+        with _key_tables_lock:
+            _key_tables[cls] = keys
+    return keys
+
+
+def has_field_overrides(cls: type) -> bool:
+    """Whether any field sets a dataclasses_json encoder or exclude, which only ``to_dict`` applies."""
+    return any(
+        'encoder' in field.metadata.get('dataclasses_json', {}) or 'exclude' in field.metadata.get('dataclasses_json', {})
+        for field in dataclasses.fields(cls)
+    )
+
+
+def has_custom_to_dict(cls: type) -> bool:
+    """Whether the class defines its own ``to_dict`` rather than the dataclasses_json one.
+
+    ``@dataclass_json`` replaces a ``to_dict`` written in the decorated class's body,
+    so this finds plain dataclasses and subclasses that override it.
+    """
+    to_dict = getattr(cls, 'to_dict', None)
+    return to_dict is not None and to_dict is not DataClassJsonMixin.to_dict
+
+
+def encodes_fields(cls: type) -> bool:
+    """Whether a class can be encoded field by field instead of through ``to_dict``."""
+    return dataclasses.is_dataclass(cls) and not has_field_overrides(cls) and not has_custom_to_dict(cls)
+
+
+class ResponseEncoder(Protocol):
+    name: str
+
+    def encode(self, content: Any) -> bytes:
+        """Encode a response body: dataclasses, dicts, lists, enums and JSON scalars."""
+        ...
+
+
+class CompiledJSONEncoder:
+    """Encodes responses with a writer compiled once per type.
+
+    A dataclass writer holds its precomputed ``"key":`` fragments and emits field
+    values straight into the output, so no intermediate dicts are built. Output
+    matches ``json.dumps(..., ensure_ascii=False, separators=(",", ":"))`` of the
+    objects' ``to_dict()``; classes with their own ``to_dict`` are written through it.
+    """
+
+    name = "compiled"
+
+    def __init__(self):
+        self._writers: Dict[type, Writer] = {}
+
+    def encode(self, content: Any) -> bytes:
+        parts: List[str] = []
+        self._write(content, parts)
+        return ''.join(parts).encode('utf-8')
+
+    def _write(self, value: Any, parts: List[str]) -> None:
+        writer = self._writers.get(value.__class__)
+        if writer is None:
+            writer = self._compile(value.__class__)
+        writer(value, parts)
+
+    def _compile(self, cls: type) -> Writer:
+        writer = self._build_writer(cls)
+        self._writers[cls] = writer
+        return writer
+
+    def _build_writer(self, cls: type) -> Writer:
+        write = self._write
+        if issubclass(cls, Enum):
+            return lambda value, parts: write(value.value, parts)
+        if issubclass(cls, str):
+            return lambda value, parts: parts.append(encode_basestring(value))
+        if cls is type(None):
+            return lambda value, parts: parts.append('null')
+        if issubclass(cls, bool):
+            return lambda value, parts: parts.append('true' if value else 'false')
+        if issubclass(cls, int):
+            return lambda value, parts: parts.append(int.__repr__(value))
+        if issubclass(cls, float):
+            def write_float(value: float, parts: List[str]) -> None:
+                if not math.isfinite(value):
+                    raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+                parts.append(float.__repr__(value))
+            return write_float
+        if issubclass(cls, (list, tuple)):
+            def write_list(value: Any, parts: List[str]) -> None:
+                if not value:
+                    parts.append('[]')
+                    return
+                separator = '['
+                for item in value:
+                    parts.append(separator)
+                    if item.__class__ is str:
+                        parts.append(encode_basestring(item))
+                    else:
+                        write(item, parts)
+                    separator = ','
+                parts.append(']')
+            return write_list
+        if issubclass(cls, dict):
+            def write_dict(value: Dict[Any, Any], parts: List[str]) -> None:
+                if not value:
+                    parts.append('{}')
+                    return
+                separator = '{'
+                for key, item in value.items():
+                    if isinstance(key, Enum):
+                        key = key.value
+                    parts.append(separator + encode_basestring(str(key)) + ':')
+                    if item.__class__ is str:
+                        parts.append(encode_basestring(item))
+                    else:
+                        write(item, parts)
+                    separator = ','
+                parts.append('}')
+            return write_dict
+        if encodes_fields(cls):
+            fields = [
+                (name, ('{' if i == 0 else ',') + encode_basestring(key) + ':')
+                for i, (name, key) in enumerate(dataclass_keys(cls))
+            ]
+            if not fields:
+                return lambda value, parts: parts.append('{}')
+
+            def write_dataclass(value: Any, parts: List[str]) -> None:
+                for name, prefix in fields:
+                    parts.append(prefix)
+                    item = getattr(value, name)
+                    if item.__class__ is str:
+                        parts.append(encode_basestring(item))
+                    else:
+                        write(item, parts)
+                parts.append('}')
+            return write_dataclass
+        if hasattr(cls, 'to_dict'):
+            return lambda value, parts: write(value.to_dict(), parts)
+        raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+
+
+class OrjsonEncoder:
+    """Encodes responses with orjson.
+
+    orjson walks lists, dicts, enums and scalars in C; dataclasses are handed back
+    to ``_default`` so their keys follow the same letter case as ``CompiledJSONEncoder``.
+    Unlike the compiled encoder, NaN and infinite floats are written as ``null``.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+        self._options = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        # Dataclass keys, or None for classes that must go through to_dict
+        self._keys: Dict[type, Optional[List[Tuple[str, str]]]] = {}
+
+    def encode(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=self._default, option=self._options)
+
+    def _default(self, value: Any) -> Any:
+        cls = value.__class__
+        if cls not in self._keys:
+            self._keys[cls] = dataclass_keys(cls) if encodes_fields(cls) else None
+        keys = self._keys[cls]
+        if keys is not None:
+            return {key: getattr(value, name) for name, key in keys}
+        if hasattr(value, 'to_dict'):
+            return value.to_dict()
+        raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+
+
+def create_response_encoder(name: str = RESPONSE_JSON_ENCODER) -> ResponseEncoder:
+    """Create the encoder named by RESPONSE_JSON_ENCODER: "auto", "orjson" or "compiled".
+
+    "auto" uses orjson when it is installed.
+    """
+    if name == "orjson" or (name == "auto" and orjson is not None):
+        return OrjsonEncoder()
+    if name in ("auto", "compiled"):
+        return CompiledJSONEncoder()
+    raise ValueError(f"Unknown response encoder: {name}")
+
+
+_encoder: Optional[ResponseEncoder] = None
+
+
+def get_response_encoder() -> ResponseEncoder:
+    """Get the process-wide response encoder, creating it on first use."""
+    global _encoder
+    if _encoder is None:
+        _encoder = create_response_encoder()
+    return _encoder
+
+
+def set_response_encoder(encoder: ResponseEncoder) -> None:
+    """Replace the process-wide response encoder."""
+    global _encoder
+    _encoder = encoder
+
+
+def encode_response(content: Any) -> bytes:
+    return get_response_encoder().encode(content)
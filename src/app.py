@@ -5,6 +5,13 @@ from fastapi.exceptions import RequestValidationError
 from src.api.canvas_api import router as canvas_router
 from src.api.auth.routes import router as auth_router
 from src.api.dataplane.dataplane_api import router as dataplane_router
+from src.inference.client_registry import inference_client_registry
+from src.storage.io_executor import shutdown_storage_io_executor
+from src.storage.s3.async_s3_dao import close_async_s3_dao
+from src.storage.deletion_jobs import canvas_deletion_jobs
+from src.api.auth.cognito_auth import CognitoAuth
+from src.api.auth.cognito_http import get_cognito_http_client, close_cognito_http_client
+from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
 import uvicorn
@@ -39,8 +46,23 @@ logger.info(f"COGNITO_USER_POOL_ID: {os.getenv('COGNITO_USER_POOL_ID')}")
 logger.info(f"COGNITO_APP_CLIENT_ID: {os.getenv('COGNITO_APP_CLIENT_ID')}")
 logger.info(f"COGNITO_DOMAIN: {os.getenv('COGNITO_DOMAIN')}")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the pooled Cognito client up front so the first logins do not pay for it
+    get_cognito_http_client()
+    yield
+    # Background deletions need the storage clients, so stop them first
+    await canvas_deletion_jobs.close()
+    # Shared inference and storage clients hold connection pools and worker threads
+    await inference_client_registry.close()
+    shutdown_storage_io_executor()
+    await close_async_s3_dao()
+    await CognitoAuth.close()
+    await close_cognito_http_client()
+
 # Create FastAPI app with OpenAPI configuration
 app = FastAPI(
+    lifespan=lifespan,
     title="Canvas API",
     description="API for managing canvases",
     version="1.0.0",
@@ -1,6 +1,7 @@
 """
 Configuration settings for the project.
 """
+import os
 
 # S3 bucket for storing code and messages
 S3_BUCKET_NAME = "flowdev-code-store"
@@ -13,4 +14,107 @@ CANVAS_CHAT_THREADS_TABLE = "flow_canvas_chat_threads"
 
 # AWS Configuration
 AWS_REGION = "us-east-1"
-DYNAMODB_ENDPOINT = None  # Set to None for production, use local endpoint for development 
\ No newline at end of file
+DYNAMODB_ENDPOINT = None  # Set to None for production, use local endpoint for development
+
+# Storage I/O Configuration
+# Threads running blocking boto3 DynamoDB and S3 calls for async endpoints; also the
+# connection pool size of the storage clients, so every thread can hold a connection
+STORAGE_IO_MAX_WORKERS = int(os.getenv("STORAGE_IO_MAX_WORKERS", "32"))
+# Connection pool of the async S3 DAO, which is also its limit on concurrent S3 calls
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "64"))
+# Memory budget for parsed canvas definitions, counted as the size of their JSON; 0 disables the cache
+CANVAS_DEFINITION_CACHE_MAX_BYTES = int(os.getenv("CANVAS_DEFINITION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Read size when streaming a stored canvas definition into a raw GET canvas response
+CANVAS_DEFINITION_STREAM_CHUNK_BYTES = int(os.getenv("CANVAS_DEFINITION_STREAM_CHUNK_BYTES", str(64 * 1024)))
+# Finished canvas deletion jobs kept in memory for status polling
+DELETION_JOBS_MAX_FINISHED = int(os.getenv("DELETION_JOBS_MAX_FINISHED", "1000"))
+# Page size of canvas and version listings when the client does not ask for one
+LIST_PAGE_DEFAULT_LIMIT = int(os.getenv("LIST_PAGE_DEFAULT_LIMIT", "50"))
+# Largest page a client may ask for, so responses stay bounded regardless of account size
+LIST_PAGE_MAX_LIMIT = int(os.getenv("LIST_PAGE_MAX_LIMIT", "200"))
+
+# Inference Configuration
+# Maximum number of Bedrock invocations in flight per client; extra requests wait for a slot
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "16"))
+# Seconds a request may wait for a free Bedrock slot before it is rejected
+BEDROCK_QUEUE_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_QUEUE_TIMEOUT_SECONDS", "30"))
+# HTTP connection pool of each shared OpenAI client
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "32"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "16"))
+
+# Inference Routing
+# Provider used for code generation: "bedrock", "openai", or "auto" to route between INFERENCE_ROUTER_PROVIDERS.
+# "auto" may send prompts to every provider in that list, so it must be chosen explicitly
+INFERENCE_PROVIDER = os.getenv("INFERENCE_PROVIDER", "bedrock").lower()
+# Providers the router may use, in order of preference until latency data is available
+INFERENCE_ROUTER_PROVIDERS = [p.strip() for p in os.getenv("INFERENCE_ROUTER_PROVIDERS", "bedrock,openai").split(",") if p.strip()]
+# Number of recent calls per provider used for latency percentiles and error rate
+INFERENCE_ROUTER_WINDOW = int(os.getenv("INFERENCE_ROUTER_WINDOW", "100"))
+# Calls needed before a provider's latency is trusted for ranking
+INFERENCE_ROUTER_MIN_SAMPLES = int(os.getenv("INFERENCE_ROUTER_MIN_SAMPLES", "5"))
+# Providers failing more often than this are only used when no healthy provider is left
+INFERENCE_ROUTER_MAX_ERROR_RATE = float(os.getenv("INFERENCE_ROUTER_MAX_ERROR_RATE", "0.5"))
+# Send a second, hedged request to the next provider once the first exceeds its p95 latency
+INFERENCE_HEDGING_ENABLED = os.getenv("INFERENCE_HEDGING_ENABLED", "false").lower() == "true"
+# Hedge delay used until the primary provider has enough latency samples
+INFERENCE_HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("INFERENCE_HEDGE_DEFAULT_DELAY_SECONDS", "30"))
+
+# Inference Admission Control
+# Per provider/model quotas; excess requests queue until the token buckets refill
+BEDROCK_REQUESTS_PER_MINUTE = float(os.getenv("BEDROCK_REQUESTS_PER_MINUTE", "100"))
+BEDROCK_TOKENS_PER_MINUTE = float(os.getenv("BEDROCK_TOKENS_PER_MINUTE", "200000"))
+OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+OPENAI_TOKENS_PER_MINUTE = float(os.getenv("OPENAI_TOKENS_PER_MINUTE", "300000"))
+# Requests beyond this many waiting are rejected immediately
+RATE_LIMIT_MAX_QUEUE_DEPTH = int(os.getenv("RATE_LIMIT_MAX_QUEUE_DEPTH", "64"))
+# Seconds a request may wait for quota before it is rejected
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "60"))
+# Throttling responses shrink the effective quota down to this fraction of the configured one
+RATE_LIMIT_MIN_RATE_FRACTION = float(os.getenv("RATE_LIMIT_MIN_RATE_FRACTION", "0.1"))
+
+# Code Generation Configuration
+# Per-prompt time limits for the node-level and canvas-level generation prompts
+NODE_PROMPT_TIMEOUT_SECONDS = float(os.getenv("NODE_PROMPT_TIMEOUT_SECONDS", "180"))
+CANVAS_PROMPT_TIMEOUT_SECONDS = float(os.getenv("CANVAS_PROMPT_TIMEOUT_SECONDS", "180"))
+# Upper bound on nodes generated at the same time by whole-canvas generation
+CANVAS_GENERATION_MAX_PARALLELISM = int(os.getenv("CANVAS_GENERATION_MAX_PARALLELISM", "8"))
+# Attempts to commit a code change that keeps losing to concurrent non-conflicting changes
+APPLY_CODE_CHANGES_MAX_ATTEMPTS = int(os.getenv("APPLY_CODE_CHANGES_MAX_ATTEMPTS", "8"))
+# Upper bound of the first jittered wait before re-basing; doubles with every attempt
+APPLY_CODE_CHANGES_RETRY_BASE_DELAY_SECONDS = float(os.getenv("APPLY_CODE_CHANGES_RETRY_BASE_DELAY_SECONDS", "0.05"))
+
+# LLM Response Cache Configuration
+# Backend for cached LLM responses: "memory", "disk", "s3" or "none" to disable caching
+LLM_RESPONSE_CACHE_BACKEND = os.getenv("LLM_RESPONSE_CACHE_BACKEND", "memory").lower()
+LLM_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+# Streamed responses longer than this many characters are not buffered for caching
+LLM_RESPONSE_CACHE_MAX_STREAMED_CHARS = int(os.getenv("LLM_RESPONSE_CACHE_MAX_STREAMED_CHARS", str(256 * 1024)))
+# Only used by the in-process backend
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+# Only used by the disk backend
+LLM_RESPONSE_CACHE_DIR = os.getenv("LLM_RESPONSE_CACHE_DIR", ".cache/llm-responses")
+# Only used by the S3 backend; objects are stored under this prefix of the code bucket
+LLM_RESPONSE_CACHE_S3_PREFIX = os.getenv("LLM_RESPONSE_CACHE_S3_PREFIX", "llm-response-cache/")
+
+# Auth Configuration
+# Verify Cognito token signatures against the user pool's JWKS
+COGNITO_VERIFY_SIGNATURE = os.getenv("COGNITO_VERIFY_SIGNATURE", "false").lower() == "true"
+# Age after which the cached JWKS is refreshed in the background
+JWKS_REFRESH_INTERVAL_SECONDS = float(os.getenv("JWKS_REFRESH_INTERVAL_SECONDS", "3600"))
+# Minimum spacing of refreshes triggered by unknown key IDs, and how long an unknown key ID is remembered
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = float(os.getenv("JWKS_MIN_REFRESH_INTERVAL_SECONDS", "60"))
+# Timeouts for calls to Cognito's OAuth and JWKS endpoints
+COGNITO_HTTP_TIMEOUT_SECONDS = float(os.getenv("COGNITO_HTTP_TIMEOUT_SECONDS", "10"))
+COGNITO_HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("COGNITO_HTTP_CONNECT_TIMEOUT_SECONDS", "3"))
+# Pooled keep-alive connections to Cognito shared by all requests
+COGNITO_HTTP_MAX_CONNECTIONS = int(os.getenv("COGNITO_HTTP_MAX_CONNECTIONS", "100"))
+# Retries for failed connections, and for throttled or failed requests that are safe to repeat
+COGNITO_HTTP_MAX_RETRIES = int(os.getenv("COGNITO_HTTP_MAX_RETRIES", "2"))
+# Upper bound of the first jittered wait between retries; doubles with every attempt
+COGNITO_HTTP_RETRY_BASE_DELAY_SECONDS = float(os.getenv("COGNITO_HTTP_RETRY_BASE_DELAY_SECONDS", "0.2"))
+# Verified tokens remembered until they expire, so repeat requests skip decoding; 0 disables the cache
+VERIFIED_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("VERIFIED_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+# API Response Configuration
+# JSON encoder for API responses: "auto" (orjson when installed), "orjson" or "compiled"
+RESPONSE_JSON_ENCODER = os.getenv("RESPONSE_JSON_ENCODER", "auto").lower()
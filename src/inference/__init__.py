@@ -1,7 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from .models.inference_models import InferenceResponse
 
+
+class InferenceStreamError(Exception):
+    """Raised by ``generate_stream`` when the model call fails."""
+
+    def __init__(self, message: str, throttled: bool = False):
+        super().__init__(message)
+        # Rejected for exceeding rate limits, by the provider or by admission control
+        self.throttled = throttled
+
+
 class BaseLLMInference(ABC):
     """Base class for LLM inference implementations."""
     
@@ -17,6 +27,34 @@ class BaseLLMInference(ABC):
         """
         pass
 
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate text using the LLM, yielding chunks as they arrive.
+
+        The default implementation yields the whole completion of ``generate`` as a
+        single chunk; clients backed by streaming APIs override it.
+
+        Args:
+            prompt: The prompt to send to the LLM.
+
+        Yields:
+            Consecutive pieces of the generated text.
+
+        Raises:
+            InferenceStreamError: If the model call fails.
+        """
+        response = await self.generate(prompt)
+        if response.error:
+            raise InferenceStreamError(response.error, throttled=response.throttled)
+        if response.text_response:
+            yield response.text_response
+
+    async def close(self) -> None:
+        """Release connections and threads held by the client.
+
+        Shared clients are closed once, on application shutdown.
+        """
+        pass
+
     @abstractmethod
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model.
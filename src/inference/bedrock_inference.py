@@ -1,24 +1,67 @@
 import os
 import json
+import asyncio
 import logging
 import boto3
-from typing import Optional, List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable
 from botocore.config import Config
-from . import BaseLLMInference
+from botocore.exceptions import ClientError
+from . import BaseLLMInference, InferenceStreamError
 from .models.inference_models import InferenceResponse, ToolCall
+from src.config.settings import BEDROCK_MAX_CONCURRENCY, BEDROCK_QUEUE_TIMEOUT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Error codes Bedrock uses when a request exceeds the account's quotas
+THROTTLING_ERROR_CODES = {"throttlingexception", "toomanyrequestsexception", "servicequotaexceededexception"}
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Whether a boto3 error means Bedrock throttled the request."""
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code", "")
+    return code.lower() in THROTTLING_ERROR_CODES
+
 class BedrockInference(BaseLLMInference):
-    def __init__(self, model: str = "anthropic.claude-3-haiku-20240307-v1:0"):
-        config = Config(retries={"max_attempts": 3})
+    """Bedrock inference client.
+
+    boto3 is synchronous, so every ``invoke_model`` call runs on a bounded thread
+    pool owned by the client. At most ``max_concurrency`` invocations are in flight;
+    further requests wait (without blocking the event loop) for up to
+    ``queue_timeout`` seconds and are then rejected with an error response.
+
+    Clients are meant to be long-lived and shared; get them from the
+    ``InferenceClientRegistry`` rather than constructing one per request.
+    """
+
+    def __init__(
+        self,
+        model: str = "anthropic.claude-3-haiku-20240307-v1:0",
+        max_concurrency: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        region: Optional[str] = None
+    ):
+        self.max_concurrency = max_concurrency or BEDROCK_MAX_CONCURRENCY
+        self.queue_timeout = BEDROCK_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        config = Config(
+            retries={"max_attempts": 3},
+            max_pool_connections=self.max_concurrency
+        )
         self.client = boto3.client(
             service_name="bedrock-runtime",  # 👈 Must match for converse support
             config=config,
-            region_name=os.getenv("AWS_REGION", "us-east-1")
+            region_name=region or os.getenv("AWS_REGION", "us-east-1")
         )
         self.model = model
         self.system_prompt = "You are an expert code generator. Generate clean, well-documented code following best practices."
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="bedrock-invoke"
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
 
     def get_model_info(self) -> Dict[str, Any]:
         return {
@@ -27,43 +70,161 @@ class BedrockInference(BaseLLMInference):
             "api": "converse",
             "capabilities": ["code generation", "multi-turn conversation"],
             "max_tokens": 4096,
-            "temperature": 0.7
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "top_k": 250,
+            "stop_sequences": ["</generated_code>"],
+            "max_concurrency": self.max_concurrency
+        }
+
+    async def close(self) -> None:
+        """Stop the invocation thread pool and close the boto3 client's connections."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
+    def _build_request_body(self, prompt: str) -> Dict[str, Any]:
+        """Format the request body for Claude."""
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 4096,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "top_k": 250,
+            "stop_sequences": ["</generated_code>"]
         }
 
+    def _invoke_model(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke the model synchronously. Runs on the client's thread pool."""
+        response = self.client.invoke_model(
+            modelId=self.model,
+            body=json.dumps(request_body)
+        )
+        return json.loads(response['body'].read())
+
+    async def _acquire_slot(self) -> bool:
+        """Wait for a free invocation slot, giving up after ``queue_timeout`` seconds."""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _stream_model(
+        self,
+        request_body: Dict[str, Any],
+        on_chunk: Callable[[str], None],
+        stop: threading.Event
+    ) -> None:
+        """Invoke the model with a response stream, passing each text delta to ``on_chunk``.
+
+        Runs on the client's thread pool. Stops reading early once ``stop`` is set.
+        """
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model,
+            body=json.dumps(request_body)
+        )
+        stream = response['body']
+        try:
+            for event in stream:
+                if stop.is_set():
+                    break
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                payload = json.loads(chunk['bytes'])
+                if payload.get('type') == 'content_block_delta':
+                    text = payload.get('delta', {}).get('text')
+                    if text:
+                        on_chunk(text)
+        finally:
+            stream.close()
+
+    async def _run_in_slot(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn`` on the thread pool, holding a slot until the thread finishes.
+
+        The slot is released from the worker thread's completion rather than from the
+        awaiting coroutine, so a cancelled caller cannot free a slot while its boto3
+        call is still occupying a pool thread.
+        """
+        loop = asyncio.get_running_loop()
+
+        def release_slot(_):
+            try:
+                loop.call_soon_threadsafe(self._slots.release)
+            except RuntimeError:
+                # Event loop already closed; nobody is waiting on the slot any more
+                pass
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(release_slot)
+        return await asyncio.wrap_future(future)
+
     async def generate(self, prompt: str) -> InferenceResponse:
         """Generate text using Bedrock Claude."""
         try:
-            # Format request body for Claude
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 4096,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.7,
-                "top_p": 0.95,
-                "top_k": 250,
-                "stop_sequences": ["</generated_code>"]
-            }
-
-            # Invoke model
-            response = self.client.invoke_model(
-                modelId=self.model,
-                body=json.dumps(request_body)
-            )
+            request_body = self._build_request_body(prompt)
 
-            # Parse response
-            response_body = json.loads(response['body'].read())
+            if not await self._acquire_slot():
+                logger.warning(f"Bedrock request rejected: no free slot within {self.queue_timeout}s")
+                return InferenceResponse(
+                    error=f"Bedrock is busy: no free inference slot within {self.queue_timeout} seconds"
+                )
+
+            # Invoke model off the event loop
+            response_body = await self._run_in_slot(self._invoke_model, request_body)
             logger.debug(f"Response: {response_body}")
-            
+
             content = response_body['content'][0]['text']
 
             return InferenceResponse(text_response=content)
 
         except Exception as e:
             logger.error(f"Error generating text with Bedrock: {str(e)}", exc_info=True)
-            return InferenceResponse(error=str(e))
+            return InferenceResponse(error=str(e), throttled=is_throttling_error(e))
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate text using Bedrock Claude, yielding text deltas as they arrive.
+
+        The stream is read on the client's thread pool and holds an invocation slot
+        until it is fully consumed or the caller stops iterating.
+        """
+        request_body = self._build_request_body(prompt)
+        if not await self._acquire_slot():
+            logger.warning(f"Bedrock stream rejected: no free slot within {self.queue_timeout}s")
+            raise InferenceStreamError(
+                f"Bedrock is busy: no free inference slot within {self.queue_timeout} seconds"
+            )
 
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def on_chunk(text: str) -> None:
+            loop.call_soon_threadsafe(chunks.put_nowait, text)
+
+        stream_task = asyncio.ensure_future(self._run_in_slot(self._stream_model, request_body, on_chunk, stop))
+        stream_task.add_done_callback(lambda _: chunks.put_nowait(done))
+        try:
+            while True:
+                text = await chunks.get()
+                if text is done:
+                    break
+                yield text
+            # Surfaces any error raised while reading the stream
+            await stream_task
+        except Exception as e:
+            logger.error(f"Error streaming text with Bedrock: {str(e)}", exc_info=True)
+            raise InferenceStreamError(str(e), throttled=is_throttling_error(e)) from e
+        finally:
+            stop.set()
@@ -0,0 +1,69 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from . import BaseLLMInference
+from .openai_inference import OpenAIInference
+from .bedrock_inference import BedrockInference
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceClientRegistry:
+    """Creates inference clients once per provider, model and region, and shares them.
+
+    Constructing a client pays for credential resolution, botocore model loading
+    and a fresh HTTP connection pool, so request handlers look clients up here
+    instead. ``close`` shuts every client down and is called on application
+    shutdown.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, Optional[str], Optional[str]], BaseLLMInference] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str = "bedrock", model: Optional[str] = None, region: Optional[str] = None) -> BaseLLMInference:
+        """Get the shared client for a provider, creating it on first use.
+
+        Args:
+            provider: "openai" or "bedrock"; anything else means Bedrock
+            model: Model ID; the provider's default when omitted
+            region: AWS region for Bedrock; ignored for OpenAI
+
+        Returns:
+            BaseLLMInference: The shared client
+        """
+        if provider != "openai":
+            provider = "bedrock"
+        key = (provider, model, region if provider == "bedrock" else None)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create(provider, model, region)
+                self._clients[key] = client
+                logger.info(f"Created shared {provider} inference client for model {model or 'default'}")
+            return client
+
+    def _create(self, provider: str, model: Optional[str], region: Optional[str]) -> BaseLLMInference:
+        if provider == "openai":
+            return OpenAIInference(model=model) if model else OpenAIInference()
+        if model:
+            return BedrockInference(model=model, region=region)
+        return BedrockInference(region=region)
+
+    async def close(self) -> None:
+        """Close every shared client. Clients requested afterwards are created afresh."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close inference client {client.get_model_info().get('provider')}: {str(e)}")
+
+
+# Process-wide registry used by the request handlers
+inference_client_registry = InferenceClientRegistry()
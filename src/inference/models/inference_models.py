@@ -14,3 +14,5 @@ class InferenceResponse:
     text_response: Optional[str] = None
     tool_calls: List[ToolCall] = None
     error: Optional[str] = None
+    # Rejected for exceeding rate limits, by the provider or by admission control
+    throttled: bool = False
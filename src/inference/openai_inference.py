@@ -1,10 +1,12 @@
 import os
 import logging
-from typing import Optional, List, Dict, Any
-from openai import AsyncOpenAI
+from typing import Optional, List, Dict, Any, AsyncIterator
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, RateLimitError
 from dotenv import load_dotenv
-from . import BaseLLMInference
+from . import BaseLLMInference, InferenceStreamError
 from .models.inference_models import InferenceResponse, ToolCall
+from src.config.settings import OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE_CONNECTIONS
 
 # Load environment variables
 load_dotenv()
@@ -12,20 +14,43 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 class OpenAIInference(BaseLLMInference):
-    def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-4-turbo-preview"
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo-preview",
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None
+    ):
+        """Initialize OpenAI client.
+
+        The client owns an HTTP connection pool; it is meant to be long-lived and
+        shared via the ``InferenceClientRegistry``.
+        """
+        limits = httpx.Limits(
+            max_connections=max_connections or OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or OPENAI_MAX_KEEPALIVE_CONNECTIONS
+        )
+        self.client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(limits=limits)
+        )
+        self.model = model
+
+    async def close(self) -> None:
+        """Close the HTTP connection pool."""
+        await self.client.close()
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are an expert code generator. Generate clean, well-documented code following best practices."},
+            {"role": "user", "content": prompt}
+        ]
 
     async def generate(self, prompt: str) -> InferenceResponse:
         """Generate text using OpenAI."""
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert code generator. Generate clean, well-documented code following best practices."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(prompt),
                 temperature=0.7,
                 max_tokens=4096,
                 stop=["</generated_code>"]
@@ -36,7 +61,28 @@ class OpenAIInference(BaseLLMInference):
 
         except Exception as e:
             logger.error(f"Error generating text with OpenAI: {str(e)}", exc_info=True)
-            return InferenceResponse(error=str(e))
+            return InferenceResponse(error=str(e), throttled=isinstance(e, RateLimitError))
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate text using OpenAI, yielding content deltas as they arrive."""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt),
+                temperature=0.7,
+                max_tokens=4096,
+                stop=["</generated_code>"],
+                stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    yield text
+        except Exception as e:
+            logger.error(f"Error streaming text with OpenAI: {str(e)}", exc_info=True)
+            raise InferenceStreamError(str(e), throttled=isinstance(e, RateLimitError)) from e
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model."""
@@ -44,5 +90,6 @@ class OpenAIInference(BaseLLMInference):
             "provider": "openai",
             "model": self.model,
             "max_tokens": 4096,
-            "temperature": 0.7
+            "temperature": 0.7,
+            "stop_sequences": ["</generated_code>"]
         } 
\ No newline at end of file
@@ -0,0 +1,315 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, AsyncIterator, Callable, Tuple
+from . import BaseLLMInference, InferenceStreamError
+from .models.inference_models import InferenceResponse
+from src.config.settings import (
+    BEDROCK_REQUESTS_PER_MINUTE,
+    BEDROCK_TOKENS_PER_MINUTE,
+    OPENAI_REQUESTS_PER_MINUTE,
+    OPENAI_TOKENS_PER_MINUTE,
+    RATE_LIMIT_MAX_QUEUE_DEPTH,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+    RATE_LIMIT_MIN_RATE_FRACTION
+)
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, used to estimate prompt and completion sizes
+CHARS_PER_TOKEN = 4
+# Number of recent admission waits kept for percentiles
+WAIT_SAMPLE_SIZE = 1000
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a request cannot be admitted within the queue depth and wait limits."""
+    pass
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate, holding at most one minute of quota."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.clock = clock
+        self._updated_at = clock()
+
+    def _refill(self, rate_fraction: float) -> None:
+        now = self.clock()
+        rate_per_second = self.per_minute * rate_fraction / 60
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * rate_per_second)
+        self._updated_at = now
+
+    def wait_time(self, amount: float, rate_fraction: float) -> float:
+        """Seconds until ``amount`` tokens are available at the given fraction of the rate."""
+        self._refill(rate_fraction)
+        # A single request larger than the bucket would otherwise never be admitted
+        missing = min(amount, self.capacity) - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / (self.per_minute * rate_fraction / 60)
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self) -> None:
+        self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass
+class RateLimiterMetrics:
+    """Counters and wait times for one rate limiter."""
+    admitted: int = 0
+    rejected: int = 0
+    throttled: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait_seconds: float = 0.0
+    recent_waits: deque = field(default_factory=lambda: deque(maxlen=WAIT_SAMPLE_SIZE))
+
+    def record_wait(self, seconds: float) -> None:
+        self.total_wait_seconds += seconds
+        self.recent_waits.append(seconds)
+
+    def _wait_percentile(self, percentile: float) -> float:
+        if not self.recent_waits:
+            return 0.0
+        waits = sorted(self.recent_waits)
+        return waits[min(len(waits) - 1, int(len(waits) * percentile))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_wait_seconds": self.total_wait_seconds / self.admitted if self.admitted else 0.0,
+            "p50_wait_seconds": self._wait_percentile(0.5),
+            "p95_wait_seconds": self._wait_percentile(0.95)
+        }
+
+
+class AdaptiveRateLimiter:
+    """Admission control for one provider and model.
+
+    A request is admitted once both the requests-per-minute and tokens-per-minute
+    buckets can cover it. Waiting requests are served in arrival order; a request
+    is rejected straight away when ``max_queue_depth`` requests are already waiting,
+    or as soon as it is clear it would wait longer than ``max_wait_seconds``.
+
+    The refill rate adapts AIMD style: every throttling response from the provider
+    halves it (down to ``min_rate_fraction`` of the configured quota) and empties
+    the buckets, and every successful response adds back ``increase_step``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_queue_depth: int = RATE_LIMIT_MAX_QUEUE_DEPTH,
+        max_wait_seconds: float = RATE_LIMIT_MAX_WAIT_SECONDS,
+        min_rate_fraction: float = RATE_LIMIT_MIN_RATE_FRACTION,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute, clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock)
+        self.max_queue_depth = max_queue_depth
+        self.max_wait_seconds = max_wait_seconds
+        self.min_rate_fraction = min_rate_fraction
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.clock = clock
+        self.rate_fraction = 1.0
+        self.metrics = RateLimiterMetrics()
+        self._queue_lock = asyncio.Lock()
+
+    def _reject(self, reason: str) -> RateLimitExceededError:
+        self.metrics.rejected += 1
+        logger.warning(f"Rate limiter {self.name} rejected a request: {reason}")
+        return RateLimitExceededError(f"Rate limit exceeded for {self.name}: {reason}")
+
+    async def acquire(self, tokens: float) -> float:
+        """Wait until the request fits the quota, then reserve it.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+
+        Returns:
+            float: Seconds the request waited
+
+        Raises:
+            RateLimitExceededError: If the queue is full or the wait would exceed the limit
+        """
+        if self.metrics.queue_depth >= self.max_queue_depth:
+            raise self._reject(f"{self.metrics.queue_depth} requests already waiting")
+
+        started = self.clock()
+        deadline = started + self.max_wait_seconds
+        self.metrics.queue_depth += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+        try:
+            if self._queue_lock.locked():
+                try:
+                    # asyncio.Lock wakes waiters in arrival order
+                    await asyncio.wait_for(self._queue_lock.acquire(), timeout=self.max_wait_seconds)
+                except asyncio.TimeoutError:
+                    raise self._reject(f"no quota within {self.max_wait_seconds} seconds")
+            else:
+                await self._queue_lock.acquire()
+            try:
+                while True:
+                    wait = max(
+                        self.requests.wait_time(1, self.rate_fraction),
+                        self.tokens.wait_time(tokens, self.rate_fraction)
+                    )
+                    if wait <= 0:
+                        break
+                    if self.clock() + wait > deadline:
+                        raise self._reject(f"no quota within {self.max_wait_seconds} seconds")
+                    await asyncio.sleep(wait)
+                self.requests.take(1)
+                self.tokens.take(tokens)
+            finally:
+                self._queue_lock.release()
+        finally:
+            self.metrics.queue_depth -= 1
+
+        waited = self.clock() - started
+        self.metrics.admitted += 1
+        self.metrics.record_wait(waited)
+        return waited
+
+    def settle(self, reserved_tokens: float, used_tokens: float) -> None:
+        """Return the unused part of a reservation once the real size is known."""
+        if used_tokens < reserved_tokens:
+            self.tokens.give_back(reserved_tokens - used_tokens)
+
+    def on_success(self) -> None:
+        self.rate_fraction = min(1.0, self.rate_fraction + self.increase_step)
+
+    def on_throttle(self) -> None:
+        self.metrics.throttled += 1
+        self.rate_fraction = max(self.min_rate_fraction, self.rate_fraction * self.decrease_factor)
+        self.requests.drain()
+        self.tokens.drain()
+        logger.warning(f"Provider throttled {self.name}, reducing rate to {self.rate_fraction:.0%} of quota")
+
+
+class RateLimitedInference(BaseLLMInference):
+    """Admits requests to another inference client through an ``AdaptiveRateLimiter``.
+
+    Each request reserves its prompt plus the maximum completion size; the unused
+    part is returned once the request ends, however it ends. Rejected requests come back as
+    throttled error responses.
+    """
+
+    def __init__(self, inference_client: BaseLLMInference, limiter: AdaptiveRateLimiter):
+        self.inference_client = inference_client
+        self.limiter = limiter
+
+    def _estimate_tokens(self, text: str) -> int:
+        return len(text) // CHARS_PER_TOKEN + 1
+
+    def _reserve_tokens(self, prompt: str) -> int:
+        max_tokens = self.inference_client.get_model_info().get("max_tokens", 0)
+        return self._estimate_tokens(prompt) + max_tokens
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        reserved = self._reserve_tokens(prompt)
+        try:
+            await self.limiter.acquire(reserved)
+        except RateLimitExceededError as e:
+            return InferenceResponse(error=str(e), throttled=True)
+
+        used_tokens = self._estimate_tokens(prompt)
+        throttled = False
+        try:
+            response = await self.inference_client.generate(prompt)
+            if response.throttled:
+                throttled = True
+                self.limiter.on_throttle()
+            else:
+                if not response.error:
+                    self.limiter.on_success()
+                used_tokens += self._estimate_tokens(response.text_response or "")
+            return response
+        finally:
+            # Throttling drains the buckets, so there is nothing to give back
+            if not throttled:
+                self.limiter.settle(reserved, used_tokens)
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        reserved = self._reserve_tokens(prompt)
+        try:
+            await self.limiter.acquire(reserved)
+        except RateLimitExceededError as e:
+            raise InferenceStreamError(str(e), throttled=True) from e
+
+        generated_chars = 0
+        throttled = False
+        try:
+            async for chunk in self.inference_client.generate_stream(prompt):
+                generated_chars += len(chunk)
+                yield chunk
+            self.limiter.on_success()
+        except InferenceStreamError as e:
+            if e.throttled:
+                throttled = True
+                self.limiter.on_throttle()
+            raise
+        finally:
+            # Also reached when the caller abandons the stream
+            if not throttled:
+                self.limiter.settle(reserved, self._estimate_tokens(prompt) + generated_chars // CHARS_PER_TOKEN)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return self.inference_client.get_model_info()
+
+
+class RateLimiterRegistry:
+    """One ``AdaptiveRateLimiter`` per provider and model, with quotas from settings."""
+
+    QUOTAS = {
+        "bedrock": (BEDROCK_REQUESTS_PER_MINUTE, BEDROCK_TOKENS_PER_MINUTE),
+        "openai": (OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE),
+    }
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, Optional[str]], AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: Optional[str] = None) -> AdaptiveRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get((provider, model))
+            if limiter is None:
+                requests_per_minute, tokens_per_minute = self.QUOTAS.get(provider, self.QUOTAS["bedrock"])
+                limiter = AdaptiveRateLimiter(f"{provider}/{model or 'default'}", requests_per_minute, tokens_per_minute)
+                self._limiters[(provider, model)] = limiter
+            return limiter
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics of every limiter, keyed by provider/model."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {
+            limiter.name: {**limiter.metrics.to_dict(), "rate_fraction": limiter.rate_fraction}
+            for limiter in limiters
+        }
+
+
+# Process-wide limiters shared by every request
+rate_limiter_registry = RateLimiterRegistry()
@@ -0,0 +1,290 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, AsyncIterator
+from . import BaseLLMInference
+from .models.inference_models import InferenceResponse
+from src.storage.s3.s3_dao import S3DAO, S3DAONotFoundError
+from src.config.settings import (
+    LLM_RESPONSE_CACHE_BACKEND,
+    LLM_RESPONSE_CACHE_TTL_SECONDS,
+    LLM_RESPONSE_CACHE_MAX_STREAMED_CHARS,
+    LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    LLM_RESPONSE_CACHE_DIR,
+    LLM_RESPONSE_CACHE_S3_PREFIX
+)
+
+logger = logging.getLogger(__name__)
+
+# Model info keys that change what the model generates for the same prompt
+SAMPLING_PARAMS = ("temperature", "top_p", "top_k", "max_tokens", "stop_sequences")
+
+
+class ResponseCacheBackend(ABC):
+    """Storage for cached LLM responses, keyed by request hash."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, text: str) -> None:
+        """Store a response text."""
+        pass
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """In-process LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_entries: int = LLM_RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds: float = LLM_RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    async def set(self, key: str, text: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class DiskResponseCache(ResponseCacheBackend):
+    """Cache stored as one JSON file per response in a local directory."""
+
+    def __init__(self, directory: str = LLM_RESPONSE_CACHE_DIR, ttl_seconds: float = LLM_RESPONSE_CACHE_TTL_SECONDS):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        if time.time() - entry["created_at"] >= self.ttl_seconds:
+            return None
+        return entry["text"]
+
+    def _write(self, key: str, text: str) -> None:
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"created_at": time.time(), "text": text}, f)
+        os.replace(tmp_path, self._path(key))
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, text: str) -> None:
+        await asyncio.to_thread(self._write, key, text)
+
+
+class S3ResponseCache(ResponseCacheBackend):
+    """Cache stored as one S3 object per response under a prefix of the code bucket."""
+
+    def __init__(self, s3_dao: S3DAO, prefix: str = LLM_RESPONSE_CACHE_S3_PREFIX, ttl_seconds: float = LLM_RESPONSE_CACHE_TTL_SECONDS):
+        self.s3_dao = s3_dao
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def _uri(self, key: str) -> str:
+        return f"s3://{self.s3_dao.bucket_name}/{self.prefix}{key}.json"
+
+    def _read(self, key: str) -> Optional[str]:
+        try:
+            entry = json.loads(self.s3_dao.get_object(self._uri(key)))
+        except S3DAONotFoundError:
+            return None
+        if time.time() - entry["created_at"] >= self.ttl_seconds:
+            return None
+        return entry["text"]
+
+    def _write(self, key: str, text: str) -> None:
+        self.s3_dao.put_object(self._uri(key), json.dumps({"created_at": time.time(), "text": text}))
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, text: str) -> None:
+        await asyncio.to_thread(self._write, key, text)
+
+
+@dataclass
+class ResponseCacheMetrics:
+    """Counters for the response cache."""
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    stores: int = 0
+    # Streamed responses too long to buffer, so not stored
+    oversized: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "stores": self.stores,
+            "oversized": self.oversized,
+            "errors": self.errors,
+            "hit_rate": self.hit_rate
+        }
+
+
+class CachingInference(BaseLLMInference):
+    """Serves repeated prompts from a response cache in front of another inference client.
+
+    Responses are keyed by a hash of the provider, model, sampling parameters and the
+    fully formatted prompt; behind a router, of those of every routed provider. Only
+    successful responses are cached. With ``bypass`` set, the cache is not read but the
+    fresh response still replaces the cached one.
+    """
+
+    def __init__(
+        self,
+        inference_client: BaseLLMInference,
+        backend: ResponseCacheBackend,
+        metrics: Optional[ResponseCacheMetrics] = None,
+        bypass: bool = False,
+        max_streamed_chars: int = LLM_RESPONSE_CACHE_MAX_STREAMED_CHARS
+    ):
+        self.inference_client = inference_client
+        self.backend = backend
+        self.metrics = metrics or ResponseCacheMetrics()
+        self.bypass = bypass
+        self.max_streamed_chars = max_streamed_chars
+
+    @staticmethod
+    def _model_key(model_info: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a client's model info that change what it generates.
+
+        A router answers from any of its providers, so its key covers the model and
+        sampling parameters of every provider it routes between.
+        """
+        model_key = {
+            "provider": model_info.get("provider"),
+            "model": model_info.get("model"),
+            "sampling": {param: model_info.get(param) for param in SAMPLING_PARAMS}
+        }
+        routed = model_info.get("providers")
+        if routed:
+            model_key["providers"] = {
+                name: CachingInference._model_key(info) for name, info in routed.items()
+            }
+        return model_key
+
+    def cache_key(self, prompt: str) -> str:
+        key_material = {
+            **self._model_key(self.inference_client.get_model_info()),
+            "prompt": prompt
+        }
+        encoded = json.dumps(key_material, sort_keys=True)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    async def _lookup(self, key: str) -> Optional[str]:
+        """Return the cached text for ``key``, recording the hit, miss or bypass."""
+        if self.bypass:
+            self.metrics.bypasses += 1
+            return None
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.warning(f"Response cache lookup failed, calling the model: {str(e)}")
+            cached = None
+        if cached is not None:
+            self.metrics.hits += 1
+            logger.debug(f"Response cache hit for {key}")
+            return cached
+        self.metrics.misses += 1
+        return None
+
+    async def _store(self, key: str, text: str) -> None:
+        try:
+            await self.backend.set(key, text)
+            self.metrics.stores += 1
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.warning(f"Failed to store response in cache: {str(e)}")
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        key = self.cache_key(prompt)
+        cached = await self._lookup(key)
+        if cached is not None:
+            return InferenceResponse(text_response=cached)
+
+        response = await self.inference_client.generate(prompt)
+        if response.text_response and not response.error:
+            await self._store(key, response.text_response)
+        return response
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream from the wrapped client, or replay a cached response as one chunk.
+
+        The streamed text is only stored once the stream completes without error.
+        Chunks are buffered for that only up to ``max_streamed_chars``; longer
+        responses are passed through without being cached.
+        """
+        key = self.cache_key(prompt)
+        cached = await self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks: Optional[List[str]] = []
+        buffered_chars = 0
+        async for chunk in self.inference_client.generate_stream(prompt):
+            if chunks is not None:
+                buffered_chars += len(chunk)
+                if buffered_chars > self.max_streamed_chars:
+                    chunks = None
+                    self.metrics.oversized += 1
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        if chunks:
+            await self._store(key, "".join(chunks))
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return self.inference_client.get_model_info()
+
+
+def create_response_cache_backend(backend_name: str = LLM_RESPONSE_CACHE_BACKEND) -> Optional[ResponseCacheBackend]:
+    """Create the configured cache backend, or None when caching is disabled."""
+    if backend_name == "memory":
+        return InMemoryResponseCache()
+    if backend_name == "disk":
+        return DiskResponseCache()
+    if backend_name == "s3":
+        return S3ResponseCache(S3DAO())
+    if backend_name != "none":
+        logger.warning(f"Unknown LLM response cache backend '{backend_name}', caching disabled")
+    return None
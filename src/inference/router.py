@@ -0,0 +1,224 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable
+from . import BaseLLMInference, InferenceStreamError
+from .models.inference_models import InferenceResponse
+from src.config.settings import (
+    INFERENCE_ROUTER_WINDOW,
+    INFERENCE_ROUTER_MIN_SAMPLES,
+    INFERENCE_ROUTER_MAX_ERROR_RATE,
+    INFERENCE_HEDGING_ENABLED,
+    INFERENCE_HEDGE_DEFAULT_DELAY_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderStats:
+    """Rolling latency and error rate over a provider's most recent calls."""
+
+    def __init__(self, window: int = INFERENCE_ROUTER_WINDOW):
+        # (latency_seconds, succeeded) per call
+        self._calls = deque(maxlen=window)
+
+    def record(self, latency: float, succeeded: bool) -> None:
+        self._calls.append((latency, succeeded))
+
+    @property
+    def samples(self) -> int:
+        return len(self._calls)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, succeeded in self._calls if not succeeded) / len(self._calls)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency of successful calls at ``percentile`` (0-1), or None without any."""
+        latencies = sorted(latency for latency, succeeded in self._calls if succeeded)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile))]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.latency_percentile(0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.latency_percentile(0.95)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "error_rate": self.error_rate,
+            "p50_seconds": self.p50,
+            "p95_seconds": self.p95
+        }
+
+
+class RoutingInference(BaseLLMInference):
+    """Routes each request to the healthiest of several providers.
+
+    Providers are ranked by health, then by rolling p50 latency. A provider is
+    unhealthy when its recent error rate exceeds ``max_error_rate``; providers
+    without ``min_samples`` calls keep their configured order behind the measured
+    ones. A failed request fails over to the next provider in the ranking.
+
+    With ``hedge`` set, a second request goes to the next provider once the first
+    has been running longer than its provider's p95 latency; whichever succeeds
+    first wins and the other is cancelled. Streams fail over only until their
+    first chunk and are never hedged.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, BaseLLMInference],
+        hedge: bool = INFERENCE_HEDGING_ENABLED,
+        window: int = INFERENCE_ROUTER_WINDOW,
+        min_samples: int = INFERENCE_ROUTER_MIN_SAMPLES,
+        max_error_rate: float = INFERENCE_ROUTER_MAX_ERROR_RATE,
+        hedge_default_delay: float = INFERENCE_HEDGE_DEFAULT_DELAY_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if not providers:
+            raise ValueError("RoutingInference needs at least one provider")
+        self.providers = providers
+        self.hedge = hedge
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.hedge_default_delay = hedge_default_delay
+        self.clock = clock
+        self.stats = {name: ProviderStats(window) for name in providers}
+
+    def rank_providers(self) -> List[str]:
+        """Provider names, healthiest and fastest first."""
+        order = list(self.providers)
+
+        def sort_key(name: str):
+            stats = self.stats[name]
+            warm = stats.samples >= self.min_samples
+            unhealthy = warm and stats.error_rate > self.max_error_rate
+            p50 = stats.p50 if warm else None
+            return (unhealthy, p50 if p50 is not None else float("inf"), order.index(name))
+
+        return sorted(order, key=sort_key)
+
+    def _hedge_delay(self, name: str) -> float:
+        stats = self.stats[name]
+        if stats.samples >= self.min_samples and stats.p95 is not None:
+            return stats.p95
+        return self.hedge_default_delay
+
+    async def _call(self, name: str, prompt: str) -> InferenceResponse:
+        started = self.clock()
+        response = await self.providers[name].generate(prompt)
+        self.stats[name].record(self.clock() - started, succeeded=not response.error)
+        if response.error:
+            logger.warning(f"Provider {name} failed: {response.error}")
+        return response
+
+    def _all_failed(self, errors: Dict[str, InferenceResponse]) -> InferenceResponse:
+        return InferenceResponse(
+            error="All inference providers failed: " + "; ".join(
+                f"{name}: {response.error}" for name, response in errors.items()
+            ),
+            throttled=all(response.throttled for response in errors.values())
+        )
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        ranked = self.rank_providers()
+        errors: Dict[str, InferenceResponse] = {}
+
+        if self.hedge and len(ranked) > 1:
+            response, errors = await self._generate_hedged(prompt, ranked[0], ranked[1])
+            if response is not None:
+                return response
+            ranked = ranked[2:]
+
+        for name in ranked:
+            response = await self._call(name, prompt)
+            if not response.error:
+                return response
+            errors[name] = response
+        return self._all_failed(errors)
+
+    async def _generate_hedged(self, prompt: str, primary: str, secondary: str):
+        """Race the primary provider against a hedge started after the primary's p95.
+
+        Returns the winning response, or None and the errors when both failed.
+        """
+        errors: Dict[str, InferenceResponse] = {}
+        started = {primary: self.clock()}
+        tasks = {asyncio.create_task(self._call(primary, prompt)): primary}
+        won = False
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary))
+            if not done:
+                logger.info(f"Provider {primary} exceeded its p95 latency, hedging with {secondary}")
+            else:
+                response = done.pop().result()
+                if not response.error:
+                    won = True
+                    return response, errors
+                errors[primary] = response
+                tasks = {}
+            started[secondary] = self.clock()
+            tasks[asyncio.create_task(self._call(secondary, prompt))] = secondary
+
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks.pop(task)
+                    response = task.result()
+                    if not response.error:
+                        won = True
+                        return response, errors
+                    errors[name] = response
+            return None, errors
+        finally:
+            for task, name in tasks.items():
+                task.cancel()
+                # The loser took at least this long; without the sample a slow primary
+                # would keep its fast percentiles, stay ranked first and be hedged every time
+                if won:
+                    self.stats[name].record(self.clock() - started[name], succeeded=True)
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        errors: Dict[str, str] = {}
+        throttled = True
+        for name in self.rank_providers():
+            started = self.clock()
+            yielded = False
+            try:
+                async for chunk in self.providers[name].generate_stream(prompt):
+                    yielded = True
+                    yield chunk
+            except InferenceStreamError as e:
+                self.stats[name].record(self.clock() - started, succeeded=False)
+                if yielded:
+                    raise
+                logger.warning(f"Provider {name} failed to stream: {str(e)}")
+                errors[name] = str(e)
+                throttled = throttled and e.throttled
+                continue
+            self.stats[name].record(self.clock() - started, succeeded=True)
+            return
+        raise InferenceStreamError(
+            "All inference providers failed: " + "; ".join(f"{name}: {error}" for name, error in errors.items()),
+            throttled=throttled
+        )
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {
+            "provider": "router",
+            "model": ",".join(self.providers),
+            "providers": {name: client.get_model_info() for name, client in self.providers.items()}
+        }
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rolling latency and error rate per provider."""
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
+from src.config.settings import STORAGE_IO_MAX_WORKERS
 
 class BillingMode(str, Enum):
     PROVISIONED = "PROVISIONED"
@@ -10,6 +11,7 @@ class BillingMode(str, Enum):
 class DynamoDBConfig:
     region: str = "us-east-1"
     endpoint_url: str = None  # For local development
+    max_pool_connections: int = STORAGE_IO_MAX_WORKERS
     billing_mode: BillingMode = BillingMode.PAY_PER_REQUEST
     # These are only used if billing_mode is PROVISIONED
     read_capacity_units: int = 5
@@ -19,6 +21,7 @@ class DynamoDBConfig:
 class S3Config:
     region: str = "us-east-1"
     endpoint_url: str = None  # For local development
+    max_pool_connections: int = STORAGE_IO_MAX_WORKERS
     bucket_name: str = "flow-canvas-data"
     # Prefixes for different types of data
     canvas_prefix: str = "canvases/"
@@ -1,7 +1,8 @@
 import boto3
 from typing import Optional
 from src.infra.db.config import db_settings
-from src.infra.dynamodb.tables import CANVAS_TABLE, NODES_TABLE, EDGES_TABLE, CHAT_THREADS_TABLE
+from src.infra.dynamodb.manager import add_missing_indexes
+from src.infra.dynamodb.tables import CANVAS_TABLE, NODES_TABLE, EDGES_TABLE, CHAT_THREADS_TABLE, get_global_secondary_indexes
 
 class DatabaseManager:
     _instance: Optional['DatabaseManager'] = None
@@ -58,6 +59,8 @@ class DatabaseManager:
             # Check if table exists
             self._dynamodb_client.describe_table(TableName=table_definition.table_name)
             print(f"Table {table_definition.table_name} already exists")
+            for index_name in add_missing_indexes(self._dynamodb_client, table_definition):
+                print(f"Added index {index_name} to table {table_definition.table_name}")
         except self._dynamodb_client.exceptions.ResourceNotFoundException:
             # Create table if it doesn't exist
             create_params = {
@@ -70,6 +73,9 @@ class DatabaseManager:
                 'BillingMode': table_definition.billing_mode
             }
 
+            if table_definition.gsis:
+                create_params['GlobalSecondaryIndexes'] = get_global_secondary_indexes(table_definition)
+
             if table_definition.billing_mode == 'PROVISIONED':
                 create_params['ProvisionedThroughput'] = {
                     'ReadCapacityUnits': 5,
@@ -1,4 +1,5 @@
 import boto3
+from botocore.config import Config
 from typing import Any
 from src.infra.config import DynamoDBConfig
 
@@ -14,7 +15,8 @@ class DynamoDBClientFactory:
             self._resource = boto3.resource(
                 'dynamodb',
                 region_name=self.config.region,
-                endpoint_url=self.config.endpoint_url
+                endpoint_url=self.config.endpoint_url,
+                config=Config(max_pool_connections=self.config.max_pool_connections)
             )
         return self._resource
 
@@ -24,6 +26,7 @@ class DynamoDBClientFactory:
             self._client = boto3.client(
                 'dynamodb',
                 region_name=self.config.region,
-                endpoint_url=self.config.endpoint_url
+                endpoint_url=self.config.endpoint_url,
+                config=Config(max_pool_connections=self.config.max_pool_connections)
             )
         return self._client 
\ No newline at end of file
@@ -1,13 +1,48 @@
-from typing import List
+import time
+from typing import Any, List
 from botocore.exceptions import ClientError
 from src.infra.dynamodb.client import DynamoDBClientFactory
 from src.infra.dynamodb.tables import (
     CANVAS_TABLE,
     NODES_TABLE,
     EDGES_TABLE,
-    CHAT_THREADS_TABLE
+    CHAT_THREADS_TABLE,
+    get_global_secondary_indexes,
+    get_global_secondary_index_update
 )
 
+# Seconds between checks while a new index is being built
+INDEX_POLL_SECONDS = 10
+
+def add_missing_indexes(client: Any, table_definition, poll_seconds: float = INDEX_POLL_SECONDS) -> List[str]:
+    """Add the definition's GSIs that an existing table lacks.
+
+    create_table only sets up indexes for new tables. DynamoDB builds one new
+    index per update_table call and indexes the items already in the table, so
+    each index is created and waited on until ACTIVE before the next.
+
+    Returns:
+        List[str]: Names of the indexes that were added
+    """
+    description = client.describe_table(TableName=table_definition.table_name)['Table']
+    existing = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+    added = []
+    for gsi in table_definition.gsis or []:
+        if gsi.index_name in existing:
+            continue
+        client.update_table(**get_global_secondary_index_update(table_definition, gsi))
+        while True:
+            description = client.describe_table(TableName=table_definition.table_name)['Table']
+            statuses = {
+                index['IndexName']: index['IndexStatus']
+                for index in description.get('GlobalSecondaryIndexes', [])
+            }
+            if statuses.get(gsi.index_name) == 'ACTIVE':
+                break
+            time.sleep(poll_seconds)
+        added.append(gsi.index_name)
+    return added
+
 class DynamoDBTableManager:
     def __init__(self, client_factory: DynamoDBClientFactory):
         self.client = client_factory.client
@@ -26,6 +61,9 @@ class DynamoDBTableManager:
                 'BillingMode': table_definition.billing_mode
             }
 
+            if table_definition.gsis:
+                create_table_params['GlobalSecondaryIndexes'] = get_global_secondary_indexes(table_definition)
+
             # Only add ProvisionedThroughput if using PROVISIONED billing mode
             if table_definition.billing_mode == 'PROVISIONED':
                 create_table_params['ProvisionedThroughput'] = {
@@ -37,7 +75,8 @@ class DynamoDBTableManager:
             return True
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceInUseException':
-                # Table already exists
+                # Table already exists; it may predate some of its indexes
+                add_missing_indexes(self.client, table_definition)
                 return True
             raise
 
@@ -18,22 +18,63 @@ class TableDefinition:
     gsis: List[GSI] = None
     billing_mode: BillingMode = BillingMode.PAY_PER_REQUEST
 
+def get_global_secondary_index(gsi: GSI) -> Dict[str, Any]:
+    """Index description shared by create_table and update_table."""
+    return {
+        'IndexName': gsi.index_name,
+        'KeySchema': [
+            {'AttributeName': gsi.partition_key, 'KeyType': 'HASH'},
+            {'AttributeName': gsi.sort_key, 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': gsi.projection_type}
+    }
+
+def get_global_secondary_indexes(table_definition: TableDefinition) -> List[Dict[str, Any]]:
+    """GlobalSecondaryIndexes parameter for creating a table."""
+    return [get_global_secondary_index(gsi) for gsi in table_definition.gsis or []]
+
+def get_global_secondary_index_update(table_definition: TableDefinition, gsi: GSI) -> Dict[str, Any]:
+    """update_table parameters that add one GSI to an existing table."""
+    key_names = {gsi.partition_key, gsi.sort_key}
+    return {
+        'TableName': table_definition.table_name,
+        'AttributeDefinitions': [
+            attribute for attribute in table_definition.attributes if attribute['AttributeName'] in key_names
+        ],
+        'GlobalSecondaryIndexUpdates': [{'Create': get_global_secondary_index(gsi)}]
+    }
+
 # Table Definitions
 
 """
 CANVAS_TABLE Access Patterns:
 1. Get all canvas IDs for a customer (using partition key)
 2. Get all versions for a specific canvas (using sort key prefix)
+3. Page through a customer's canvases by last update (drafts GSI; only drafts carry draft_updated_at)
+4. Page through a canvas's versions by last update (versions GSI)
 """
+CANVAS_DRAFTS_BY_UPDATED_AT = GSI(
+    index_name="canvas_drafts_by_updated_at",
+    partition_key="customer_id",
+    sort_key="draft_updated_at"
+)
+CANVAS_VERSIONS_BY_UPDATED_AT = GSI(
+    index_name="canvas_versions_by_updated_at",
+    partition_key="customer_canvas_id",  # Format: customer_id#canvas_id
+    sort_key="updated_at"
+)
 CANVAS_TABLE = TableDefinition(
     table_name="flow_canvas",
     partition_key="customer_id",
     sort_key="canvas_id_and_version",  # Format: canvas_id#version
     attributes=[
         {"AttributeName": "customer_id", "AttributeType": "S"},
-        {"AttributeName": "canvas_id_and_version", "AttributeType": "S"}
+        {"AttributeName": "canvas_id_and_version", "AttributeType": "S"},
+        {"AttributeName": "draft_updated_at", "AttributeType": "S"},
+        {"AttributeName": "customer_canvas_id", "AttributeType": "S"},
+        {"AttributeName": "updated_at", "AttributeType": "S"}
     ],
-    gsis=[]  # No GSIs needed as main index supports all required patterns
+    gsis=[CANVAS_DRAFTS_BY_UPDATED_AT, CANVAS_VERSIONS_BY_UPDATED_AT]
 )
 
 """
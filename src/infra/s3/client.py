@@ -1,4 +1,5 @@
 import boto3
+from botocore.config import Config
 from typing import Any
 from src.infra.config import S3Config
 
@@ -14,7 +15,8 @@ class S3ClientFactory:
             self._resource = boto3.resource(
                 's3',
                 region_name=self.config.region,
-                endpoint_url=self.config.endpoint_url
+                endpoint_url=self.config.endpoint_url,
+                config=Config(max_pool_connections=self.config.max_pool_connections)
             )
         return self._resource
 
@@ -24,6 +26,7 @@ class S3ClientFactory:
             self._client = boto3.client(
                 's3',
                 region_name=self.config.region,
-                endpoint_url=self.config.endpoint_url
+                endpoint_url=self.config.endpoint_url,
+                config=Config(max_pool_connections=self.config.max_pool_connections)
             )
         return self._client 
\ No newline at end of file
@@ -0,0 +1,132 @@
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from src.storage.models.models import CanvasDefinitionDO
+from src.config.settings import CANVAS_DEFINITION_CACHE_MAX_BYTES
+
+
+@dataclass
+class CanvasDefinitionCacheEntry:
+    definition: CanvasDefinitionDO
+    etag: Optional[str]
+    size_bytes: int
+
+
+@dataclass
+class CanvasDefinitionCacheMetrics:
+    """Counters for the canvas definition cache."""
+    hits: int = 0
+    misses: int = 0
+    # Draft lookups answered by a conditional GET that returned 304 Not Modified
+    revalidated: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hit_rate
+        }
+
+
+class CanvasDefinitionCache:
+    """Parsed canvas definitions keyed by S3 URI, evicted least recently used by size.
+
+    Entries remember the ETag of the object they were parsed from, so callers can
+    revalidate mutable (draft) definitions with a conditional GET. Published
+    versions never change and can be served without revalidation.
+
+    Callers run on the storage I/O threads, so every operation takes a lock.
+    ``get`` returns a copy, so callers may modify what they get back.
+    """
+
+    def __init__(self, max_bytes: int = CANVAS_DEFINITION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.metrics = CanvasDefinitionCacheMetrics()
+        self._entries: "OrderedDict[str, CanvasDefinitionCacheEntry]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def get_entry(self, s3_uri: str) -> Optional[CanvasDefinitionCacheEntry]:
+        """Return the cached entry for ``s3_uri`` without recording a lookup."""
+        with self._lock:
+            entry = self._entries.get(s3_uri)
+            if entry is not None:
+                self._entries.move_to_end(s3_uri)
+            return entry
+
+    def record_hit(self, revalidated: bool = False) -> None:
+        with self._lock:
+            self.metrics.hits += 1
+            if revalidated:
+                self.metrics.revalidated += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.metrics.misses += 1
+
+    def copy_definition(self, entry: CanvasDefinitionCacheEntry) -> CanvasDefinitionDO:
+        return copy.deepcopy(entry.definition)
+
+    def put(self, s3_uri: str, definition: CanvasDefinitionDO, etag: Optional[str], size_bytes: int) -> None:
+        """Cache a definition parsed from an object of ``size_bytes`` bytes."""
+        if not self.enabled or size_bytes > self.max_bytes:
+            return
+        entry = CanvasDefinitionCacheEntry(definition=copy.deepcopy(definition), etag=etag, size_bytes=size_bytes)
+        with self._lock:
+            previous = self._entries.pop(s3_uri, None)
+            if previous is not None:
+                self._size_bytes -= previous.size_bytes
+            self._entries[s3_uri] = entry
+            self._size_bytes += size_bytes
+            self.metrics.stores += 1
+            while self._size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+                self.metrics.evictions += 1
+
+    def invalidate(self, s3_uri: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(s3_uri, None)
+            if entry is not None:
+                self._size_bytes -= entry.size_bytes
+                self.metrics.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.metrics.to_dict(),
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+# Shared by every coordinator so a save through one invalidates reads through the others
+canvas_definition_cache = CanvasDefinitionCache()
@@ -1,6 +1,9 @@
-from typing import Dict, Any
+from typing import Dict, Any, Callable, TypeVar
 from datetime import datetime
 import logging
+from src.storage.io_executor import run_storage_io
+
+T = TypeVar('T')
 
 class StorageCoordinatorError(Exception):
     """Base exception for storage coordinator errors."""
@@ -10,6 +13,10 @@ class ImmutableVersionError(StorageCoordinatorError):
     """Raised when attempting to modify a non-draft version."""
     pass
 
+class CodeConflictError(StorageCoordinatorError):
+    """Raised when a code change touches files another change modified concurrently."""
+    pass
+
 class BaseCoordinator:
     """Base class for all coordinators."""
     
@@ -23,6 +30,22 @@ class BaseCoordinator:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
     
+    async def run_io(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking DAO or coordinator call on the storage I/O pool.
+
+        boto3 calls block their thread, so coroutines must await them through this
+        rather than call them directly on the event loop.
+
+        Args:
+            fn: The blocking callable
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            The return value of ``fn``
+        """
+        return await run_storage_io(fn, *args, **kwargs)
+
     def _validate_version_mutable(self, version: str) -> None:
         """Validate that a version is mutable (draft).
         
@@ -1,6 +1,8 @@
-from typing import Optional, List, Tuple
+from typing import Any, AsyncIterator, Optional, List, Tuple, Dict
 from src.storage.dynamodb.canvas_dao import CanvasDAO
-from src.storage.s3.s3_dao import S3DAO
+from src.storage.s3.s3_dao import S3DAO, S3DAONotFoundError
+from src.storage.s3.async_s3_dao import get_async_s3_dao
+from src.storage.canvas_definition_cache import canvas_definition_cache
 from src.storage.models.models import CanvasDO, CanvasDefinitionDO
 from src.api.models.node_models import CanvasNodeType
 from src.api.models.node_configs.ddb_node_config import (
@@ -11,9 +13,11 @@ from src.api.models.node_configs.s3_node_config import S3BucketNodeConfig, S3Buc
 from src.api.models.node_configs.api_service_node_config import ApiServiceNodeConfig, ApiEndpoint
 from src.api.models.node_configs.custom_service_node_config import CustomServiceNodeConfig
 from src.api.models.json_encoder import EnumEncoder
+from src.config.settings import CANVAS_DEFINITION_STREAM_CHUNK_BYTES
 from .base_coordinator import BaseCoordinator
 import json
 import uuid
+import asyncio
 from src.api.models.canvas_models import CanvasNode, CanvasEdge
 
 class CanvasCoordinator(BaseCoordinator):
@@ -23,6 +27,8 @@ class CanvasCoordinator(BaseCoordinator):
         super().__init__()
         self.canvas_dao = CanvasDAO()
         self.s3_dao = S3DAO()
+        self.async_s3_dao = get_async_s3_dao()
+        self.definition_cache = canvas_definition_cache
 
     def get_canvas(self, customer_id: str, canvas_id: str, canvas_version: str) -> Tuple[Optional[CanvasDO], Optional[CanvasDefinitionDO]]:
         try:
@@ -33,38 +39,169 @@ class CanvasCoordinator(BaseCoordinator):
             # Fetch the canvas definition from S3 if URI exists
             canvas_definition = None
             if canvas_do.canvas_definition_s3_uri:
-                canvas_definition = self._get_canvas_definition(canvas_do.canvas_definition_s3_uri)
+                canvas_definition = self._get_canvas_definition(canvas_do.canvas_definition_s3_uri, canvas_version)
             
             return canvas_do, canvas_definition
         except Exception as e:
             self.logger.error(f"Error getting canvas: {str(e)}")
             return None, None
 
-    def _get_canvas_definition(self, s3_uri: str) -> Optional[CanvasDefinitionDO]:
+    async def load_canvas(self, customer_id: str, canvas_id: str, canvas_version: str) -> Tuple[Optional[CanvasDO], Optional[CanvasDefinitionDO]]:
+        """Like ``get_canvas``, but fetches the item and its definition concurrently.
+
+        The definition is read from the URI ``save_canvas`` would have written it to,
+        in parallel with the DynamoDB read. If the item turns out to point elsewhere,
+        the definition is fetched again from the URI it names.
+        """
         try:
-            definition_json = self.s3_dao.get_object(s3_uri)
-            if not definition_json:
-                self.logger.error("Empty JSON data received from S3")
-                return None
-                
-            try:
-                # Parse JSON data
-                data = json.loads(definition_json)
-                
-                # Deserialize nodes and edges
-                nodes = [CanvasNode(**node) for node in data.get('nodes', [])]
-                edges = [CanvasEdge(**edge) for edge in data.get('edges', [])]
-                
-                # Create CanvasDefinitionDO with deserialized objects
-                return CanvasDefinitionDO(nodes=nodes, edges=edges)
-            except Exception as e:
-                self.logger.error(f"Error deserializing canvas definition JSON: {str(e)}")
-                self.logger.error(f"JSON content: {definition_json}")
-                return None
+            expected_uri = self.get_definition_s3_uri(customer_id, canvas_id, canvas_version)
+            canvas_do, canvas_definition = await asyncio.gather(
+                self.run_io(self.canvas_dao.get_canvas, customer_id, canvas_id, canvas_version),
+                self.run_io(self._get_canvas_definition, expected_uri, canvas_version)
+            )
+            if not canvas_do:
+                return None, None
+            if not canvas_do.canvas_definition_s3_uri:
+                return canvas_do, None
+            if canvas_do.canvas_definition_s3_uri != expected_uri:
+                canvas_definition = await self.run_io(
+                    self._get_canvas_definition, canvas_do.canvas_definition_s3_uri, canvas_version
+                )
+            return canvas_do, canvas_definition
+        except Exception as e:
+            self.logger.error(f"Error getting canvas: {str(e)}")
+            return None, None
+
+    async def open_canvas_definition(
+        self,
+        customer_id: str,
+        canvas_id: str,
+        canvas_version: str
+    ) -> Tuple[Optional[CanvasDO], Optional[AsyncIterator[bytes]]]:
+        """Like ``load_canvas``, but returns the stored definition JSON as raw chunks instead of parsing it.
+
+        The definition is streamed from the S3 body on the storage I/O threads and
+        bypasses the definition cache. The stream is None if the canvas has no
+        definition. Callers must exhaust or ``aclose`` it so the connection is released.
+        """
+        expected_uri = self.get_definition_s3_uri(customer_id, canvas_id, canvas_version)
+        canvas_do, body = await asyncio.gather(
+            self.run_io(self.canvas_dao.get_canvas, customer_id, canvas_id, canvas_version),
+            self.run_io(self._open_canvas_definition, expected_uri),
+            return_exceptions=True
+        )
+        if isinstance(canvas_do, BaseException) or not canvas_do \
+                or canvas_do.canvas_definition_s3_uri != expected_uri:
+            if body is not None and not isinstance(body, BaseException):
+                body.close()
+            if isinstance(canvas_do, BaseException):
+                raise canvas_do
+            if not canvas_do or not canvas_do.canvas_definition_s3_uri:
+                return canvas_do, None
+            body = await self.run_io(self._open_canvas_definition, canvas_do.canvas_definition_s3_uri)
+        elif isinstance(body, BaseException):
+            raise body
+        return canvas_do, (self._stream_body(body) if body is not None else None)
+
+    def _open_canvas_definition(self, s3_uri: str) -> Any:
+        try:
+            return self.s3_dao.open_object(s3_uri)
+        except S3DAONotFoundError:
+            self.logger.info(f"No canvas definition found at {s3_uri}")
+            return None
+
+    async def _stream_body(self, body: Any) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk = await self.run_io(body.read, CANVAS_DEFINITION_STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    def get_definition_s3_uri(self, customer_id: str, canvas_id: str, canvas_version: str) -> str:
+        return f"s3://{self.s3_dao.bucket_name}/canvas-definitions/{customer_id}/{canvas_id}/{canvas_version}.json"
+
+    def get_code_s3_uri(self, customer_id: str, canvas_id: str, canvas_version: str) -> str:
+        """Location of code stored as a single JSON document, before per-file storage."""
+        return f"s3://{self.s3_dao.bucket_name}/canvas-code/{customer_id}/{canvas_id}/{canvas_version}.json"
+
+    def get_code_manifest_s3_uri(self, customer_id: str, canvas_id: str, canvas_version: str) -> str:
+        """Copy of the current code manifest, read speculatively alongside the canvas item."""
+        return f"s3://{self.s3_dao.bucket_name}/canvas-code/{customer_id}/{canvas_id}/{canvas_version}/manifest.json"
+
+    def get_code_blob_s3_uri(self, customer_id: str, canvas_id: str, content_hash: str) -> str:
+        """File contents listed by code manifests, stored by hash.
+
+        Shared by every version of the canvas, so identical files are stored once,
+        and under the canvas's code prefix, so deleting the canvas removes them.
+        """
+        return f"s3://{self.s3_dao.bucket_name}/canvas-code/{customer_id}/{canvas_id}/blobs/{content_hash}"
+
+    def _get_canvas_definition(self, s3_uri: str, canvas_version: str) -> Optional[CanvasDefinitionDO]:
+        """Get a canvas definition through the definition cache.
+
+        Published versions are immutable, so a cached copy is returned as is. A cached
+        draft is revalidated with a conditional GET on its ETag.
+        """
+        try:
+            cached = self.definition_cache.get_entry(s3_uri)
+            if cached is not None and canvas_version != "draft":
+                self.definition_cache.record_hit()
+                return self.definition_cache.copy_definition(cached)
+
+            definition_json, etag = self.s3_dao.get_object_with_etag(
+                s3_uri,
+                if_none_match=cached.etag if cached else None
+            )
+            if definition_json is None:
+                self.definition_cache.record_hit(revalidated=True)
+                return self.definition_cache.copy_definition(cached)
+
+            self.definition_cache.record_miss()
+            definition = self._parse_canvas_definition(definition_json)
+            if definition is not None:
+                self.definition_cache.put(s3_uri, definition, etag, len(definition_json.encode('utf-8')))
+            return definition
+        except S3DAONotFoundError:
+            self.logger.info(f"No canvas definition found at {s3_uri}")
+            return None
         except Exception as e:
             self.logger.error(f"Error getting canvas definition from S3: {str(e)}")
             return None
 
+    def _parse_canvas_definition(self, definition_json: Optional[str]) -> Optional[CanvasDefinitionDO]:
+        if not definition_json:
+            self.logger.error("Empty JSON data received from S3")
+            return None
+
+        try:
+            # Parse JSON data
+            data = json.loads(definition_json)
+
+            # Deserialize nodes and edges
+            nodes = [CanvasNode(**node) for node in data.get('nodes', [])]
+            edges = [CanvasEdge(**edge) for edge in data.get('edges', [])]
+
+            # Create CanvasDefinitionDO with deserialized objects
+            return CanvasDefinitionDO(nodes=nodes, edges=edges)
+        except Exception as e:
+            self.logger.error(f"Error deserializing canvas definition JSON: {str(e)}")
+            self.logger.error(f"JSON content: {definition_json}")
+            return None
+
+    async def get_canvas_definitions(self, s3_uris: List[str]) -> Dict[str, Optional[CanvasDefinitionDO]]:
+        """Fetch several canvas definitions from S3 concurrently.
+
+        Definitions that are missing or cannot be parsed map to None.
+        """
+        definitions_json = await self.async_s3_dao.get_many(s3_uris, missing_ok=True)
+        return {
+            s3_uri: self._parse_canvas_definition(definition_json)
+            for s3_uri, definition_json in definitions_json.items()
+        }
+
     def save_canvas(self, canvas_do: CanvasDO, canvas_definition: Optional[CanvasDefinitionDO] = None) -> bool:
         try:
             if canvas_definition and canvas_definition.nodes is not None and canvas_definition.edges is not None:
@@ -115,7 +252,7 @@ class CanvasCoordinator(BaseCoordinator):
                                 raise ValueError("Custom service description is required")
 
                 # Generate S3 URI for the canvas definition
-                s3_uri = f"s3://{self.s3_dao.bucket_name}/canvas-definitions/{canvas_do.customer_id}/{canvas_do.canvas_id}/{canvas_do.canvas_version}.json"
+                s3_uri = self.get_definition_s3_uri(canvas_do.customer_id, canvas_do.canvas_id, canvas_do.canvas_version)
                 
                 # Convert canvas definition to JSON using custom encoder
                 definition_json = json.dumps(canvas_definition, cls=EnumEncoder)
@@ -124,6 +261,7 @@ class CanvasCoordinator(BaseCoordinator):
                 # Save canvas definition to S3
                 if not self.s3_dao.put_object(s3_uri, definition_json):
                     return False
+                self.definition_cache.invalidate(s3_uri)
                 
                 # Update canvas DO with S3 URI
                 canvas_do.canvas_definition_s3_uri = s3_uri
@@ -152,12 +290,39 @@ class CanvasCoordinator(BaseCoordinator):
             self.logger.error(f"Error getting unique canvases: {str(e)}")
             raise
 
-    def delete_canvas_all_versions(self, customer_id: str, canvas_id: str) -> bool:
+    def get_canvas_s3_prefixes(self, customer_id: str, canvas_id: str) -> List[str]:
+        """S3 prefixes holding objects that belong to a single canvas.
+
+        The canvas's code prefix also holds the file contents its code manifests list.
+        """
+        bucket = self.s3_dao.bucket_name
+        return [
+            f"s3://{bucket}/canvas-definitions/{customer_id}/{canvas_id}/",
+            f"s3://{bucket}/canvas-code/{customer_id}/{canvas_id}/",
+            # Per-node code, message history and chat threads
+            f"s3://{bucket}/{customer_id}/{canvas_id}/"
+        ]
+
+    async def delete_canvas_all_versions(self, customer_id: str, canvas_id: str) -> Tuple[int, int]:
+        """Delete every version of a canvas and all of its objects in S3.
+
+        The DynamoDB items are removed with batched writes while each S3 prefix is
+        emptied with bulk deletes, all concurrently. Deleting is idempotent, so a
+        failed run can simply be retried.
+
+        Returns:
+            Tuple[int, int]: Number of DynamoDB items and S3 objects deleted
+        """
         try:
-            all_versions = self.list_canvas_versions(customer_id, canvas_id)
-            for version in all_versions:
-                self.delete_canvas(customer_id, canvas_id, version)
-            return True
+            versions = await self.run_io(self.canvas_dao.list_canvas_versions, customer_id, canvas_id)
+            for version in versions:
+                self.definition_cache.invalidate(self.get_definition_s3_uri(customer_id, canvas_id, version))
+            deleted_items, *deleted_objects = await asyncio.gather(
+                self.run_io(self.canvas_dao.delete_canvas_versions, customer_id, canvas_id, versions),
+                *(self.run_io(self.s3_dao.delete_prefix, prefix)
+                  for prefix in self.get_canvas_s3_prefixes(customer_id, canvas_id))
+            )
+            return deleted_items, sum(deleted_objects)
         except Exception as e:
             self.logger.error(f"Error deleting canvas all versions: {str(e)}")
             raise
@@ -169,6 +334,7 @@ class CanvasCoordinator(BaseCoordinator):
             if canvas_do and canvas_do.canvas_definition_s3_uri:
                 # Delete canvas definition from S3 if URI exists
                 self.s3_dao.delete_object(canvas_do.canvas_definition_s3_uri)
+                self.definition_cache.invalidate(canvas_do.canvas_definition_s3_uri)
             
             # Delete canvas metadata from DynamoDB
             return self.canvas_dao.delete_canvas(customer_id, canvas_id, canvas_version)
@@ -184,8 +350,15 @@ class CanvasCoordinator(BaseCoordinator):
             raise
 
     def create_canvas_version(self, customer_id: str, canvas_id: str) -> Optional[str]:
+        """Snapshot the draft of a canvas as a new immutable version.
+
+        The definition and the code manifest are copied server-side, so nothing is
+        downloaded and the time taken does not depend on the size of the canvas.
+        File contents are content-addressed and shared, so they are not copied.
+        The draft was validated when it was saved, so it is not validated again.
+        """
         try:
-            draft_canvas, draft_definition = self.get_canvas(customer_id, canvas_id, "draft")
+            draft_canvas = self.canvas_dao.get_canvas(customer_id, canvas_id, "draft")
             if not draft_canvas:
                 self.logger.error(f"Draft canvas not found for {canvas_id}.")
                 return None
@@ -193,26 +366,61 @@ class CanvasCoordinator(BaseCoordinator):
             new_version = str(uuid.uuid4())
             timestamp = self._get_timestamp()
 
-            # Create the new CanvasDO with the draft definition
             canvas_do = CanvasDO(
                 canvas_name=draft_canvas.canvas_name,
                 customer_id=customer_id,
                 canvas_id=canvas_id,
                 canvas_version=new_version,
                 created_at=timestamp,
-                updated_at=timestamp,
-                canvas_definition_s3_uri=None  # Will be set in save_canvas
+                updated_at=timestamp
             )
 
-            # Save the canvas with the draft definition
-            if not self.save_canvas(canvas_do, draft_definition):
-                return None
+            if draft_canvas.canvas_definition_s3_uri:
+                definition_uri = self.get_definition_s3_uri(customer_id, canvas_id, new_version)
+                etag = self.s3_dao.copy_object(draft_canvas.canvas_definition_s3_uri, definition_uri)
+                canvas_do.canvas_definition_s3_uri = definition_uri
+                self._share_cached_definition(draft_canvas.canvas_definition_s3_uri, definition_uri, etag)
 
+            self._copy_code(draft_canvas, canvas_do)
+
+            self.canvas_dao.create_canvas(canvas_do)
             return new_version
         except Exception as e:
             self.logger.error(f"Error creating canvas version: {str(e)}")
             raise
 
+    def _copy_code(self, source: CanvasDO, target: CanvasDO) -> None:
+        """Copy the code of one canvas version to another, setting the target's code pointer."""
+        target_manifest_uri = self.get_code_manifest_s3_uri(target.customer_id, target.canvas_id, target.canvas_version)
+        if source.canvas_code_s3_uri:
+            self.s3_dao.copy_object(source.canvas_code_s3_uri, target_manifest_uri)
+            # The copy is the same manifest, so it matches the source's code version
+            target.canvas_code_s3_uri = target_manifest_uri
+            target.code_version = source.code_version
+            return
+
+        # Code never committed through a canvas item is only at its default location
+        candidates = [
+            (self.get_code_manifest_s3_uri, target_manifest_uri),
+            (self.get_code_s3_uri, self.get_code_s3_uri(target.customer_id, target.canvas_id, target.canvas_version))
+        ]
+        for source_uri_for, target_uri in candidates:
+            try:
+                self.s3_dao.copy_object(
+                    source_uri_for(source.customer_id, source.canvas_id, source.canvas_version),
+                    target_uri
+                )
+                return
+            except S3DAONotFoundError:
+                continue
+        self.logger.info(f"Canvas {source.canvas_id} version {source.canvas_version} has no code to copy")
+
+    def _share_cached_definition(self, source_uri: str, target_uri: str, etag: Optional[str]) -> None:
+        """Cache a copied definition under its new URI if the cached source is what was copied."""
+        cached = self.definition_cache.get_entry(source_uri)
+        if cached is not None and etag and cached.etag == etag:
+            self.definition_cache.put(target_uri, cached.definition, etag, cached.size_bytes)
+
     def create_new_canvas(self, customer_id: str, canvas_id: str, canvas_version: str, canvas_name: str, canvas_definition: Optional[CanvasDefinitionDO] = None) -> bool:
         try:
             timestamp = self._get_timestamp()
@@ -1,13 +1,41 @@
 from src.agents.coordinator.agent_coordinator import AgentCoordinator
 from src.storage.coordinator.canvas_coordinator import CanvasCoordinator
-from src.storage.coordinator.base_coordinator import BaseCoordinator, StorageCoordinatorError
-from src.api.models.dataplane_models import GenerateCodeRequest, GenerateCodeResponse, CodeFile
-from typing import List
+from src.storage.coordinator.base_coordinator import BaseCoordinator, StorageCoordinatorError, CodeConflictError
+from src.storage.dynamodb.canvas_dao import CodeVersionConflictError
+from src.api.models.dataplane_models import GenerateCodeRequest, GenerateCodeResponse, CodeFile, CodeStreamEvent
+from src.api.models.node_models import CanvasNode
+from typing import Dict, List, Optional, Set, Tuple, AsyncIterator
 from src.storage.s3.s3_dao import S3DAO
-from src.storage.models.models import CodeDO
+from src.storage.s3.async_s3_dao import get_async_s3_dao
+from src.storage.models.models import CodeDO, CodeManifestDO, CodeManifestEntryDO
 from src.api.models.dataplane_models import ApplyCodeChangesRequest, GetCodeRequest
+from src.api.models.dataplane_models import GenerateCanvasCodeRequest, GenerateCanvasCodeResponse, NodeGenerationError
+from src.api.models.dataplane_models import RegenerateDirtyCodeRequest, RegenerateDirtyCodeResponse, ProgrammingLanguage
+from src.api.models.json_encoder import EnumEncoder
+from src.agents.prompt_formatters.code_formatter import CodePromptFormatter
+from src.agents.coordinator.canvas_generation_scheduler import CanvasGenerationResult
+from src.storage.models.models import CanvasDefinitionDO, CanvasDO
+import asyncio
+import hashlib
+import random
 import json
+from dataclasses import dataclass
 from src.storage.s3.s3_dao import S3DAONotFoundError
+from src.config.settings import (
+    INFERENCE_PROVIDER,
+    APPLY_CODE_CHANGES_MAX_ATTEMPTS,
+    APPLY_CODE_CHANGES_RETRY_BASE_DELAY_SECONDS
+)
+
+@dataclass
+class CanvasContent:
+    """A canvas item with its definition and code, as read for a generation request."""
+    canvas: CanvasDO
+    canvas_definition: CanvasDefinitionDO
+    code: CodeDO
+    # Manifest the code was read from; None for code still stored as a single document
+    code_manifest: Optional[CodeManifestDO] = None
+
 
 class DataplaneCoordinator(BaseCoordinator):
     """Coordinates dataplane operations for code generation."""
@@ -17,20 +45,134 @@ class DataplaneCoordinator(BaseCoordinator):
         self.agent_coordinator = AgentCoordinator()
         self.canvas_coordinator = CanvasCoordinator()
         self.s3_dao = S3DAO()
+        self.async_s3_dao = get_async_s3_dao()
+        self.commit_max_attempts = APPLY_CODE_CHANGES_MAX_ATTEMPTS
+        self.commit_retry_base_delay = APPLY_CODE_CHANGES_RETRY_BASE_DELAY_SECONDS
 
     def get_s3_uri(self, customer_id: str, canvas_id: str, canvas_version: str) -> str:
-        return f"s3://{self.s3_dao.bucket_name}/canvas-code/{customer_id}/{canvas_id}/{canvas_version}.json"
+        return self.canvas_coordinator.get_code_s3_uri(customer_id, canvas_id, canvas_version)
+
+    def get_code_manifest_s3_uri(self, customer_id: str, canvas_id: str, canvas_version: str) -> str:
+        return self.canvas_coordinator.get_code_manifest_s3_uri(customer_id, canvas_id, canvas_version)
+
+    def get_code_manifest_revision_s3_uri(self, customer_id: str, canvas_id: str, canvas_version: str, manifest_hash: str) -> str:
+        """Immutable manifest written by one code change; the canvas item points at the current one."""
+        return f"s3://{self.s3_dao.bucket_name}/canvas-code/{customer_id}/{canvas_id}/{canvas_version}/manifests/{manifest_hash}.json"
 
+    def get_code_blob_s3_uri(self, customer_id: str, canvas_id: str, content_hash: str) -> str:
+        return self.canvas_coordinator.get_code_blob_s3_uri(customer_id, canvas_id, content_hash)
+
+    @staticmethod
+    def hash_code(code: str) -> str:
+        return hashlib.sha256(code.encode('utf-8')).hexdigest()
 
     async def get_code_by_request(self, customer_id: str, request: GetCodeRequest) -> CodeDO:
-        canvas_id = request.canvasId
-        canvas_version = request.canvasVersion
-        code_s3_uri = self.get_s3_uri(customer_id, canvas_id, canvas_version)
-        return await self.get_code_by_uri(code_s3_uri)
+        canvas_do, (code_do, code_manifest) = await asyncio.gather(
+            self.run_io(self.canvas_coordinator.canvas_dao.get_canvas, customer_id, request.canvasId, request.canvasVersion),
+            self.load_code(customer_id, request.canvasId, request.canvasVersion)
+        )
+        code_do, _ = await self._reconcile_code(customer_id, canvas_do, code_do, code_manifest)
+        return code_do
+
+    async def load_code(
+        self,
+        customer_id: str,
+        canvas_id: str,
+        canvas_version: str
+    ) -> Tuple[CodeDO, Optional[CodeManifestDO]]:
+        """Load the code of a canvas version and the manifest it was read from.
+
+        This reads the copy of the current manifest, which can briefly lag behind
+        the canvas item; ``_reconcile_code`` checks it against the item. Code that
+        has not been saved since per-file storage was introduced is read from its
+        single JSON document, and no manifest is returned.
+        """
+        manifest_uri = self.get_code_manifest_s3_uri(customer_id, canvas_id, canvas_version)
+        try:
+            return await self.load_code_manifest(customer_id, canvas_id, manifest_uri)
+        except S3DAONotFoundError:
+            code_do = await self.get_code_by_uri(self.get_s3_uri(customer_id, canvas_id, canvas_version))
+            return code_do, None
+
+    async def load_code_manifest(self, customer_id: str, canvas_id: str, manifest_uri: str) -> Tuple[CodeDO, CodeManifestDO]:
+        """Load a code manifest and fetch the files it lists concurrently."""
+        manifest = CodeManifestDO.from_json(await self.async_s3_dao.get_object(manifest_uri))
+        contents = await self.async_s3_dao.get_many([
+            self.get_code_blob_s3_uri(customer_id, canvas_id, entry.content_hash) for entry in manifest.files
+        ])
+        files = [
+            CodeFile(
+                nodeId=entry.node_id,
+                filePath=entry.file_path,
+                code=contents[self.get_code_blob_s3_uri(customer_id, canvas_id, entry.content_hash)],
+                programmingLanguage=entry.programming_language
+            )
+            for entry in manifest.files
+        ]
+        return CodeDO(files=files, fingerprints=manifest.fingerprints), manifest
+
+    async def _reconcile_code(
+        self,
+        customer_id: str,
+        canvas_do: Optional[CanvasDO],
+        code_do: CodeDO,
+        code_manifest: Optional[CodeManifestDO]
+    ) -> Tuple[CodeDO, Optional[CodeManifestDO]]:
+        """Return the code the canvas item points at, given speculatively loaded code.
+
+        The speculative read is used when its code version matches the item's;
+        otherwise the manifest named by the item is loaded.
+        """
+        if not canvas_do or not canvas_do.canvas_code_s3_uri:
+            return code_do, code_manifest
+        if code_manifest is not None and code_manifest.code_version == canvas_do.code_version:
+            return code_do, code_manifest
+        self.logger.info(f"Code manifest copy is behind code version {canvas_do.code_version}, reading {canvas_do.canvas_code_s3_uri}")
+        return await self.load_code_manifest(customer_id, canvas_do.canvas_id, canvas_do.canvas_code_s3_uri)
+
+    async def save_code_files(
+        self,
+        customer_id: str,
+        canvas_id: str,
+        canvas_version: str,
+        code_do: CodeDO,
+        previous_manifest: Optional[CodeManifestDO] = None,
+        code_version: int = 0
+    ) -> Tuple[str, str]:
+        """Save the code of a canvas version as per-file objects and a new manifest.
+
+        File contents are stored under their hash, so only contents missing from
+        ``previous_manifest`` are uploaded. They are written before the manifest,
+        so a manifest never lists a file that cannot be read. The manifest only
+        becomes current once ``commit_code_changes`` points the canvas item at it.
+
+        Returns:
+            Tuple[str, str]: S3 URI and JSON of the manifest
+        """
+        stored_hashes = {entry.content_hash for entry in previous_manifest.files} if previous_manifest else set()
+        entries = []
+        blobs = {}
+        for file in code_do.files:
+            content_hash = self.hash_code(file.code)
+            entries.append(CodeManifestEntryDO(
+                node_id=file.nodeId,
+                file_path=file.filePath,
+                content_hash=content_hash,
+                programming_language=ProgrammingLanguage.from_dict(file.programmingLanguage)
+            ))
+            if content_hash not in stored_hashes:
+                blobs[self.get_code_blob_s3_uri(customer_id, canvas_id, content_hash)] = file.code
+
+        await self.async_s3_dao.put_many(blobs)
+        manifest_json = CodeManifestDO(files=entries, fingerprints=code_do.fingerprints, code_version=code_version).to_json()
+        manifest_uri = self.get_code_manifest_revision_s3_uri(customer_id, canvas_id, canvas_version, self.hash_code(manifest_json))
+        self.logger.info(f"Saving code manifest to {manifest_uri}, uploaded {len(blobs)} of {len(entries)} files")
+        await self.async_s3_dao.put_object(manifest_uri, manifest_json)
+        return manifest_uri, manifest_json
 
     async def get_code_by_uri(self, code_s3_uri: str) -> CodeDO:
         try:
-            code_json = self.s3_dao.get_object(code_s3_uri)
+            code_json = await self.async_s3_dao.get_object(code_s3_uri)
             if not code_json:
                 self.logger.info(f"No code found at {code_s3_uri}, returning empty CodeDO")
                 return CodeDO(files=[])
@@ -56,80 +198,181 @@ class DataplaneCoordinator(BaseCoordinator):
             self.logger.error(f"Error getting code from S3: {str(e)}")
             return CodeDO(files=[])
 
-    async def apply_code_changes(self, customer_id: str, request: ApplyCodeChangesRequest) -> bool:
-        try:
-            canvas_id = request.canvasId
-            canvas_version = request.canvasVersion
-            
-            if not request.codeChange:
-                raise ValueError("No code change provided")
+    async def load_canvas_content(self, customer_id: str, canvas_id: str, canvas_version: str) -> CanvasContent:
+        """Read a canvas item, its definition and its code concurrently.
 
-            canvas_do, canvas_definition = self.canvas_coordinator.get_canvas(
-                customer_id,
-                request.canvasId,
-                request.canvasVersion
-            )
+        All three locations derive from the canvas key, so the reads overlap and a
+        generation request usually waits for one round-trip before building its
+        prompt. If the code changed while it was being read, the code the item
+        points at is read afterwards.
 
-            if not canvas_do or not canvas_definition:
-                raise StorageCoordinatorError(f"Canvas not found: {request.canvasId} version {request.canvasVersion}")
-                
-                
-            # Get file lists from request - these are now guaranteed to be CodeFile objects
-            added_files = request.codeChange.addedFiles or []
-            updated_files = request.codeChange.updatedFiles or []
-            deleted_files = request.codeChange.deletedFiles or []
+        Raises:
+            StorageCoordinatorError: If the canvas or its definition cannot be found
+        """
+        (canvas_do, canvas_definition), (code_do, code_manifest) = await asyncio.gather(
+            self.canvas_coordinator.load_canvas(customer_id, canvas_id, canvas_version),
+            self.load_code(customer_id, canvas_id, canvas_version)
+        )
+        if not canvas_do or not canvas_definition:
+            raise StorageCoordinatorError(f"Canvas not found: {canvas_id} version {canvas_version}")
+        code_do, code_manifest = await self._reconcile_code(customer_id, canvas_do, code_do, code_manifest)
+        return CanvasContent(
+            canvas=canvas_do,
+            canvas_definition=canvas_definition,
+            code=code_do,
+            code_manifest=code_manifest
+        )
 
-            # Get existing code files
-            existing_code_do = await self.get_code_by_request(customer_id, GetCodeRequest(canvasId=canvas_id, canvasVersion=canvas_version))
-            if not existing_code_do:
-                existing_code_do = CodeDO(files=[])
+    @staticmethod
+    def apply_file_changes(
+        files: List[CodeFile],
+        added_files: List[CodeFile],
+        updated_files: List[CodeFile],
+        deleted_files: List[CodeFile]
+    ) -> List[CodeFile]:
+        """Return ``files`` with the given changes applied, matching files by path."""
+        replaced_paths = {f.filePath for f in deleted_files}
+        replaced_paths.update(f.filePath for f in updated_files)
+        replaced_paths.update(f.filePath for f in added_files)
+        final_files = [f for f in files if f.filePath not in replaced_paths]
+        final_files.extend(updated_files)
+        final_files.extend(added_files)
+        return final_files
 
-            # Create sets of file paths for faster lookup
-            deleted_paths = {f.filePath for f in deleted_files}
-            updated_paths = {f.filePath for f in updated_files}
-            added_paths = {f.filePath for f in added_files}
+    def _hash_files_by_path(self, files: List[CodeFile]) -> Dict[str, str]:
+        return {f.filePath: self.hash_code(f.code) for f in files}
 
-            # Process existing files
-            final_files = []
-            for file in existing_code_do.files:
-                if file.filePath not in deleted_paths and file.filePath not in updated_paths:
-                    final_files.append(file)
+    async def commit_code_changes(
+        self,
+        customer_id: str,
+        canvas_id: str,
+        canvas_version: str,
+        added_files: List[CodeFile],
+        updated_files: List[CodeFile],
+        deleted_files: List[CodeFile],
+        fingerprints: Optional[Dict[str, str]] = None,
+        base: Optional[CanvasContent] = None,
+        expected_code_version: Optional[int] = None
+    ) -> int:
+        """Apply file changes to the current code of a canvas version and save them.
 
-            # Add updated and new files
-            final_files.extend(updated_files)
-            final_files.extend(added_files)
+        The result is written as a new manifest, which becomes current by advancing
+        the canvas item's code version, on condition that nobody else advanced it
+        since the code was read. If another change committed first, these changes
+        are re-applied on top of it and committed again, unless that change
+        touched one of the same file paths. With ``expected_code_version`` the
+        changes are never re-applied: they only commit on top of that version.
 
-            # Create new code DO and save to S3
-            code_do = CodeDO(files=final_files)
-            code_s3_uri = self.save_code_to_s3(customer_id, canvas_id, canvas_version, code_do)
-            
-            # Verify the save was successful
-            if not code_s3_uri:
-                raise StorageCoordinatorError("Failed to save code to S3")
+        Args:
+            customer_id: ID of the customer
+            canvas_id: ID of the canvas
+            canvas_version: Version of the canvas
+            added_files: Files to add
+            updated_files: Files to replace
+            deleted_files: Files to remove
+            fingerprints: Generation fingerprints to store; defaults to keeping the current ones
+            base: Canvas content the changes were made against; read now if not given
+            expected_code_version: Code version the caller's changes were made against
+
+        Returns:
+            int: The new code version
+
+        Raises:
+            CodeConflictError: If a concurrent change touched the same paths, the
+                code is no longer at ``expected_code_version``, or changes kept
+                landing first for every attempt
+        """
+        changed_paths = {f.filePath for f in [*added_files, *updated_files, *deleted_files]}
+        content = base or await self.load_canvas_content(customer_id, canvas_id, canvas_version)
+        base_hashes = self._hash_files_by_path(content.code.files)
 
-            canvas_do.canvas_code_s3_uri = code_s3_uri
-            self.canvas_coordinator.update_canvas(canvas_do)
+        for attempt in range(self.commit_max_attempts):
+            if attempt:
+                content = await self.load_canvas_content(customer_id, canvas_id, canvas_version)
+                current_hashes = self._hash_files_by_path(content.code.files)
+                concurrently_changed = {
+                    path for path in base_hashes.keys() | current_hashes.keys()
+                    if base_hashes.get(path) != current_hashes.get(path)
+                }
+                conflicts = concurrently_changed & changed_paths
+                if conflicts:
+                    raise CodeConflictError(
+                        f"Files changed concurrently in canvas {canvas_id}: {', '.join(sorted(conflicts))}"
+                    )
+            if expected_code_version is not None and content.canvas.code_version != expected_code_version:
+                raise CodeConflictError(
+                    f"Code of canvas {canvas_id} is at version {content.canvas.code_version}, "
+                    f"not the expected version {expected_code_version}"
+                )
 
-            return True
+            code_do = CodeDO(
+                files=self.apply_file_changes(content.code.files, added_files, updated_files, deleted_files),
+                fingerprints=content.code.fingerprints if fingerprints is None else fingerprints
+            )
+            base_code_version = content.canvas.code_version
+            manifest_uri, manifest_json = await self.save_code_files(
+                customer_id, canvas_id, canvas_version, code_do, content.code_manifest, base_code_version + 1
+            )
+            try:
+                new_code_version = await self.run_io(
+                    self.canvas_coordinator.canvas_dao.update_code_pointer,
+                    customer_id,
+                    canvas_id,
+                    canvas_version,
+                    manifest_uri,
+                    base_code_version
+                )
+            except CodeVersionConflictError:
+                if expected_code_version is not None:
+                    raise CodeConflictError(
+                        f"Code of canvas {canvas_id} changed from the expected version {expected_code_version}"
+                    )
+                self.logger.info(f"Code of canvas {canvas_id} changed during commit, re-basing (attempt {attempt + 1})")
+                # Jittered backoff so appliers racing for the same canvas spread out
+                await asyncio.sleep(random.uniform(0, self.commit_retry_base_delay * 2 ** attempt))
+                continue
+
+            try:
+                await self.async_s3_dao.put_object(self.get_code_manifest_s3_uri(customer_id, canvas_id, canvas_version), manifest_json)
+            except Exception as e:
+                # Readers notice the stale copy by its code version and follow the canvas item instead
+                self.logger.warning(f"Failed to update the current code manifest copy: {str(e)}")
+            return new_code_version
+
+        raise CodeConflictError(
+            f"Code of canvas {canvas_id} kept changing; gave up after {self.commit_max_attempts} attempts"
+        )
+
+    async def apply_code_changes(self, customer_id: str, request: ApplyCodeChangesRequest) -> int:
+        """Apply a code change to a canvas version.
+
+        Returns:
+            int: The new code version
+
+        Raises:
+            CodeConflictError: If the change conflicts with a concurrent one
+            StorageCoordinatorError: If the change cannot be applied
+        """
+        try:
+            if not request.codeChange:
+                raise ValueError("No code change provided")
+
+            # Get file lists from request - these are now guaranteed to be CodeFile objects
+            return await self.commit_code_changes(
+                customer_id,
+                request.canvasId,
+                request.canvasVersion,
+                added_files=request.codeChange.addedFiles or [],
+                updated_files=request.codeChange.updatedFiles or [],
+                deleted_files=request.codeChange.deletedFiles or [],
+                expected_code_version=request.expectedCodeVersion
+            )
+        except CodeConflictError:
+            raise
         except Exception as e:
             self.logger.exception(f"Error applying code changes: {str(e)}")
             raise StorageCoordinatorError(f"Failed to apply code changes: {str(e)}")
 
-    def save_code(self, code_s3_uri: str, code_do: CodeDO) -> bool:
-        return self.s3_dao.put_object(code_s3_uri, code_do.to_json())
-
-    def save_code_to_s3(
-        self,
-        customer_id: str,
-        canvas_id: str,
-        canvas_version: str,
-        code_do: CodeDO
-    ) -> str:
-        s3_uri = self.get_s3_uri(customer_id, canvas_id, canvas_version)
-        self.logger.info(f"Saving code to S3 at {s3_uri}")
-        self.save_code(s3_uri, code_do)
-        return s3_uri
-
     def merge_existing_and_new_code(
         self,
         node_id: str,
@@ -159,39 +402,38 @@ class DataplaneCoordinator(BaseCoordinator):
             deletedFiles=deleted_files
         )
 
+    async def _load_node_generation_inputs(
+        self,
+        customer_id: str,
+        request: GenerateCodeRequest
+    ) -> Tuple[CanvasDO, CanvasDefinitionDO, CanvasNode, List[CodeFile]]:
+        """Load the canvas, target node and existing code a node generation request needs."""
+        content = await self.load_canvas_content(customer_id, request.canvasId, request.canvasVersion)
+        canvas_do, canvas_definition = content.canvas, content.canvas_definition
+
+        # Find the target node
+        target_node = None
+        for node in canvas_definition.nodes:
+            if node.nodeId == request.nodeId:
+                target_node = node
+                break
+        
+        if not target_node:
+            raise StorageCoordinatorError(f"Node not found: {request.nodeId}")
+
+        # Get the code for the target node
+        existing_code: List[CodeFile] = content.code.files
+        return canvas_do, canvas_definition, target_node, existing_code
+
     async def generate_code(
         self,
         customer_id: str,
         request: GenerateCodeRequest
     ) -> GenerateCodeResponse:
         try:
-            # Get canvas and node information
-            canvas_do, canvas_definition = self.canvas_coordinator.get_canvas(
-                customer_id,
-                request.canvasId,
-                request.canvasVersion
-            )
-
-            existing_code_do = await self.get_code_by_request(
-                customer_id, 
-                GetCodeRequest(canvasId=request.canvasId, canvasVersion=request.canvasVersion)
+            canvas_do, canvas_definition, target_node, existing_code = await self._load_node_generation_inputs(
+                customer_id, request
             )
-            
-            if not canvas_do or not canvas_definition:
-                raise StorageCoordinatorError(f"Canvas not found: {request.canvasId} version {request.canvasVersion}")
-            
-            # Find the target node
-            target_node = None
-            for node in canvas_definition.nodes:
-                if node.nodeId == request.nodeId:
-                    target_node = node
-                    break
-            
-            if not target_node:
-                raise StorageCoordinatorError(f"Node not found: {request.nodeId}")
-
-            # Get the code for the target node
-            existing_code: List[CodeFile] = existing_code_do.files
 
             # Generate code using agent coordinator
             response = await self.agent_coordinator.generate_code(
@@ -200,7 +442,8 @@ class DataplaneCoordinator(BaseCoordinator):
                 canvas=canvas_do,
                 language=request.programmingLanguage,
                 existing_code=existing_code,
-                inference_provider="bedrock"  # Default to Bedrock for now
+                inference_provider=INFERENCE_PROVIDER,
+                bypass_cache=request.bypassCache
             )
 
             # Merge existing and new code
@@ -216,3 +459,198 @@ class DataplaneCoordinator(BaseCoordinator):
                 "error": str(e),
                 "status_code": 500
             }
+
+    async def open_code_stream(
+        self,
+        customer_id: str,
+        request: GenerateCodeRequest
+    ) -> AsyncIterator[CodeStreamEvent]:
+        """Start a streamed node generation.
+
+        Lookups happen before the stream is returned, so a missing canvas or node
+        raises here rather than part-way through the response.
+
+        Raises:
+            StorageCoordinatorError: If the canvas or node cannot be found
+        """
+        canvas_do, canvas_definition, target_node, existing_code = await self._load_node_generation_inputs(
+            customer_id, request
+        )
+        return self.agent_coordinator.stream_code(
+            node=target_node,
+            canvas_definition=canvas_definition,
+            canvas=canvas_do,
+            language=request.programmingLanguage,
+            existing_code=existing_code,
+            inference_provider=INFERENCE_PROVIDER,
+            bypass_cache=request.bypassCache
+        )
+
+    async def generate_canvas_code(
+        self,
+        customer_id: str,
+        request: GenerateCanvasCodeRequest
+    ) -> GenerateCanvasCodeResponse:
+        """Generate code for every node of a canvas in dependency order, then the canvas entrypoints."""
+        content = await self.load_canvas_content(customer_id, request.canvasId, request.canvasVersion)
+        canvas_do, canvas_definition, existing_code_do = content.canvas, content.canvas_definition, content.code
+
+        result = await self.agent_coordinator.generate_canvas_code(
+            canvas_definition=canvas_definition,
+            canvas=canvas_do,
+            language=request.programmingLanguage,
+            existing_code=existing_code_do.files,
+            max_parallelism=request.maxParallelism,
+            inference_provider=INFERENCE_PROVIDER,
+            bypass_cache=request.bypassCache
+        )
+
+        response = GenerateCanvasCodeResponse(addedFiles=[], updatedFiles=[], deletedFiles=[], nodeErrors=[])
+        self._collect_generation_changes(result, response)
+        return response
+
+    def _collect_generation_changes(self, result: CanvasGenerationResult, response) -> None:
+        """Copy the file changes and errors of a canvas generation run onto a response."""
+        parser_responses = [r.code_parser_response for r in result.node_results.values() if r.code_parser_response]
+        if result.canvas_parser_response:
+            parser_responses.append(result.canvas_parser_response)
+        for parser_response in parser_responses:
+            response.addedFiles.extend(parser_response.addedFiles)
+            response.updatedFiles.extend(parser_response.updatedFiles)
+            response.deletedFiles.extend(parser_response.deletedFiles)
+        response.nodeErrors = [
+            NodeGenerationError(nodeId=r.node_id, errorMessage=r.error_message)
+            for r in result.node_results.values() if r.error_message
+        ]
+        response.canvasErrorMessage = result.canvas_error_message
+
+    def _hash_node_code(self, node_id: str, code: List[CodeFile]) -> str:
+        """Hash the code files owned by a node, independent of file order."""
+        digest = hashlib.sha256()
+        for file in sorted((f for f in code if f.nodeId == node_id), key=lambda f: f.filePath):
+            digest.update(file.filePath.encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(file.code.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def compute_fingerprints(
+        self,
+        canvas_definition: CanvasDefinitionDO,
+        language: ProgrammingLanguage,
+        code: List[CodeFile]
+    ) -> Dict[str, str]:
+        """Fingerprint the generation inputs of every node on the canvas.
+
+        A fingerprint covers the node definition, the language, the prompt template
+        version and the code of each node it depends on. The node position is left
+        out, since moving a node on the canvas does not change what it generates.
+        """
+        formatter = CodePromptFormatter()
+        fingerprints = {}
+        for node in canvas_definition.nodes:
+            node_definition = node.to_dict()
+            node_definition.pop('nodePosition', None)
+            inputs = {
+                "node": node_definition,
+                "language": language.to_dict(),
+                "templateVersion": CodePromptFormatter.TEMPLATE_VERSION,
+                "dependencies": {
+                    dependency.nodeId: self._hash_node_code(dependency.nodeId, code)
+                    for dependency in formatter.find_dependency_nodes(node, canvas_definition)
+                }
+            }
+            encoded = json.dumps(inputs, sort_keys=True, cls=EnumEncoder)
+            fingerprints[node.nodeId] = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        return fingerprints
+
+    def find_dirty_nodes(
+        self,
+        canvas_definition: CanvasDefinitionDO,
+        current_fingerprints: Dict[str, str],
+        stored_fingerprints: Optional[Dict[str, str]]
+    ) -> Set[str]:
+        """Nodes whose fingerprint changed (or was never stored), plus all their transitive dependents."""
+        stored_fingerprints = stored_fingerprints or {}
+        dirty = {
+            node_id for node_id, fingerprint in current_fingerprints.items()
+            if stored_fingerprints.get(node_id) != fingerprint
+        }
+
+        dependents: Dict[str, Set[str]] = {}
+        for edge in canvas_definition.edges:
+            dependents.setdefault(edge.source, set()).add(edge.target)
+
+        pending = list(dirty)
+        while pending:
+            for dependent in dependents.get(pending.pop(), ()):
+                if dependent in current_fingerprints and dependent not in dirty:
+                    dirty.add(dependent)
+                    pending.append(dependent)
+        return dirty
+
+    async def regenerate_dirty(
+        self,
+        customer_id: str,
+        request: RegenerateDirtyCodeRequest
+    ) -> RegenerateDirtyCodeResponse:
+        """Regenerate only the nodes whose generation inputs changed, and save the result.
+
+        Nodes are dirty when their fingerprint differs from the one stored with the
+        code; their transitive dependents are regenerated with them. The new code and
+        fingerprints are saved. Nodes that fail keep the fingerprint stored before
+        this run, which no longer matches their inputs, so the next run retries them.
+        """
+        self._validate_version_mutable(request.canvasVersion)
+        content = await self.load_canvas_content(customer_id, request.canvasId, request.canvasVersion)
+        canvas_do, canvas_definition, existing_code_do = content.canvas, content.canvas_definition, content.code
+        language = request.programmingLanguage
+
+        current_fingerprints = self.compute_fingerprints(canvas_definition, language, existing_code_do.files)
+        dirty_node_ids = self.find_dirty_nodes(canvas_definition, current_fingerprints, existing_code_do.fingerprints)
+
+        response = RegenerateDirtyCodeResponse(
+            regeneratedNodeIds=[node.nodeId for node in canvas_definition.nodes if node.nodeId in dirty_node_ids],
+            addedFiles=[],
+            updatedFiles=[],
+            deletedFiles=[],
+            nodeErrors=[]
+        )
+        if not dirty_node_ids:
+            self.logger.info(f"No dirty nodes in canvas {request.canvasId}, nothing to regenerate")
+            return response
+
+        self.logger.info(f"Regenerating {len(dirty_node_ids)} of {len(canvas_definition.nodes)} nodes in canvas {request.canvasId}")
+        result = await self.agent_coordinator.generate_canvas_code(
+            canvas_definition=canvas_definition,
+            canvas=canvas_do,
+            language=language,
+            existing_code=existing_code_do.files,
+            max_parallelism=request.maxParallelism,
+            node_ids=dirty_node_ids,
+            inference_provider=INFERENCE_PROVIDER,
+            bypass_cache=request.bypassCache
+        )
+        self._collect_generation_changes(result, response)
+
+        fingerprints = self.compute_fingerprints(canvas_definition, language, result.final_code)
+        stored_fingerprints = existing_code_do.fingerprints or {}
+        for node_result in result.node_results.values():
+            if not node_result.error_message:
+                continue
+            if node_result.node_id in stored_fingerprints:
+                fingerprints[node_result.node_id] = stored_fingerprints[node_result.node_id]
+            else:
+                fingerprints.pop(node_result.node_id, None)
+
+        await self.commit_code_changes(
+            customer_id,
+            request.canvasId,
+            request.canvasVersion,
+            added_files=response.addedFiles,
+            updated_files=response.updatedFiles,
+            deleted_files=response.deletedFiles,
+            fingerprints=fingerprints,
+            base=content
+        )
+        return response
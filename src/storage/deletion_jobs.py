@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from src.config.settings import DELETION_JOBS_MAX_FINISHED
+
+logger = logging.getLogger(__name__)
+
+
+class DeletionJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class DeletionJob:
+    """Progress of a background canvas deletion."""
+    job_id: str
+    customer_id: str
+    canvas_id: str
+    status: DeletionJobStatus
+    created_at: str
+    finished_at: Optional[str] = None
+    deleted_items: int = 0
+    deleted_objects: int = 0
+    error_message: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DeletionJobStatus.SUCCEEDED, DeletionJobStatus.FAILED)
+
+
+# Deletes a canvas and returns (DynamoDB items deleted, S3 objects deleted)
+DeleteCanvas = Callable[[], Awaitable[Tuple[int, int]]]
+
+
+class DeletionJobRegistry:
+    """Runs canvas deletions as background tasks and remembers their outcome for polling.
+
+    Jobs live in memory on the event loop, so status is only visible on the
+    process that accepted the deletion. Starting a deletion for a canvas that
+    already has one running returns the running job. Only the most recent
+    ``max_finished_jobs`` finished jobs are kept.
+    """
+
+    def __init__(self, max_finished_jobs: int = DELETION_JOBS_MAX_FINISHED):
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: "OrderedDict[str, DeletionJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, customer_id: str, canvas_id: str, delete: DeleteCanvas) -> DeletionJob:
+        """Start deleting a canvas in the background. Must be called on the event loop."""
+        for job in self._jobs.values():
+            if job.customer_id == customer_id and job.canvas_id == canvas_id and not job.finished:
+                return job
+
+        job = DeletionJob(
+            job_id=str(uuid.uuid4()),
+            customer_id=customer_id,
+            canvas_id=canvas_id,
+            status=DeletionJobStatus.PENDING,
+            created_at=datetime.utcnow().isoformat()
+        )
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, delete))
+        return job
+
+    def get(self, customer_id: str, job_id: str) -> Optional[DeletionJob]:
+        """Get a job, or None if it is unknown or belongs to another customer."""
+        job = self._jobs.get(job_id)
+        if job is None or job.customer_id != customer_id:
+            return None
+        return job
+
+    async def _run(self, job: DeletionJob, delete: DeleteCanvas) -> None:
+        job.status = DeletionJobStatus.RUNNING
+        try:
+            job.deleted_items, job.deleted_objects = await delete()
+            job.status = DeletionJobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = DeletionJobStatus.FAILED
+            job.error_message = "Deletion was cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Error deleting canvas {job.canvas_id}: {str(e)}", exc_info=True)
+            job.status = DeletionJobStatus.FAILED
+            job.error_message = str(e)
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            self._tasks.pop(job.job_id, None)
+            self._prune()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    async def close(self) -> None:
+        """Cancel deletions that are still running."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# One registry per process so any request can poll a job started by another
+canvas_deletion_jobs = DeletionJobRegistry()
@@ -1,5 +1,8 @@
-from typing import TypeVar, Generic, Dict, Any, Optional, List
+from typing import TypeVar, Generic, Dict, Any, Optional, List, Iterator
 from dataclasses import dataclass, asdict
+import base64
+import binascii
+import json
 import logging
 from src.infra.config import DynamoDBConfig
 from src.infra.dynamodb.client import DynamoDBClientFactory
@@ -19,8 +22,45 @@ class DynamoDBDAOConnectionError(DynamoDBDAOError):
     """Exception raised when there are connection issues with DynamoDB."""
     pass
 
+class InvalidContinuationTokenError(DynamoDBDAOError):
+    """Exception raised when a continuation token cannot be decoded."""
+    pass
+
 T = TypeVar('T')
 
+@dataclass
+class QueryPage:
+    """One page of query results.
+
+    ``next_token`` is an opaque token to pass back to get the next page, or None
+    when there are no more results.
+    """
+    items: List[Dict[str, Any]]
+    next_token: Optional[str] = None
+
+def encode_continuation_token(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Encode a query's LastEvaluatedKey as an opaque, URL-safe token.
+
+    Keys must only hold string attributes, which is true for every table we own.
+    """
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_continuation_token(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode a token from ``encode_continuation_token`` back into an ExclusiveStartKey."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidContinuationTokenError(f"Invalid continuation token: {str(e)}")
+    if not isinstance(key, dict) or not all(isinstance(v, str) for v in key.values()):
+        raise InvalidContinuationTokenError("Invalid continuation token")
+    return key
+
 @dataclass
 class BaseDynamoDBDAO(Generic[T]):
     """Base class for all DynamoDB DAOs."""
@@ -69,14 +109,105 @@ class BaseDynamoDBDAO(Generic[T]):
             self.logger.error(f"Error deleting item: {str(e)}")
             raise DynamoDBDAOError(f"Failed to delete item: {str(e)}")
 
-    def _query_items(self, key_condition_expression: str, expression_attribute_values: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Query items from the table."""
+    def _query_page(
+        self,
+        key_condition_expression: Any,
+        expression_attribute_values: Optional[Dict[str, Any]] = None,
+        projection_expression: Optional[str] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        limit: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        index_name: Optional[str] = None,
+        scan_index_forward: bool = True
+    ) -> QueryPage:
+        """Query one page of items from the table.
+
+        Args:
+            key_condition_expression: Condition string or boto3 ``Key`` condition
+            expression_attribute_values: Values for a condition string
+            projection_expression: Attributes to read; all attributes when None
+            expression_attribute_names: Placeholders used by the expressions
+            limit: Maximum number of items to evaluate
+            continuation_token: ``next_token`` of the previous page
+            index_name: Secondary index to query instead of the table
+            scan_index_forward: Sort key order; False for descending
+
+        Returns:
+            QueryPage: The items and the token for the next page
+
+        Raises:
+            InvalidContinuationTokenError: If ``continuation_token`` is malformed
+            DynamoDBDAOError: If the query fails
+        """
+        query: Dict[str, Any] = {'KeyConditionExpression': key_condition_expression}
+        if expression_attribute_values:
+            query['ExpressionAttributeValues'] = expression_attribute_values
+        if projection_expression:
+            query['ProjectionExpression'] = projection_expression
+        if expression_attribute_names:
+            query['ExpressionAttributeNames'] = expression_attribute_names
+        if limit:
+            query['Limit'] = limit
+        if index_name:
+            query['IndexName'] = index_name
+        if not scan_index_forward:
+            query['ScanIndexForward'] = False
+        exclusive_start_key = decode_continuation_token(continuation_token)
+        if exclusive_start_key:
+            query['ExclusiveStartKey'] = exclusive_start_key
         try:
-            response = self.table.query(
-                KeyConditionExpression=key_condition_expression,
-                ExpressionAttributeValues=expression_attribute_values
-            )
-            return response.get('Items', [])
+            response = self.table.query(**query)
         except Exception as e:
             self.logger.error(f"Error querying items: {str(e)}")
-            raise DynamoDBDAOError(f"Failed to query items: {str(e)}") 
\ No newline at end of file
+            raise DynamoDBDAOError(f"Failed to query items: {str(e)}")
+        return QueryPage(
+            items=response.get('Items', []),
+            next_token=encode_continuation_token(response.get('LastEvaluatedKey'))
+        )
+
+    def _iter_query(
+        self,
+        key_condition_expression: Any,
+        expression_attribute_values: Optional[Dict[str, Any]] = None,
+        projection_expression: Optional[str] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        page_size: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        index_name: Optional[str] = None,
+        scan_index_forward: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over every item matching a query, fetching pages as they are needed.
+
+        Takes the same arguments as ``_query_page``; ``page_size`` is passed as its ``limit``.
+        """
+        token = continuation_token
+        while True:
+            page = self._query_page(
+                key_condition_expression,
+                expression_attribute_values,
+                projection_expression=projection_expression,
+                expression_attribute_names=expression_attribute_names,
+                limit=page_size,
+                continuation_token=token,
+                index_name=index_name,
+                scan_index_forward=scan_index_forward
+            )
+            yield from page.items
+            if page.next_token is None:
+                return
+            token = page.next_token
+
+    def _query_items(
+        self,
+        key_condition_expression: Any,
+        expression_attribute_values: Optional[Dict[str, Any]] = None,
+        projection_expression: Optional[str] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Query all items from the table, following pagination."""
+        return list(self._iter_query(
+            key_condition_expression,
+            expression_attribute_values,
+            projection_expression=projection_expression,
+            expression_attribute_names=expression_attribute_names
+        ))
@@ -1,10 +1,11 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Any
 from datetime import datetime
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 import logging
 from src.storage.models.models import CanvasDO
-from src.storage.dynamodb.base_dao import BaseDynamoDBDAO
-from src.infra.dynamodb.tables import CANVAS_TABLE
+from src.storage.dynamodb.base_dao import BaseDynamoDBDAO, DynamoDBDAOError
+from src.infra.dynamodb.tables import CANVAS_TABLE, CANVAS_DRAFTS_BY_UPDATED_AT, CANVAS_VERSIONS_BY_UPDATED_AT
 
 """
 CANVAS_TABLE = TableDefinition(
@@ -13,12 +14,22 @@ CANVAS_TABLE = TableDefinition(
     sort_key="canvas_id_and_version",  # Format: canvas_id#version
     attributes=[
         {"AttributeName": "customer_id", "AttributeType": "S"},
-        {"AttributeName": "canvas_id_and_version", "AttributeType": "S"}
+        {"AttributeName": "canvas_id_and_version", "AttributeType": "S"},
+        {"AttributeName": "draft_updated_at", "AttributeType": "S"},
+        {"AttributeName": "customer_canvas_id", "AttributeType": "S"},
+        {"AttributeName": "updated_at", "AttributeType": "S"}
     ],
-    gsis=[]  # No GSIs needed as main index supports all required patterns
+    gsis=[CANVAS_DRAFTS_BY_UPDATED_AT, CANVAS_VERSIONS_BY_UPDATED_AT]  # Paged listings by last update
 )
 """
 
+class CodeVersionConflictError(DynamoDBDAOError):
+    """Raised when a canvas's code changed since the caller read its code version."""
+    pass
+
+# Attributes needed to list canvases; leaves out S3 pointers and code versions
+CANVAS_LISTING_PROJECTION = "customer_id, canvas_id_and_version, canvas_name, created_at, updated_at"
+
 class CanvasDAO(BaseDynamoDBDAO[CanvasDO]):
     """DAO for canvas operations. All canvas data is stored directly in DynamoDB."""
     
@@ -37,9 +48,22 @@ class CanvasDAO(BaseDynamoDBDAO[CanvasDO]):
             canvas_version=extracted_canvas_version,
             created_at=item['created_at'],
             updated_at=item['updated_at'],
-            canvas_definition_s3_uri=item['canvas_definition_s3_uri']
+            canvas_definition_s3_uri=item.get('canvas_definition_s3_uri'),
+            canvas_code_s3_uri=item.get('canvas_code_s3_uri'),
+            code_version=int(item.get('code_version', 0))
         )
 
+    def get_listing_attributes(self, canvas: CanvasDO) -> Dict[str, str]:
+        """Attributes that place an item in the listing GSIs.
+
+        Only drafts get ``draft_updated_at``, so the drafts index holds exactly one
+        entry per canvas.
+        """
+        attributes = {'customer_canvas_id': f"{canvas.customer_id}#{canvas.canvas_id}"}
+        if canvas.canvas_version == "draft":
+            attributes['draft_updated_at'] = canvas.updated_at
+        return attributes
+
     def get_canvas(self, customer_id: str, canvas_id: str, canvas_version: str) -> Optional[CanvasDO]:
         """Get a canvas by ID and version."""
         try:
@@ -55,24 +79,123 @@ class CanvasDAO(BaseDynamoDBDAO[CanvasDO]):
             raise
 
     def save_canvas(self, canvas: CanvasDO) -> bool:
-        """Save a canvas."""
+        """Save a canvas's metadata.
+
+        Only the metadata attributes are written, so a save never overwrites the code
+        pointer that ``update_code_pointer`` maintains on the same item.
+        """
         try:
             canvas.updated_at = datetime.now().isoformat()
             if not canvas.created_at:
                 canvas.created_at = canvas.updated_at
 
-            return self._put_item({
-                'customer_id': canvas.customer_id,
-                'canvas_id_and_version': f"{canvas.canvas_id}#{canvas.canvas_version}",
+            attributes = {
                 'canvas_name': canvas.canvas_name,
                 'created_at': canvas.created_at,
                 'updated_at': canvas.updated_at,
                 'canvas_definition_s3_uri': canvas.canvas_definition_s3_uri,
-            })
+                **self.get_listing_attributes(canvas)
+            }
+            self.table.update_item(
+                Key={
+                    'customer_id': canvas.customer_id,
+                    'canvas_id_and_version': f"{canvas.canvas_id}#{canvas.canvas_version}"
+                },
+                UpdateExpression="SET " + ", ".join(f"{name} = :{name}" for name in attributes),
+                ExpressionAttributeValues={f":{name}": value for name, value in attributes.items()}
+            )
+            return True
         except Exception as e:
             self.logger.error(f"Error saving canvas: {str(e)}")
             return False
 
+    def create_canvas(self, canvas: CanvasDO) -> bool:
+        """Create a canvas item with all of its attributes, including the code pointer.
+
+        Raises:
+            DynamoDBDAOError: If the item already exists or cannot be written
+        """
+        try:
+            self.table.put_item(
+                Item={
+                    'customer_id': canvas.customer_id,
+                    'canvas_id_and_version': f"{canvas.canvas_id}#{canvas.canvas_version}",
+                    'canvas_name': canvas.canvas_name,
+                    'created_at': canvas.created_at,
+                    'updated_at': canvas.updated_at,
+                    'canvas_definition_s3_uri': canvas.canvas_definition_s3_uri,
+                    'canvas_code_s3_uri': canvas.canvas_code_s3_uri,
+                    'code_version': canvas.code_version,
+                    **self.get_listing_attributes(canvas)
+                },
+                ConditionExpression="attribute_not_exists(customer_id)"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error creating canvas: {str(e)}")
+            raise DynamoDBDAOError(f"Failed to create canvas: {str(e)}")
+
+    def update_code_pointer(
+        self,
+        customer_id: str,
+        canvas_id: str,
+        canvas_version: str,
+        code_s3_uri: str,
+        expected_code_version: int
+    ) -> int:
+        """Point a canvas at new code, if nobody else changed its code first.
+
+        Args:
+            customer_id: ID of the customer
+            canvas_id: ID of the canvas
+            canvas_version: Version of the canvas
+            code_s3_uri: S3 URI of the new code manifest
+            expected_code_version: Code version the new code was based on
+
+        Returns:
+            int: The new code version
+
+        Raises:
+            CodeVersionConflictError: If the code version is no longer ``expected_code_version``
+            DynamoDBDAOError: If the canvas does not exist or the update fails
+        """
+        condition = "attribute_exists(customer_id) AND code_version = :expected"
+        if expected_code_version == 0:
+            # Items written before code versions existed have no counter yet
+            condition = "attribute_exists(customer_id) AND (attribute_not_exists(code_version) OR code_version = :expected)"
+        new_code_version = expected_code_version + 1
+        update_expression = "SET canvas_code_s3_uri = :uri, code_version = :new, updated_at = :updated_at"
+        values = {
+            ':uri': code_s3_uri,
+            ':new': new_code_version,
+            ':expected': expected_code_version,
+            ':updated_at': datetime.now().isoformat()
+        }
+        if canvas_version == "draft":
+            # Keep the drafts index in step with updated_at, as save_canvas does
+            update_expression += ", draft_updated_at = :updated_at"
+        try:
+            self.table.update_item(
+                Key={
+                    'customer_id': customer_id,
+                    'canvas_id_and_version': f"{canvas_id}#{canvas_version}"
+                },
+                UpdateExpression=update_expression,
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values
+            )
+            return new_code_version
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                self.logger.error(f"Error updating code pointer: {str(e)}")
+                raise DynamoDBDAOError(f"Failed to update code pointer: {str(e)}")
+            # Tell a concurrent change apart from a missing canvas
+            if self.get_canvas(customer_id, canvas_id, canvas_version) is None:
+                raise DynamoDBDAOError(f"Canvas not found: {canvas_id} version {canvas_version}")
+            raise CodeVersionConflictError(
+                f"Code of canvas {canvas_id} version {canvas_version} changed since version {expected_code_version}"
+            )
+
     def get_all_canvases(self, customer_id: str) -> List[CanvasDO]:
         """Get all canvases for a customer."""
         try:
@@ -86,10 +209,14 @@ class CanvasDAO(BaseDynamoDBDAO[CanvasDO]):
             raise
 
     def get_unique_canvases(self, customer_id: str) -> List[CanvasDO]:
+        """Get one entry per canvas for a customer.
+
+        Only the attributes needed for listing are read, page by page.
+        """
         try:
-            items = self._query_items(
-                'customer_id = :cid',
-                {':cid': customer_id}
+            items = self._iter_query(
+                Key('customer_id').eq(customer_id),
+                projection_expression=CANVAS_LISTING_PROJECTION
             )
             # Group by canvas_id and take the latest version
             canvas_map: Dict[str, CanvasDO] = {}
@@ -118,17 +245,116 @@ class CanvasDAO(BaseDynamoDBDAO[CanvasDO]):
             return False
 
     def list_canvas_versions(self, customer_id: str, canvas_id: str) -> List[str]:
-        """List all versions of a canvas."""
+        """List all versions of a canvas, reading only their keys."""
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key('customer_id').eq(customer_id) & 
-                Key('canvas_id_and_version').begins_with(f"{canvas_id}#")
+            items = self._iter_query(
+                Key('customer_id').eq(customer_id) &
+                Key('canvas_id_and_version').begins_with(f"{canvas_id}#"),
+                projection_expression='canvas_id_and_version'
             )
-            versions = []
-            for item in response.get('Items', []):
-                version = item['canvas_id_and_version'].split('#')[1]
-                versions.append(version)
-            return versions
+            return [item['canvas_id_and_version'].split('#')[1] for item in items]
         except Exception as e:
             self.logger.error(f"Error listing canvas versions: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def list_canvases_page(
+        self,
+        customer_id: str,
+        limit: int,
+        continuation_token: Optional[str] = None
+    ) -> Tuple[List[CanvasDO], Optional[str]]:
+        """Get one page of a customer's canvases, most recently updated first.
+
+        Reads the drafts index, so each canvas appears once.
+
+        Returns:
+            Tuple[List[CanvasDO], Optional[str]]: The canvases and the token for the next page
+
+        Raises:
+            InvalidContinuationTokenError: If ``continuation_token`` is malformed
+        """
+        page = self._query_page(
+            Key('customer_id').eq(customer_id),
+            projection_expression=CANVAS_LISTING_PROJECTION,
+            limit=limit,
+            continuation_token=continuation_token,
+            index_name=CANVAS_DRAFTS_BY_UPDATED_AT.index_name,
+            scan_index_forward=False
+        )
+        return [self.get_canvas_from_item(item) for item in page.items], page.next_token
+
+    def list_canvas_versions_page(
+        self,
+        customer_id: str,
+        canvas_id: str,
+        limit: int,
+        continuation_token: Optional[str] = None
+    ) -> Tuple[List[CanvasDO], Optional[str]]:
+        """Get one page of a canvas's versions, most recently updated first.
+
+        Returns:
+            Tuple[List[CanvasDO], Optional[str]]: The versions and the token for the next page
+
+        Raises:
+            InvalidContinuationTokenError: If ``continuation_token`` is malformed
+        """
+        page = self._query_page(
+            Key('customer_canvas_id').eq(f"{customer_id}#{canvas_id}"),
+            projection_expression=CANVAS_LISTING_PROJECTION,
+            limit=limit,
+            continuation_token=continuation_token,
+            index_name=CANVAS_VERSIONS_BY_UPDATED_AT.index_name,
+            scan_index_forward=False
+        )
+        return [self.get_canvas_from_item(item) for item in page.items], page.next_token
+
+    def backfill_listing_attributes(self) -> int:
+        """Add the listing GSI attributes to items written before the indexes existed.
+
+        Returns:
+            int: Number of items updated
+        """
+        try:
+            updated = 0
+            scan: Dict[str, Any] = {
+                'FilterExpression': 'attribute_not_exists(customer_canvas_id)',
+                'ProjectionExpression': CANVAS_LISTING_PROJECTION
+            }
+            while True:
+                response = self.table.scan(**scan)
+                for item in response.get('Items', []):
+                    canvas = self.get_canvas_from_item(item)
+                    attributes = self.get_listing_attributes(canvas)
+                    self.table.update_item(
+                        Key={'customer_id': item['customer_id'], 'canvas_id_and_version': item['canvas_id_and_version']},
+                        UpdateExpression="SET " + ", ".join(f"{name} = :{name}" for name in attributes),
+                        ExpressionAttributeValues={f":{name}": value for name, value in attributes.items()}
+                    )
+                    updated += 1
+                if 'LastEvaluatedKey' not in response:
+                    return updated
+                scan['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            self.logger.error(f"Error backfilling listing attributes: {str(e)}")
+            raise DynamoDBDAOError(f"Failed to backfill listing attributes: {str(e)}")
+
+    def delete_canvas_versions(self, customer_id: str, canvas_id: str, canvas_versions: List[str]) -> int:
+        """Delete several versions of a canvas with batched writes.
+
+        The batch writer sends up to 25 deletes per BatchWriteItem call and resends
+        any the service reports as unprocessed.
+
+        Returns:
+            int: Number of items deleted
+        """
+        try:
+            with self.table.batch_writer() as batch:
+                for canvas_version in canvas_versions:
+                    batch.delete_item(Key={
+                        'customer_id': customer_id,
+                        'canvas_id_and_version': f"{canvas_id}#{canvas_version}"
+                    })
+            return len(canvas_versions)
+        except Exception as e:
+            self.logger.error(f"Error deleting canvas versions: {str(e)}")
+            raise DynamoDBDAOError(f"Failed to delete canvas versions: {str(e)}")
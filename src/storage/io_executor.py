@@ -0,0 +1,43 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from src.config.settings import STORAGE_IO_MAX_WORKERS
+
+T = TypeVar('T')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_storage_io_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool for blocking DynamoDB and S3 calls.
+
+    The pool is bounded so a burst of requests queues for a thread instead of
+    opening more connections than the storage clients' pools hold.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=STORAGE_IO_MAX_WORKERS,
+                    thread_name_prefix="storage-io"
+                )
+    return _executor
+
+
+async def run_storage_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking storage call on the storage I/O pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_storage_io_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_storage_io_executor() -> None:
+    """Stop the storage I/O pool, waiting for in-flight calls. A later call creates a new pool."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from dataclasses_json import LetterCase, dataclass_json
-from typing import List, Optional
+from typing import Dict, List, Optional
 from src.api.models.canvas_models import CanvasNode, CanvasEdge
-from src.api.models.dataplane_models import CodeFile
+from src.api.models.dataplane_models import CodeFile, ProgrammingLanguage
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -16,6 +16,8 @@ class CanvasDO:
     updated_at: str
     canvas_definition_s3_uri: Optional[str] = None  # S3 URI pointing to the canvas definition
     canvas_code_s3_uri: Optional[str] = None  # S3 URI pointing to the canvas code
+    # Incremented by every code change; writers compare it to detect concurrent updates
+    code_version: int = 0
 
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
@@ -30,4 +32,26 @@ class CanvasDefinitionDO:
 @dataclass
 class CodeDO:
     """Code stored in S3."""
-    files: List[CodeFile]
\ No newline at end of file
+    files: List[CodeFile]
+    # Node ID -> fingerprint of the inputs the node's current code was generated from
+    fingerprints: Optional[Dict[str, str]] = None
+
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class CodeManifestEntryDO:
+    """One code file in a manifest; its content is stored under its hash."""
+    node_id: str
+    file_path: str
+    content_hash: str
+    programming_language: ProgrammingLanguage
+
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass
+class CodeManifestDO:
+    """Code stored in S3 as one content-addressed object per file, listed by this manifest."""
+    files: List[CodeManifestEntryDO]
+    fingerprints: Optional[Dict[str, str]] = None
+    # CanvasDO.code_version this manifest was written as
+    code_version: int = 0
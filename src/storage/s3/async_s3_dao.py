@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from src.config.settings import S3_MAX_POOL_CONNECTIONS
+from src.infra.config import S3Config
+from src.infra.s3.client import S3ClientFactory
+from src.storage.s3.s3_dao import S3DAONotFoundError, parse_s3_uri, translate_s3_error
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AsyncS3DAO:
+    """Async Data Access Object for S3 objects addressed by ``s3://`` URI.
+
+    boto3 is synchronous, so calls run on a thread pool owned by the DAO. The pool
+    and the client's connection pool are both ``max_pool_connections`` wide, which
+    also bounds how many S3 calls ``get_many`` and ``put_many`` make at once.
+    Errors are mapped to the same exceptions as ``S3DAO``.
+    """
+
+    def __init__(self, max_pool_connections: Optional[int] = None, client: Any = None):
+        self.max_pool_connections = max_pool_connections or S3_MAX_POOL_CONNECTIONS
+        config = S3Config(max_pool_connections=self.max_pool_connections)
+        self.bucket_name = config.bucket_name
+        self.client = client or S3ClientFactory(config).client
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_pool_connections,
+            thread_name_prefix="s3-io"
+        )
+
+    async def _call(self, operation_name: str, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking S3 call on the DAO's pool, mapping errors to S3DAOError."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except Exception as e:
+            raise translate_s3_error(operation_name, self.bucket_name, e)
+
+    def _get(self, s3_uri: str) -> str:
+        bucket, key = parse_s3_uri(s3_uri)
+        response = self.client.get_object(Bucket=bucket, Key=key)
+        return response['Body'].read().decode('utf-8')
+
+    def _put(self, s3_uri: str, content: str) -> bool:
+        bucket, key = parse_s3_uri(s3_uri)
+        self.client.put_object(Bucket=bucket, Key=key, Body=content)
+        return True
+
+    def _delete(self, s3_uri: str) -> bool:
+        bucket, key = parse_s3_uri(s3_uri)
+        self.client.delete_object(Bucket=bucket, Key=key)
+        return True
+
+    async def get_object(self, s3_uri: str) -> str:
+        """Get an object from S3.
+
+        Raises:
+            S3DAOError: If there's an error getting the object
+            S3DAONotFoundError: If the object is not found
+            S3DAOConnectionError: If there's a connection issue
+        """
+        return await self._call("getting object", self._get, s3_uri)
+
+    async def put_object(self, s3_uri: str, content: str) -> bool:
+        """Put an object in S3.
+
+        Raises:
+            S3DAOError: If there's an error putting the object
+            S3DAOConnectionError: If there's a connection issue
+        """
+        return await self._call("putting object", self._put, s3_uri, content)
+
+    async def delete_object(self, s3_uri: str) -> bool:
+        """Delete an object from S3.
+
+        Raises:
+            S3DAOError: If there's an error deleting the object
+            S3DAOConnectionError: If there's a connection issue
+        """
+        return await self._call("deleting object", self._delete, s3_uri)
+
+    async def get_many(self, s3_uris: List[str], missing_ok: bool = False) -> Dict[str, Optional[str]]:
+        """Get several objects concurrently.
+
+        Args:
+            s3_uris: URIs of the objects to get; duplicates are fetched once
+            missing_ok: Return None for objects that do not exist instead of raising
+
+        Returns:
+            Dict[str, Optional[str]]: Object contents keyed by URI
+
+        Raises:
+            S3DAOError: If any object cannot be fetched
+            S3DAONotFoundError: If an object is missing and ``missing_ok`` is not set
+        """
+        unique_uris = list(dict.fromkeys(s3_uris))
+
+        async def get_one(s3_uri: str) -> Optional[str]:
+            try:
+                return await self.get_object(s3_uri)
+            except S3DAONotFoundError:
+                if missing_ok:
+                    return None
+                raise
+
+        contents = await asyncio.gather(*(get_one(s3_uri) for s3_uri in unique_uris))
+        return dict(zip(unique_uris, contents))
+
+    async def put_many(self, objects: Dict[str, str]) -> None:
+        """Put several objects concurrently.
+
+        Args:
+            objects: Object contents keyed by URI
+
+        Raises:
+            S3DAOError: If any object cannot be written; the others may have been written
+        """
+        await asyncio.gather(*(self.put_object(s3_uri, content) for s3_uri, content in objects.items()))
+
+    async def close(self) -> None:
+        """Stop the DAO's thread pool and close the client's connections."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
+
+_shared_dao: Optional[AsyncS3DAO] = None
+_shared_dao_lock = threading.Lock()
+
+
+def get_async_s3_dao() -> AsyncS3DAO:
+    """Get the process-wide AsyncS3DAO, creating it on first use."""
+    global _shared_dao
+    if _shared_dao is None:
+        with _shared_dao_lock:
+            if _shared_dao is None:
+                _shared_dao = AsyncS3DAO()
+    return _shared_dao
+
+
+async def close_async_s3_dao() -> None:
+    """Close the process-wide AsyncS3DAO, if one was created."""
+    global _shared_dao
+    with _shared_dao_lock:
+        dao, _shared_dao = _shared_dao, None
+    if dao is not None:
+        await dao.close()
@@ -1,7 +1,7 @@
 import json
 import boto3
 import logging
-from typing import Dict, Any, Optional, List, Callable, TypeVar, cast
+from typing import Dict, Any, Optional, List, Callable, Tuple, TypeVar, cast
 from datetime import datetime
 from functools import wraps
 from src.config import S3_BUCKET_NAME
@@ -27,6 +27,33 @@ class S3DAOConnectionError(S3DAOError):
     """Exception raised when there are connection issues with S3."""
     pass
 
+def translate_s3_error(operation_name: str, bucket_name: str, error: Exception) -> S3DAOError:
+    """Map an exception raised by an S3 call to the matching S3DAOError."""
+    if isinstance(error, S3DAOError):
+        return error
+    if isinstance(error, ClientError):
+        error_code = error.response['Error']['Code']
+        if error_code == 'NoSuchBucket':
+            logger.error(f"Bucket {bucket_name} does not exist")
+            return S3DAOError(f"Bucket {bucket_name} does not exist")
+        elif error_code == 'AccessDenied':
+            logger.error(f"Access denied during {operation_name}")
+            return S3DAOError(f"Access denied during {operation_name}")
+        elif error_code == 'NoSuchKey':
+            logger.warning(f"Resource not found during {operation_name}")
+            return S3DAONotFoundError(f"Resource not found during {operation_name}")
+        else:
+            logger.error(f"Failed to {operation_name}: {str(error)}")
+            return S3DAOError(f"Failed to {operation_name}: {str(error)}")
+    if isinstance(error, BotoCoreError):
+        logger.error(f"Connection error during {operation_name}: {str(error)}")
+        return S3DAOConnectionError(f"Connection error during {operation_name}: {str(error)}")
+    if isinstance(error, json.JSONDecodeError):
+        logger.error(f"Invalid JSON during {operation_name}: {str(error)}")
+        return S3DAOError(f"Invalid JSON during {operation_name}: {str(error)}")
+    logger.error(f"Unexpected error during {operation_name}: {str(error)}")
+    return S3DAOError(f"Unexpected error during {operation_name}: {str(error)}")
+
 def handle_s3_errors(operation_name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to handle common S3 operation errors."""
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
@@ -34,32 +61,24 @@ def handle_s3_errors(operation_name: str) -> Callable[[Callable[..., T]], Callab
         def wrapper(*args: Any, **kwargs: Any) -> T:
             try:
                 return func(*args, **kwargs)
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                if error_code == 'NoSuchBucket':
-                    logger.error(f"Bucket {args[0].bucket_name} does not exist")
-                    raise S3DAOError(f"Bucket {args[0].bucket_name} does not exist")
-                elif error_code == 'AccessDenied':
-                    logger.error(f"Access denied during {operation_name}")
-                    raise S3DAOError(f"Access denied during {operation_name}")
-                elif error_code == 'NoSuchKey':
-                    logger.warning(f"Resource not found during {operation_name}")
-                    raise S3DAONotFoundError(f"Resource not found during {operation_name}")
-                else:
-                    logger.error(f"Failed to {operation_name}: {str(e)}")
-                    raise S3DAOError(f"Failed to {operation_name}: {str(e)}")
-            except BotoCoreError as e:
-                logger.error(f"Connection error during {operation_name}: {str(e)}")
-                raise S3DAOConnectionError(f"Connection error during {operation_name}: {str(e)}")
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON during {operation_name}: {str(e)}")
-                raise S3DAOError(f"Invalid JSON during {operation_name}: {str(e)}")
             except Exception as e:
-                logger.error(f"Unexpected error during {operation_name}: {str(e)}")
-                raise S3DAOError(f"Unexpected error during {operation_name}: {str(e)}")
+                raise translate_s3_error(operation_name, args[0].bucket_name, e)
         return wrapper
     return decorator
 
+def parse_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    """Split an ``s3://bucket/key`` URI into its bucket and key.
+
+    Raises:
+        S3DAOError: If the URI is not a valid S3 URI
+    """
+    if not s3_uri.startswith('s3://'):
+        raise S3DAOError(f"Invalid S3 URI: {s3_uri}")
+    parts = s3_uri[5:].split('/', 1)
+    if len(parts) != 2:
+        raise S3DAOError(f"Invalid S3 URI: {s3_uri}")
+    return parts[0], parts[1]
+
 class S3DAO:
     """Data Access Object for S3 operations. Handles code files and chat thread storage."""
     
@@ -485,6 +504,79 @@ class S3DAO:
             logger.error(f"Error getting object from S3: {str(e)}")
             raise S3DAOError(f"Failed to get object from S3: {str(e)}")
 
+    @handle_s3_errors("getting object")
+    def get_object_with_etag(self, s3_uri: str, if_none_match: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Get an object and its ETag from S3, optionally only if it has changed.
+
+        Args:
+            s3_uri: The S3 URI of the object to get
+            if_none_match: ETag of a copy the caller already has
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: The object content and its ETag. The
+            content is None if the object still has the ETag ``if_none_match``.
+
+        Raises:
+            S3DAOError: If there's an error getting the object
+            S3DAONotFoundError: If the object is not found
+            S3DAOConnectionError: If there's a connection issue
+        """
+        bucket, key = parse_s3_uri(s3_uri)
+        request = {"Bucket": bucket, "Key": key}
+        if if_none_match:
+            request["IfNoneMatch"] = if_none_match
+        try:
+            response = self.manager.client.get_object(**request)
+        except ClientError as e:
+            if if_none_match and e.response['Error']['Code'] in ('304', 'NotModified'):
+                return None, if_none_match
+            raise
+        return response['Body'].read().decode('utf-8'), response.get('ETag')
+
+    @handle_s3_errors("getting object")
+    def open_object(self, s3_uri: str) -> Any:
+        """Start getting an object from S3 without reading its content.
+
+        Args:
+            s3_uri: The S3 URI of the object to get
+
+        Returns:
+            Any: The object's botocore StreamingBody. The caller reads it and must
+            close it, which returns the connection to the pool.
+
+        Raises:
+            S3DAOError: If there's an error getting the object
+            S3DAONotFoundError: If the object is not found
+            S3DAOConnectionError: If there's a connection issue
+        """
+        bucket, key = parse_s3_uri(s3_uri)
+        return self.manager.client.get_object(Bucket=bucket, Key=key)['Body']
+
+    @handle_s3_errors("copying object")
+    def copy_object(self, source_s3_uri: str, destination_s3_uri: str) -> Optional[str]:
+        """Copy an object within S3, without downloading it.
+
+        Args:
+            source_s3_uri: The S3 URI of the object to copy
+            destination_s3_uri: The S3 URI to copy it to
+
+        Returns:
+            Optional[str]: ETag of the new object
+
+        Raises:
+            S3DAOError: If there's an error copying the object
+            S3DAONotFoundError: If the source object is not found
+            S3DAOConnectionError: If there's a connection issue
+        """
+        source_bucket, source_key = parse_s3_uri(source_s3_uri)
+        bucket, key = parse_s3_uri(destination_s3_uri)
+        response = self.manager.client.copy_object(
+            Bucket=bucket,
+            Key=key,
+            CopySource={"Bucket": source_bucket, "Key": source_key}
+        )
+        return response.get('CopyObjectResult', {}).get('ETag')
+
     @handle_s3_errors("putting object")
     def put_object(self, s3_uri: str, content: str) -> bool:
         """Put an object in S3.
@@ -553,4 +645,39 @@ class S3DAO:
             return True
         except Exception as e:
             logger.error(f"Error deleting object from S3: {str(e)}")
-            raise S3DAOError(f"Failed to delete object from S3: {str(e)}") 
\ No newline at end of file
+            raise S3DAOError(f"Failed to delete object from S3: {str(e)}") 
+
+    @handle_s3_errors("deleting objects by prefix")
+    def delete_prefix(self, s3_uri_prefix: str) -> int:
+        """Delete every object whose key starts with a prefix.
+
+        Objects are listed a page at a time and each page of up to 1000 keys is
+        removed with a single DeleteObjects call.
+
+        Args:
+            s3_uri_prefix: S3 URI of the prefix, e.g. ``s3://bucket/some/prefix/``
+
+        Returns:
+            int: Number of objects deleted
+
+        Raises:
+            S3DAOError: If any object could not be deleted
+            S3DAOConnectionError: If there's a connection issue
+        """
+        bucket, prefix = parse_s3_uri(s3_uri_prefix)
+        client = self.manager.client
+        deleted = 0
+        for page in client.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+            keys = [{"Key": obj["Key"]} for obj in page.get('Contents', [])]
+            if not keys:
+                continue
+            response = client.delete_objects(Bucket=bucket, Delete={"Objects": keys, "Quiet": True})
+            errors = response.get('Errors', [])
+            if errors:
+                raise S3DAOError(
+                    f"Failed to delete {len(errors)} objects under {s3_uri_prefix}, "
+                    f"first error: {errors[0].get('Code')} on {errors[0].get('Key')}"
+                )
+            deleted += len(keys)
+        logger.info(f"Deleted {deleted} objects under {s3_uri_prefix}")
+        return deleted
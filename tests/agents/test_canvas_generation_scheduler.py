@@ -0,0 +1,119 @@
+import re
+import asyncio
+import unittest
+from typing import Dict, Any, List
+from src.inference import BaseLLMInference
+from src.inference.models.inference_models import InferenceResponse
+from src.agents.coordinator.canvas_generation_scheduler import CanvasGenerationScheduler, CanvasCycleError
+from src.api.models.node_models import CanvasNode, CanvasNodeType, NodePosition
+from src.api.models.edge_models import CanvasEdge, CanvasEdgeType
+from src.api.models.node_configs.custom_service_node_config import CustomServiceNodeConfig
+from src.api.models.dataplane_models import ProgrammingLanguage, LanguageName
+from src.storage.models.models import CanvasDO, CanvasDefinitionDO
+
+
+def code_response(path: str, code: str) -> str:
+    return f"<NewCodeFiles><CodeFile><FilePath>{path}</FilePath><Code>{code}</Code></CodeFile></NewCodeFiles>"
+
+
+class RecordingInference(BaseLLMInference):
+    """Answers every node with a file containing ``code-of-<nodeId>`` and records the prompts it saw."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.prompts: Dict[str, str] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        match = re.search(r"Node Agent Id: (\S+)", prompt)
+        owner = match.group(1) if match else "canvas"
+        self.prompts[owner] = prompt
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return InferenceResponse(text_response=code_response(f"{owner}.py", f"code-of-{owner}"))
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"provider": "fake", "model": "fake"}
+
+
+def make_node(node_id: str) -> CanvasNode:
+    return CanvasNode(
+        nodeId=node_id,
+        nodeName=node_id,
+        nodeType=CanvasNodeType.CUSTOM_SERVICE,
+        nodePosition=NodePosition(x=0, y=0),
+        nodeConfig=CustomServiceNodeConfig(description=node_id)
+    )
+
+
+class TestCanvasGenerationScheduler(unittest.IsolatedAsyncioTestCase):
+    def make_scheduler(self, node_ids: List[str], edges: List[tuple], inference: BaseLLMInference, max_parallelism: int = 8):
+        definition = CanvasDefinitionDO(
+            nodes=[make_node(node_id) for node_id in node_ids],
+            edges=[CanvasEdge(edgeType=CanvasEdgeType.COMPOSITION, source=s, target=t) for s, t in edges]
+        )
+        canvas = CanvasDO(
+            canvas_name="Canvas",
+            customer_id="customer",
+            canvas_id="canvas-1",
+            canvas_version="draft",
+            created_at="",
+            updated_at=""
+        )
+        return CanvasGenerationScheduler(
+            inference_client=inference,
+            canvas=canvas,
+            canvas_definition=definition,
+            language=ProgrammingLanguage(name=LanguageName.PYTHON, version="3.11"),
+            max_parallelism=max_parallelism
+        )
+
+    def test_topological_order_puts_dependencies_first(self):
+        scheduler = self.make_scheduler(["c", "b", "a"], [("a", "b"), ("b", "c")], RecordingInference())
+        self.assertEqual(scheduler.topological_order(), ["a", "b", "c"])
+
+    def test_cycle_is_rejected(self):
+        scheduler = self.make_scheduler(["a", "b"], [("a", "b"), ("b", "a")], RecordingInference())
+        with self.assertRaises(CanvasCycleError):
+            scheduler.topological_order()
+
+    async def test_dependents_see_fresh_dependency_code_and_canvas_runs_last(self):
+        inference = RecordingInference()
+        scheduler = self.make_scheduler(["a", "b", "c"], [("a", "b")], inference)
+
+        result = await scheduler.run(existing_code=[])
+
+        self.assertIn("code-of-a", inference.prompts["b"])
+        self.assertNotIn("code-of-a", inference.prompts["c"])
+        # The canvas prompt sees the terminal nodes' generated code
+        self.assertIn("code-of-b", inference.prompts["canvas"])
+        self.assertIn("code-of-c", inference.prompts["canvas"])
+        self.assertEqual(sorted(result.node_results), ["a", "b", "c"])
+        self.assertEqual(
+            sorted(f.filePath for f in result.final_code),
+            ["a.py", "b.py", "c.py", "canvas.py"]
+        )
+
+    async def test_independent_nodes_respect_parallelism_limit(self):
+        inference = RecordingInference()
+        scheduler = self.make_scheduler([f"n{i}" for i in range(6)], [], inference, max_parallelism=2)
+
+        await scheduler.run(existing_code=[], include_canvas_prompt=False)
+
+        self.assertEqual(inference.max_in_flight, 2)
+
+    async def test_only_requested_nodes_are_generated(self):
+        inference = RecordingInference()
+        scheduler = self.make_scheduler(["a", "b"], [("a", "b")], inference)
+
+        result = await scheduler.run(existing_code=[], node_ids={"b"}, include_canvas_prompt=False)
+
+        self.assertEqual(list(result.node_results), ["b"])
+        self.assertNotIn("a", inference.prompts)
+
+
+if __name__ == '__main__':
+    unittest.main()
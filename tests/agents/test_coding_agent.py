@@ -0,0 +1,171 @@
+import time
+import asyncio
+import unittest
+from typing import Dict, Any
+from src.inference import BaseLLMInference
+from src.inference.models.inference_models import InferenceResponse
+from src.agents.node_agents.coding_agent import CodingAgent
+from src.agents.models.agent_models import InvokeAgentRequest, InvokeAgentQuerySource
+from src.api.models.node_models import CanvasNode, CanvasNodeType, NodePosition
+from src.api.models.node_configs.custom_service_node_config import CustomServiceNodeConfig
+from src.api.models.dataplane_models import ProgrammingLanguage, LanguageName, CodeStreamEventType
+from src.storage.models.models import CanvasDO, CanvasDefinitionDO
+
+
+def code_response(path: str) -> str:
+    return f"<NewCodeFiles><CodeFile><FilePath>{path}</FilePath><Code>pass</Code></CodeFile></NewCodeFiles>"
+
+
+class FakeInference(BaseLLMInference):
+    """Answers node and canvas prompts with configurable delays and failures."""
+
+    def __init__(self, node_delay: float = 0.0, canvas_delay: float = 0.0, canvas_error: str = None):
+        self.node_delay = node_delay
+        self.canvas_delay = canvas_delay
+        self.canvas_error = canvas_error
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        if "You are the canvas agent" in prompt:
+            await asyncio.sleep(self.canvas_delay)
+            if self.canvas_error:
+                return InferenceResponse(error=self.canvas_error)
+            return InferenceResponse(text_response=code_response("main.py"))
+        await asyncio.sleep(self.node_delay)
+        return InferenceResponse(text_response=code_response("service.py"))
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"provider": "fake", "model": "fake"}
+
+
+class TestCodingAgent(unittest.IsolatedAsyncioTestCase):
+    def make_agent(self, inference: BaseLLMInference, canvas_only: bool = False, **kwargs) -> CodingAgent:
+        node = CanvasNode(
+            nodeId="node-1",
+            nodeName="Service",
+            nodeType=CanvasNodeType.CUSTOM_SERVICE,
+            nodePosition=NodePosition(x=0, y=0),
+            nodeConfig=CustomServiceNodeConfig(description="A service")
+        )
+        canvas = CanvasDO(
+            canvas_name="Canvas",
+            customer_id="customer",
+            canvas_id="canvas-1",
+            canvas_version="draft",
+            created_at="",
+            updated_at=""
+        )
+        return CodingAgent(
+            inference_client=inference,
+            node=None if canvas_only else node,
+            canvas_definition=CanvasDefinitionDO(nodes=[node], edges=[]),
+            canvas=canvas,
+            **kwargs
+        )
+
+    async def invoke(self, agent: CodingAgent):
+        return await agent.invoke_agent(
+            invoke_agent_request=InvokeAgentRequest(query="Generate", query_source=InvokeAgentQuerySource.USER),
+            language=ProgrammingLanguage(name=LanguageName.PYTHON, version="3.11"),
+            existing_code=[]
+        )
+
+    async def test_node_and_canvas_prompts_run_concurrently(self):
+        agent = self.make_agent(FakeInference(node_delay=0.2, canvas_delay=0.2))
+
+        started = time.perf_counter()
+        response = await self.invoke(agent)
+        elapsed = time.perf_counter() - started
+
+        self.assertIsNone(response.error_message)
+        self.assertEqual(
+            [(f.nodeId, f.filePath) for f in response.code_parser_response.addedFiles],
+            [("node-1", "service.py"), ("canvas-1", "main.py")]
+        )
+        self.assertLess(elapsed, 0.35)
+
+    async def test_canvas_failure_returns_node_result(self):
+        agent = self.make_agent(FakeInference(canvas_error="throttled"))
+
+        response = await self.invoke(agent)
+
+        self.assertIsNone(response.error_message)
+        self.assertIn("throttled", response.canvas_error_message)
+        self.assertEqual([f.filePath for f in response.code_parser_response.addedFiles], ["service.py"])
+
+    async def test_canvas_timeout_returns_node_result(self):
+        agent = self.make_agent(FakeInference(canvas_delay=1.0), canvas_prompt_timeout=0.05)
+
+        response = await self.invoke(agent)
+
+        self.assertIsNone(response.error_message)
+        self.assertIn("timed out", response.canvas_error_message)
+        self.assertEqual([f.filePath for f in response.code_parser_response.addedFiles], ["service.py"])
+
+    async def test_node_timeout_fails_invocation(self):
+        agent = self.make_agent(FakeInference(node_delay=1.0), node_prompt_timeout=0.05)
+
+        response = await self.invoke(agent)
+
+        self.assertIn("timed out", response.error_message)
+        self.assertEqual(response.code_parser_response.addedFiles, [])
+
+    async def test_canvas_only_agent_reports_the_missing_node(self):
+        response = await self.invoke(self.make_agent(FakeInference(), canvas_only=True))
+
+        self.assertIsNone(response.agent_node_id)
+        self.assertIn("only runs the canvas prompt", response.error_message)
+
+    async def stream(self, agent: CodingAgent):
+        return [
+            event async for event in agent.stream_agent(
+                invoke_agent_request=InvokeAgentRequest(query="Generate", query_source=InvokeAgentQuerySource.USER),
+                language=ProgrammingLanguage(name=LanguageName.PYTHON, version="3.11"),
+                existing_code=[]
+            )
+        ]
+
+    async def test_stream_yields_files_from_both_prompts_then_done(self):
+        events = await self.stream(self.make_agent(FakeInference(node_delay=0.05)))
+
+        files = [(e.source, e.file.filePath) for e in events if e.eventType == CodeStreamEventType.FILE]
+        self.assertEqual(files, [("canvas", "main.py"), ("node", "service.py")])
+        self.assertEqual(events[-1].eventType, CodeStreamEventType.DONE)
+
+    async def test_stream_reports_canvas_failure_as_error_event(self):
+        events = await self.stream(self.make_agent(FakeInference(canvas_error="throttled")))
+
+        errors = [(e.source, e.errorMessage) for e in events if e.eventType == CodeStreamEventType.ERROR]
+        self.assertEqual(errors, [("canvas", "Inference error: throttled")])
+        self.assertIn(("node", "service.py"), [
+            (e.source, e.file.filePath) for e in events if e.eventType == CodeStreamEventType.FILE
+        ])
+        self.assertEqual(events[-1].eventType, CodeStreamEventType.DONE)
+
+    async def test_stream_emits_an_unterminated_final_file(self):
+        class TruncatedInference(FakeInference):
+            async def generate_stream(self, prompt: str):
+                if "You are the canvas agent" in prompt:
+                    yield code_response("main.py")
+                    return
+                response = (
+                    "<NewCodeFiles><CodeFile><FilePath>a.py</FilePath><Code>x=1</Code></CodeFile>"
+                    "<CodeFile><FilePath>b.py</FilePath><Code>y=2</Code>"
+                )
+                for i in range(0, len(response), 7):
+                    yield response[i:i + 7]
+
+        events = await self.stream(self.make_agent(TruncatedInference()))
+
+        node_files = [e.file for e in events if e.eventType == CodeStreamEventType.FILE and e.source == "node"]
+        self.assertEqual([(f.filePath, f.code) for f in node_files], [("a.py", "x=1"), ("b.py", "y=2")])
+        self.assertEqual(events[-1].eventType, CodeStreamEventType.DONE)
+
+    async def test_canvas_only_agent_streams_an_error(self):
+        events = await self.stream(self.make_agent(FakeInference(), canvas_only=True))
+
+        self.assertEqual([e.eventType for e in events], [CodeStreamEventType.ERROR, CodeStreamEventType.DONE])
+        self.assertEqual(events[0].source, "node")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import httpx
+from src.api.auth.cognito_http import CognitoHttpClient
+
+
+class ScriptedTransport(httpx.AsyncBaseTransport):
+    """Answers requests with a fixed sequence of status codes."""
+
+    def __init__(self, *status_codes):
+        self.status_codes = list(status_codes)
+        self.requests = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        return httpx.Response(self.status_codes.pop(0), json={"error": "server_error"})
+
+
+class TestCognitoHttpClient(unittest.IsolatedAsyncioTestCase):
+    def client(self, transport):
+        return CognitoHttpClient(max_retries=2, retry_base_delay=0.001, transport=transport)
+
+    async def test_idempotent_requests_are_retried_on_server_errors(self):
+        transport = ScriptedTransport(503, 429, 200)
+        client = self.client(transport)
+
+        response = await client.post_form("https://cognito/oauth2/revoke", {"token": "t"}, idempotent=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(transport.requests), 3)
+        await client.close()
+
+    async def test_code_exchange_is_not_retried(self):
+        transport = ScriptedTransport(503, 200)
+        client = self.client(transport)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await client.post_form("https://cognito/oauth2/token", {"code": "c"})
+
+        self.assertEqual(len(transport.requests), 1)
+        await client.close()
+
+    async def test_gives_up_after_the_last_retry(self):
+        transport = ScriptedTransport(500, 500, 500, 200)
+        client = self.client(transport)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await client.get_json("https://cognito/.well-known/jwks.json")
+
+        self.assertEqual(len(transport.requests), 3)
+        await client.close()
+
+    async def test_client_errors_are_not_retried(self):
+        transport = ScriptedTransport(400, 200)
+        client = self.client(transport)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await client.post_form("https://cognito/oauth2/token", {"refresh_token": "r"}, idempotent=True)
+
+        self.assertEqual(len(transport.requests), 1)
+        await client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
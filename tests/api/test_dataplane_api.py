@@ -0,0 +1,62 @@
+import unittest
+from fastapi import HTTPException
+from src.api.dataplane import dataplane_api
+from src.api.models.dataplane_models import (
+    GenerateCanvasCodeRequest,
+    LanguageName,
+    ProgrammingLanguage,
+    RegenerateDirtyCodeRequest
+)
+from src.storage.coordinator.base_coordinator import CodeConflictError, ImmutableVersionError
+
+
+class FailingCoordinator:
+    """Raises the given error from every coordinator call."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def generate_canvas_code(self, customer_id, request):
+        raise self.error
+
+    async def regenerate_dirty(self, customer_id, request):
+        raise self.error
+
+
+class TestDataplaneErrors(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.handler = dataplane_api.dataplane_handler
+        self.coordinator = self.handler.coordinator
+        self.language = ProgrammingLanguage(name=LanguageName.PYTHON, version="3.11")
+
+    def tearDown(self):
+        self.handler.coordinator = self.coordinator
+
+    async def assert_status(self, endpoint, request_model, error: Exception, status_code: int):
+        self.handler.coordinator = FailingCoordinator(error)
+
+        with self.assertRaises(HTTPException) as raised:
+            await endpoint(request_model=request_model, customer_id="customer")
+
+        self.assertEqual(raised.exception.status_code, status_code)
+        self.assertEqual(raised.exception.detail, str(error))
+
+    async def test_generate_canvas_code_errors_keep_their_status(self):
+        request_model = GenerateCanvasCodeRequest(canvasId="canvas", canvasVersion="v1", programmingLanguage=self.language)
+        endpoint = dataplane_api.generate_canvas_code
+
+        await self.assert_status(endpoint, request_model, ImmutableVersionError("Cannot modify non-draft version: v1"), 400)
+        await self.assert_status(endpoint, request_model, CodeConflictError("Files changed concurrently"), 409)
+        await self.assert_status(endpoint, request_model, RuntimeError("boom"), 500)
+
+    async def test_regenerate_dirty_errors_keep_their_status(self):
+        request_model = RegenerateDirtyCodeRequest(canvasId="canvas", canvasVersion="v1", programmingLanguage=self.language)
+        endpoint = dataplane_api.regenerate_dirty
+
+        await self.assert_status(endpoint, request_model, ImmutableVersionError("Cannot modify non-draft version: v1"), 400)
+        await self.assert_status(endpoint, request_model, CodeConflictError("Files changed concurrently"), 409)
+        await self.assert_status(endpoint, request_model, RuntimeError("boom"), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
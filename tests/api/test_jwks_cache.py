@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from src.api.auth.cognito_auth import CognitoAuth
+from src.api.auth.cognito_http import CognitoHttpClient
+from src.api.auth.jwks_cache import JWKSCache, http_jwks_fetcher
+
+ISSUER = "https://cognito-idp.us-east-1.amazonaws.com/pool"
+
+
+def make_signing_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    public_jwk = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, {**public_jwk, "kid": kid, "use": "sig"}
+
+
+SIGNING_KEYS = {kid: make_signing_key(kid) for kid in ("key-1", "key-2")}
+
+
+def make_token(kid="key-1", **claims):
+    claims = {"sub": "customer", "iss": ISSUER, "token_use": "access", "client_id": "client",
+              "exp": int(time.time()) + 3600, **claims}
+    return jwt.encode(claims, SIGNING_KEYS[kid][0], algorithm="RS256", headers={"kid": kid})
+
+
+class StubJWKS:
+    """Serves a JWKS document, counting fetches."""
+
+    def __init__(self, kids=("key-1",), delay=0.0):
+        self.kids = list(kids)
+        self.delay = delay
+        self.fetches = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("JWKS endpoint unavailable")
+        return {"keys": [SIGNING_KEYS[kid][1] for kid in self.kids]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJWKSCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.jwks = StubJWKS(delay=0.01)
+        self.clock = FakeClock()
+        self.cache = JWKSCache(self.jwks, refresh_interval=3600, min_refresh_interval=60, clock=self.clock)
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+
+    async def test_known_keys_are_served_without_fetching(self):
+        await self.cache.get_key("key-1")
+
+        keys = [await self.cache.get_key("key-1") for _ in range(100)]
+
+        self.assertEqual(self.jwks.fetches, 1)
+        self.assertTrue(all(key is keys[0] for key in keys))
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        keys = await asyncio.gather(*(self.cache.get_key("key-1") for _ in range(50)))
+
+        self.assertEqual(self.jwks.fetches, 1)
+        self.assertTrue(all(key is not None for key in keys))
+
+    async def test_unknown_kid_is_negatively_cached(self):
+        await self.cache.get_key("key-1")
+        self.clock.now += 120
+
+        self.assertIsNone(await self.cache.get_key("made-up"))
+        for _ in range(10):
+            self.assertIsNone(await self.cache.get_key("made-up"))
+            self.assertIsNone(await self.cache.get_key("also-made-up"))
+
+        self.assertEqual(self.jwks.fetches, 2)
+
+    async def test_rotated_key_is_picked_up_on_first_use(self):
+        await self.cache.get_key("key-1")
+        self.jwks.kids.append("key-2")
+        self.clock.now += 61
+
+        self.assertIsNotNone(await self.cache.get_key("key-2"))
+        self.assertEqual(self.jwks.fetches, 2)
+
+    async def test_stale_keys_are_refreshed_in_the_background(self):
+        key = await self.cache.get_key("key-1")
+        self.clock.now += 3600
+        self.jwks.fail = True
+
+        self.assertIs(await self.cache.get_key("key-1"), key)
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(self.jwks.fetches, 2)
+        self.assertIs(await self.cache.get_key("key-1"), key)
+
+    async def test_fetches_from_a_local_endpoint(self):
+        document = json.dumps({"keys": [SIGNING_KEYS["key-1"][1]]}).encode()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(document)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = CognitoHttpClient()
+        try:
+            cache = JWKSCache(http_jwks_fetcher(f"http://127.0.0.1:{server.server_port}/.well-known/jwks.json", client))
+            self.assertIsNotNone(await cache.get_key("key-1"))
+        finally:
+            await client.close()
+            server.shutdown()
+            server.server_close()
+
+
+class TestVerifyTokenSignature(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = JWKSCache(StubJWKS(kids=("key-1",)))
+        self.issuer = patch.object(CognitoAuth, "get_issuer", return_value=ISSUER)
+        self.issuer.start()
+        self.env = patch.dict("os.environ", {"COGNITO_APP_CLIENT_ID": "client"})
+        self.env.start()
+
+    def tearDown(self):
+        self.issuer.stop()
+        self.env.stop()
+
+    async def verify(self, token):
+        return await CognitoAuth.verify_token_signature(token, jwks_cache=self.cache)
+
+    async def test_accepts_a_valid_token(self):
+        claims = await self.verify(make_token())
+
+        self.assertEqual(claims["sub"], "customer")
+
+    async def test_rejects_a_tampered_token(self):
+        header, payload, signature = make_token().split(".")
+        other_payload = make_token(sub="someone-else").split(".")[1]
+
+        self.assertIsNone(await self.verify(f"{header}.{other_payload}.{signature}"))
+
+    async def test_rejects_tokens_signed_with_unpublished_keys(self):
+        self.assertIsNone(await self.verify(make_token(kid="key-2")))
+
+    async def test_rejects_expired_wrong_issuer_and_wrong_client_tokens(self):
+        self.assertIsNone(await self.verify(make_token(exp=int(time.time()) - 1)))
+        self.assertIsNone(await self.verify(make_token(iss="https://example.com")))
+        self.assertIsNone(await self.verify(make_token(client_id="other")))
+        self.assertIsNone(await self.verify("not-a-token"))
+
+
+if __name__ == '__main__':
+    unittest.main()
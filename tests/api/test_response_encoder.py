@@ -0,0 +1,223 @@
+import json
+import unittest
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional
+from dataclasses_json import config, dataclass_json
+from src.api.canvas_api import handle_response
+from src.api.models.canvas_models import GetCanvasResponse, ListCanvasResponse, ListCanvasResponseItem
+from src.api.models.edge_models import CanvasEdge, CanvasEdgeType
+from src.api.models.node_models import CanvasNode, CanvasNodeType, NodePosition
+from src.api.models.node_configs.ddb_node_config import DynamoDbNodeConfig, DynamoDBAttributeConfig, DynamoDBAttributeType
+from src.api.models.node_configs.custom_service_node_config import CustomServiceNodeConfig
+from src.api.response_encoder import CompiledJSONEncoder, OrjsonEncoder, orjson
+from src.storage.deletion_jobs import DeletionJob, DeletionJobStatus
+from src.storage.models.models import CanvasDO
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Empty:
+    pass
+
+
+@dataclass_json
+@dataclass
+class WithEncoder:
+    value: int = field(metadata=config(encoder=lambda v: f"#{v}"))
+    note: Optional[str] = None
+
+
+@dataclass
+class Totals:
+    count: int
+    total: int
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.total / self.count}
+
+
+def make_canvas_response():
+    nodes = [
+        CanvasNode(
+            nodeId="table",
+            nodeName="Orders \"table\"",
+            nodeType=CanvasNodeType.DYNAMO_DB,
+            nodePosition=NodePosition(x=1, y=2.5),
+            nodeConfig=DynamoDbNodeConfig(
+                hashKey="orderId",
+                attributes=[DynamoDBAttributeConfig(name="orderId", type=DynamoDBAttributeType.STRING)]
+            )
+        ),
+        CanvasNode(
+            nodeId="worker",
+            nodeName="Wörker\n",
+            nodeType=CanvasNodeType.CUSTOM_SERVICE,
+            nodePosition=NodePosition(x=0, y=0),
+            nodeConfig=CustomServiceNodeConfig(description="Reconciles orders")
+        ),
+        CanvasNode(
+            nodeId="empty",
+            nodeName="Unconfigured",
+            nodeType=CanvasNodeType.S3_BUCKET,
+            nodePosition=NodePosition(x=-3, y=4),
+            nodeConfig=None
+        )
+    ]
+    return GetCanvasResponse(
+        canvasId="canvas-1",
+        canvasVersion="2",
+        canvasName="Shop",
+        createdAt="2024-01-01T00:00:00",
+        updatedAt="2024-01-02T00:00:00",
+        nodes=nodes,
+        edges=[CanvasEdge(edgeType=CanvasEdgeType.COMPOSITION, source="worker", target="table")]
+    )
+
+
+EXPECTED_CANVAS = {
+    "canvasId": "canvas-1",
+    "canvasVersion": "2",
+    "canvasName": "Shop",
+    "createdAt": "2024-01-01T00:00:00",
+    "updatedAt": "2024-01-02T00:00:00",
+    "nodes": [
+        {
+            "nodeId": "table",
+            "nodeName": "Orders \"table\"",
+            "nodeType": "DYNAMO_DB",
+            "nodePosition": {"x": 1.0, "y": 2.5},
+            "nodeConfig": {"hashKey": "orderId", "attributes": [{"name": "orderId", "type": "String"}], "rangeKey": None}
+        },
+        {
+            "nodeId": "worker",
+            "nodeName": "Wörker\n",
+            "nodeType": "CUSTOM_SERVICE",
+            "nodePosition": {"x": 0.0, "y": 0.0},
+            "nodeConfig": {"description": "Reconciles orders"}
+        },
+        {
+            "nodeId": "empty",
+            "nodeName": "Unconfigured",
+            "nodeType": "S3_BUCKET",
+            "nodePosition": {"x": -3.0, "y": 4.0},
+            "nodeConfig": None
+        }
+    ],
+    "edges": [{"edgeType": "composition", "source": "worker", "target": "table"}]
+}
+
+
+class EncoderContract:
+    """Behaviour shared by every response encoder."""
+
+    def make_encoder(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.encoder = self.make_encoder()
+
+    def decode(self, content):
+        body = self.encoder.encode(content)
+        self.assertIsInstance(body, bytes)
+        return json.loads(body)
+
+    def test_encodes_a_canvas_response(self):
+        response = make_canvas_response()
+
+        self.assertEqual(self.decode(response), EXPECTED_CANVAS)
+        # Handlers return the response's attribute dict
+        self.assertEqual(self.decode(response.__dict__), EXPECTED_CANVAS)
+
+    def test_keys_follow_the_dataclass_letter_case(self):
+        canvas = CanvasDO(
+            canvas_name="Shop", customer_id="customer", canvas_id="canvas-1", canvas_version="1",
+            created_at="a", updated_at="b"
+        )
+
+        self.assertEqual(self.decode(canvas), json.loads(canvas.to_json()))
+        self.assertIn("canvasId", self.decode(canvas))
+
+    def test_plain_dataclasses_keep_field_names(self):
+        job = DeletionJob(
+            job_id="job", customer_id="customer", canvas_id="canvas", status=DeletionJobStatus.RUNNING,
+            created_at="now"
+        )
+
+        self.assertEqual(self.decode(job)["job_id"], "job")
+        self.assertEqual(self.decode(job)["status"], DeletionJobStatus.RUNNING.value)
+
+    def test_field_encoders_go_through_to_dict(self):
+        self.assertEqual(self.decode(WithEncoder(value=3)), {"value": "#3", "note": None})
+
+    def test_classes_with_their_own_to_dict_use_it(self):
+        self.assertEqual(self.decode([Totals(count=2, total=5)]), [{"count": 2, "mean": 2.5}])
+
+    def test_canvas_nodes_encode_as_in_the_canvas_response(self):
+        # @dataclass_json replaces CanvasNode's hand-written to_dict; its document is
+        # the one the canvas response carries
+        for node, expected in zip(make_canvas_response().nodes, EXPECTED_CANVAS["nodes"]):
+            self.assertEqual(self.decode(node), expected)
+
+    def test_scalars_and_empty_containers(self):
+        content = {
+            "list": [], "dict": {}, "empty": Empty(), "none": None, "flag": False,
+            "count": 7, "ratio": 0.1, "color": Color.RED, "text": "tab\tand ☃", Color.RED: 1
+        }
+
+        self.assertEqual(self.decode(content), {
+            "list": [], "dict": {}, "empty": {}, "none": None, "flag": False,
+            "count": 7, "ratio": 0.1, "color": "red", "text": "tab\tand ☃", "red": 1
+        })
+        self.assertEqual(self.decode(ListCanvasResponse(canvases=[])), {"canvases": [], "nextCursor": None})
+
+    def test_matches_the_previous_output_for_listings(self):
+        response = ListCanvasResponse(
+            canvases=[ListCanvasResponseItem("canvas-1", "Shop", "1", "a", "b")], nextCursor="next"
+        )
+
+        self.assertEqual(self.decode(response), json.loads(json.dumps(response.to_dict())))
+
+    def test_rejects_unserializable_values(self):
+        with self.assertRaises(TypeError):
+            self.encoder.encode({"value": object()})
+
+
+class TestCompiledJSONEncoder(EncoderContract, unittest.TestCase):
+    def make_encoder(self):
+        return CompiledJSONEncoder()
+
+    def test_output_is_compact_and_reuses_writers(self):
+        self.encoder.encode(make_canvas_response())
+        writers = len(self.encoder._writers)
+
+        body = self.encoder.encode(make_canvas_response())
+
+        self.assertEqual(len(self.encoder._writers), writers)
+        self.assertEqual(body, json.dumps(EXPECTED_CANVAS, ensure_ascii=False, separators=(",", ":")).encode())
+
+    def test_rejects_non_finite_floats(self):
+        with self.assertRaises(ValueError):
+            self.encoder.encode({"value": float("nan")})
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class TestOrjsonEncoder(EncoderContract, unittest.TestCase):
+    def make_encoder(self):
+        return OrjsonEncoder()
+
+
+class TestHandleResponse(unittest.TestCase):
+    def test_returns_encoded_json(self):
+        response = handle_response({"data": make_canvas_response().__dict__, "status_code": 201})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.media_type, "application/json")
+        self.assertEqual(json.loads(response.body), EXPECTED_CANVAS)
+
+
+if __name__ == '__main__':
+    unittest.main()
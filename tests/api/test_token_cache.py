@@ -0,0 +1,99 @@
+import base64
+import json
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi import HTTPException
+from src.api.auth.cognito_auth import CognitoAuth
+from src.api.auth.token_cache import VerifiedTokenCache
+
+
+def unsigned_token(**claims):
+    def segment(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    claims = {"sub": "customer", "exp": int(time.time()) + 3600, **claims}
+    return f"{segment({'alg': 'RS256', 'kid': 'key'})}.{segment(claims)}.signature"
+
+
+def request_with(token):
+    return SimpleNamespace(headers={"Authorization": f"Bearer {token}"})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = VerifiedTokenCache(max_entries=2, clock=self.clock)
+
+    def test_entries_expire_with_the_token(self):
+        self.cache.put("token", "customer", expires_at=1010)
+
+        self.assertEqual(self.cache.get("token"), "customer")
+        self.clock.now = 1010
+        self.assertIsNone(self.cache.get("token"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put("a", "customer-a", expires_at=2000)
+        self.cache.put("b", "customer-b", expires_at=2000)
+        self.cache.get("a")
+
+        self.cache.put("c", "customer-c", expires_at=2000)
+
+        self.assertEqual(self.cache.get("a"), "customer-a")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), "customer-c")
+
+    def test_raw_tokens_are_not_kept(self):
+        self.cache.put("secret-token", "customer", expires_at=2000)
+
+        self.assertNotIn("secret-token", self.cache._entries)
+
+
+class TestGetCustomerId(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = patch.object(CognitoAuth, "token_cache", VerifiedTokenCache(max_entries=10))
+        self.cache.start()
+        self.env = patch.dict("os.environ", {"FLASK_ENV": "production"})
+        self.env.start()
+
+    def tearDown(self):
+        self.cache.stop()
+        self.env.stop()
+
+    async def test_repeat_requests_skip_decoding(self):
+        token = unsigned_token()
+
+        with patch.object(CognitoAuth, "verify_token_claims", wraps=CognitoAuth.verify_token_claims) as verify:
+            customer_ids = [await CognitoAuth.get_customer_id(request_with(token)) for _ in range(5)]
+
+        self.assertEqual(customer_ids, ["customer"] * 5)
+        self.assertEqual(verify.call_count, 1)
+
+    async def test_rejected_tokens_are_not_cached(self):
+        token = unsigned_token(exp=int(time.time()) - 1)
+
+        for _ in range(2):
+            with self.assertRaises(HTTPException) as raised:
+                await CognitoAuth.get_customer_id(request_with(token))
+            self.assertEqual(raised.exception.status_code, 401)
+        self.assertEqual(len(CognitoAuth.token_cache), 0)
+
+    async def test_authenticated_requests_do_not_log(self):
+        token = unsigned_token()
+
+        with self.assertNoLogs("src.api.auth", level="INFO"):
+            await CognitoAuth.get_customer_id(request_with(token))
+            await CognitoAuth.get_customer_id(request_with(token))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import io
+import json
+import time
+import asyncio
+import unittest
+from src.inference.bedrock_inference import BedrockInference
+
+
+class SlowBedrockClient:
+    """Stand-in for the bedrock-runtime client that blocks like a real invoke_model call."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def invoke_model(self, modelId: str, body: str):
+        time.sleep(self.delay)
+        payload = json.dumps({"content": [{"text": json.loads(body)["messages"][0]["content"]}]})
+        return {"body": io.BytesIO(payload.encode("utf-8"))}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str):
+        words = json.loads(body)["messages"][0]["content"].split(" ")
+        return {"body": SlowEventStream(words, self.delay)}
+
+
+class SlowEventStream:
+    """Stand-in for the botocore event stream, yielding one word per delay."""
+
+    def __init__(self, words, delay: float):
+        self.words = words
+        self.delay = delay
+        self.closed = False
+
+    def __iter__(self):
+        yield {"chunk": {"bytes": json.dumps({"type": "message_start"}).encode("utf-8")}}
+        for word in self.words:
+            time.sleep(self.delay)
+            delta = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": word + " "}}
+            yield {"chunk": {"bytes": json.dumps(delta).encode("utf-8")}}
+
+    def close(self):
+        self.closed = True
+
+
+class TestBedrockInference(unittest.IsolatedAsyncioTestCase):
+    def make_inference(self, delay: float, max_concurrency: int, queue_timeout: float = 30) -> BedrockInference:
+        inference = BedrockInference(max_concurrency=max_concurrency, queue_timeout=queue_timeout)
+        inference.client = SlowBedrockClient(delay)
+        return inference
+
+    async def test_generate_does_not_block_event_loop(self):
+        inference = self.make_inference(delay=0.3, max_concurrency=8)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(inference.generate(f"prompt-{i}") for i in range(8)))
+        elapsed = time.perf_counter() - started
+        ticker_task.cancel()
+
+        self.assertEqual([r.text_response for r in responses], [f"prompt-{i}" for i in range(8)])
+        # All eight calls ran concurrently and the loop kept ticking while they ran
+        self.assertLess(elapsed, 1.0)
+        self.assertGreater(ticks, 15)
+
+    async def test_requests_beyond_capacity_are_rejected_after_queue_timeout(self):
+        inference = self.make_inference(delay=0.5, max_concurrency=1, queue_timeout=0.05)
+
+        first, second = await asyncio.gather(inference.generate("a"), inference.generate("b"))
+
+        self.assertEqual(first.text_response, "a")
+        self.assertIsNone(second.text_response)
+        self.assertIn("busy", second.error)
+
+    async def test_cancelled_caller_keeps_slot_until_thread_finishes(self):
+        inference = self.make_inference(delay=0.3, max_concurrency=1, queue_timeout=0.1)
+
+        task = asyncio.create_task(inference.generate("slow"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        # The worker thread is still busy, so the slot must not be handed out yet
+        response = await inference.generate("next")
+        self.assertIn("busy", response.error)
+
+
+    async def test_generate_stream_yields_deltas_as_they_arrive(self):
+        inference = self.make_inference(delay=0.1, max_concurrency=1)
+
+        started = time.perf_counter()
+        arrivals = []
+        async for text in inference.generate_stream("one two three"):
+            arrivals.append((text, time.perf_counter() - started))
+
+        self.assertEqual("".join(text for text, _ in arrivals), "one two three ")
+        # The first delta arrives well before the whole completion
+        self.assertLess(arrivals[0][1], 0.25)
+        self.assertGreater(arrivals[-1][1], 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from src.inference.bedrock_inference import BedrockInference
+from src.inference.client_registry import InferenceClientRegistry
+
+
+class TestInferenceClientRegistry(unittest.IsolatedAsyncioTestCase):
+    async def test_clients_are_shared_per_provider_model_and_region(self):
+        registry = InferenceClientRegistry()
+
+        first = registry.get("bedrock")
+        self.assertIsInstance(first, BedrockInference)
+        self.assertIs(registry.get("bedrock"), first)
+        self.assertIsNot(registry.get("bedrock", region="eu-west-1"), first)
+        self.assertIsNot(registry.get("bedrock", model="anthropic.claude-3-sonnet-20240229-v1:0"), first)
+
+        await registry.close()
+
+    async def test_close_shuts_clients_down_and_forgets_them(self):
+        registry = InferenceClientRegistry()
+        client = registry.get("bedrock")
+
+        await registry.close()
+
+        self.assertTrue(client._executor._shutdown)
+        self.assertIsNot(registry.get("bedrock"), client)
+        await registry.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
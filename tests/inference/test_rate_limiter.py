@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+from typing import Dict, Any
+from src.inference import BaseLLMInference, InferenceStreamError
+from src.inference.models.inference_models import InferenceResponse
+from src.inference.rate_limiter import AdaptiveRateLimiter, RateLimitedInference, RateLimitExceededError, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ThrottlingInference(BaseLLMInference):
+    def __init__(self, throttle: bool = False):
+        self.throttle = throttle
+        self.calls = 0
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        self.calls += 1
+        if self.throttle:
+            return InferenceResponse(error="ThrottlingException", throttled=True)
+        return InferenceResponse(text_response="ok")
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"provider": "fake", "model": "fake", "max_tokens": 100}
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_refills_at_the_scaled_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, clock=clock)
+        bucket.take(60)
+
+        self.assertAlmostEqual(bucket.wait_time(1, rate_fraction=1.0), 1.0)
+        self.assertAlmostEqual(bucket.wait_time(1, rate_fraction=0.5), 2.0)
+        clock.now = 10
+        self.assertEqual(bucket.wait_time(10, rate_fraction=1.0), 0.0)
+
+
+class TestAdaptiveRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_queue_until_quota_refills(self):
+        limiter = AdaptiveRateLimiter("fake", requests_per_minute=600, tokens_per_minute=1_000_000)
+        limiter.requests.take(600)
+
+        waited = await limiter.acquire(tokens=10)
+
+        # 600 per minute refills one request every 0.1 seconds
+        self.assertGreater(waited, 0.05)
+        self.assertEqual(limiter.metrics.admitted, 1)
+        self.assertEqual(limiter.metrics.queue_depth, 0)
+
+    async def test_rejects_when_wait_would_exceed_limit(self):
+        limiter = AdaptiveRateLimiter("fake", requests_per_minute=1, tokens_per_minute=1_000_000, max_wait_seconds=0.5)
+        await limiter.acquire(tokens=10)
+
+        with self.assertRaises(RateLimitExceededError):
+            await limiter.acquire(tokens=10)
+        self.assertEqual(limiter.metrics.rejected, 1)
+
+    async def test_rejects_when_queue_is_full(self):
+        limiter = AdaptiveRateLimiter("fake", requests_per_minute=60, tokens_per_minute=1_000_000, max_queue_depth=1)
+        limiter.requests.take(60)
+        waiting = asyncio.create_task(limiter.acquire(tokens=10))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(RateLimitExceededError):
+            await limiter.acquire(tokens=10)
+        self.assertEqual(limiter.metrics.max_queue_depth, 1)
+        waiting.cancel()
+
+    async def test_throttling_halves_rate_and_success_restores_it(self):
+        limiter = AdaptiveRateLimiter("fake", requests_per_minute=600, tokens_per_minute=1_000_000, increase_step=0.25)
+        throttled = RateLimitedInference(ThrottlingInference(throttle=True), limiter)
+
+        response = await throttled.generate("prompt")
+
+        self.assertTrue(response.throttled)
+        self.assertEqual(limiter.rate_fraction, 0.5)
+        self.assertEqual(limiter.metrics.throttled, 1)
+
+        healthy = RateLimitedInference(ThrottlingInference(), limiter)
+        await healthy.generate("prompt")
+        await healthy.generate("prompt")
+        self.assertEqual(limiter.rate_fraction, 1.0)
+
+    async def test_rejection_is_returned_as_throttled_response(self):
+        limiter = AdaptiveRateLimiter("fake", requests_per_minute=1, tokens_per_minute=1_000_000, max_wait_seconds=0)
+        client = ThrottlingInference()
+        limited = RateLimitedInference(client, limiter)
+
+        await limited.generate("prompt")
+        rejected = await limited.generate("prompt")
+
+        self.assertTrue(rejected.throttled)
+        self.assertIn("Rate limit exceeded", rejected.error)
+        self.assertEqual(client.calls, 1)
+
+    async def test_reservation_is_settled_however_the_request_ends(self):
+        class FlakyInference(ThrottlingInference):
+            async def generate(self, prompt: str) -> InferenceResponse:
+                raise ConnectionError("connection reset")
+
+            async def generate_stream(self, prompt: str):
+                yield "x" * 40
+                yield "y" * 40
+                raise InferenceStreamError("model error")
+
+        limiter = AdaptiveRateLimiter("fake", requests_per_minute=600, tokens_per_minute=10_000)
+        limited = RateLimitedInference(FlakyInference(), limiter)
+        full = limiter.tokens.tokens
+
+        with self.assertRaises(ConnectionError):
+            await limited.generate("prompt")
+        self.assertGreater(limiter.tokens.tokens, full - 10)
+
+        stream = limited.generate_stream("prompt")
+        await stream.__anext__()
+        await stream.aclose()
+        self.assertGreater(limiter.tokens.tokens, full - 30)
+
+        with self.assertRaises(InferenceStreamError):
+            async for _ in limited.generate_stream("prompt"):
+                pass
+        self.assertGreater(limiter.tokens.tokens, full - 60)
+        self.assertEqual(limiter.metrics.throttled, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
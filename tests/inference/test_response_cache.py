@@ -0,0 +1,127 @@
+import asyncio
+import unittest
+from typing import Dict, Any
+from src.inference import BaseLLMInference
+from src.inference.models.inference_models import InferenceResponse
+from src.inference.response_cache import CachingInference, InMemoryResponseCache, DiskResponseCache
+from src.inference.router import RoutingInference
+
+
+class CountingInference(BaseLLMInference):
+    def __init__(self, temperature: float = 0.7, error: str = None):
+        self.calls = 0
+        self.temperature = temperature
+        self.error = error
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        self.calls += 1
+        if self.error:
+            return InferenceResponse(error=self.error)
+        return InferenceResponse(text_response=f"answer to {prompt} #{self.calls}")
+
+    async def generate_stream(self, prompt: str):
+        self.calls += 1
+        for i in range(10):
+            yield f"{i:<10}"
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"provider": "fake", "model": "fake-1", "temperature": self.temperature}
+
+
+class TestCachingInference(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_prompt_is_served_from_cache(self):
+        client = CountingInference()
+        cached = CachingInference(client, InMemoryResponseCache())
+
+        first = await cached.generate("prompt")
+        second = await cached.generate("prompt")
+
+        self.assertEqual(first.text_response, second.text_response)
+        self.assertEqual(client.calls, 1)
+        self.assertEqual((cached.metrics.hits, cached.metrics.misses), (1, 1))
+
+    async def test_sampling_params_are_part_of_the_key(self):
+        backend = InMemoryResponseCache()
+        await CachingInference(CountingInference(temperature=0.7), backend).generate("prompt")
+
+        client = CountingInference(temperature=0.0)
+        await CachingInference(client, backend).generate("prompt")
+
+        self.assertEqual(client.calls, 1)
+
+    async def test_routed_providers_are_part_of_the_key(self):
+        backend = InMemoryResponseCache()
+        bedrock_only = RoutingInference({"bedrock": CountingInference(temperature=0.7)})
+        await CachingInference(bedrock_only, backend).generate("prompt")
+
+        # Same provider names, but one routed model generates with different sampling
+        client = CountingInference(temperature=0.0)
+        retuned = RoutingInference({"bedrock": client})
+        await CachingInference(retuned, backend).generate("prompt")
+        self.assertEqual(client.calls, 1)
+
+        # A router over a different set of providers does not reuse the entry either
+        other = CountingInference(temperature=0.7)
+        failover = RoutingInference({"bedrock": CountingInference(temperature=0.7), "openai": other})
+        key = CachingInference(failover, backend).cache_key("prompt")
+        self.assertNotEqual(key, CachingInference(bedrock_only, backend).cache_key("prompt"))
+
+    async def test_bypass_skips_lookup_but_refreshes_entry(self):
+        backend = InMemoryResponseCache()
+        client = CountingInference()
+        await CachingInference(client, backend).generate("prompt")
+
+        fresh = await CachingInference(client, backend, bypass=True).generate("prompt")
+        cached = await CachingInference(client, backend).generate("prompt")
+
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(cached.text_response, fresh.text_response)
+
+    async def test_streamed_responses_are_cached_up_to_the_limit(self):
+        async def stream(cached):
+            return "".join([chunk async for chunk in cached.generate_stream("prompt")])
+
+        client = CountingInference()
+        short_enough = CachingInference(client, InMemoryResponseCache(), max_streamed_chars=100)
+        self.assertEqual(await stream(short_enough), await stream(short_enough))
+        self.assertEqual(client.calls, 1)
+
+        client = CountingInference()
+        too_long = CachingInference(client, InMemoryResponseCache(), max_streamed_chars=99)
+        self.assertEqual(len(await stream(too_long)), 100)
+        await stream(too_long)
+        self.assertEqual(client.calls, 2)
+        self.assertEqual((too_long.metrics.stores, too_long.metrics.oversized), (0, 2))
+
+    async def test_errors_are_not_cached(self):
+        client = CountingInference(error="throttled")
+        cached = CachingInference(client, InMemoryResponseCache())
+
+        await cached.generate("prompt")
+        await cached.generate("prompt")
+
+        self.assertEqual(client.calls, 2)
+
+    async def test_memory_backend_expires_and_evicts(self):
+        backend = InMemoryResponseCache(max_entries=2, ttl_seconds=0.05)
+        await backend.set("a", "1")
+        await backend.set("b", "2")
+        await backend.get("a")
+        await backend.set("c", "3")
+
+        self.assertIsNone(await backend.get("b"))
+        self.assertEqual(await backend.get("a"), "1")
+        await asyncio.sleep(0.06)
+        self.assertIsNone(await backend.get("a"))
+
+    async def test_disk_backend_round_trip(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            backend = DiskResponseCache(directory=directory)
+            await backend.set("key", "value")
+            self.assertEqual(await backend.get("key"), "value")
+            self.assertIsNone(await backend.get("missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import time
+import asyncio
+import unittest
+from typing import Dict, Any
+from src.inference import BaseLLMInference, InferenceStreamError
+from src.inference.models.inference_models import InferenceResponse
+from src.inference.router import RoutingInference
+
+
+class FakeProvider(BaseLLMInference):
+    """Answers after a simulated latency, optionally with an error."""
+
+    def __init__(self, name: str, latency: float = 0.0, error: str = None):
+        self.name = name
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt: str) -> InferenceResponse:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            return InferenceResponse(error=self.error)
+        return InferenceResponse(text_response=self.name)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"provider": self.name, "model": self.name}
+
+
+class TestRoutingInference(unittest.IsolatedAsyncioTestCase):
+    async def test_prefers_configured_order_until_latency_is_known(self):
+        router = RoutingInference({"a": FakeProvider("a"), "b": FakeProvider("b")}, min_samples=3)
+        self.assertEqual(router.rank_providers(), ["a", "b"])
+
+    async def test_ranks_faster_provider_first_once_warm(self):
+        router = RoutingInference({"a": FakeProvider("a"), "b": FakeProvider("b")}, min_samples=3)
+        for _ in range(3):
+            router.stats["a"].record(2.0, succeeded=True)
+            router.stats["b"].record(0.5, succeeded=True)
+
+        self.assertEqual(router.rank_providers(), ["b", "a"])
+
+    async def test_unhealthy_provider_is_ranked_last(self):
+        router = RoutingInference({"a": FakeProvider("a"), "b": FakeProvider("b")}, min_samples=3)
+        for _ in range(3):
+            router.stats["a"].record(0.1, succeeded=False)
+            router.stats["b"].record(5.0, succeeded=True)
+
+        self.assertEqual(router.rank_providers(), ["b", "a"])
+
+    async def test_fails_over_to_next_provider(self):
+        failing = FakeProvider("a", error="boom")
+        router = RoutingInference({"a": failing, "b": FakeProvider("b")})
+
+        response = await router.generate("prompt")
+
+        self.assertEqual(response.text_response, "b")
+        self.assertEqual(router.stats["a"].error_rate, 1.0)
+
+    async def test_reports_every_error_when_all_providers_fail(self):
+        router = RoutingInference({"a": FakeProvider("a", error="boom"), "b": FakeProvider("b", error="bust")})
+
+        response = await router.generate("prompt")
+
+        self.assertIn("a: boom", response.error)
+        self.assertIn("b: bust", response.error)
+
+    async def test_hedges_slow_primary_after_its_p95(self):
+        slow = FakeProvider("a", latency=1.0)
+        fast = FakeProvider("b", latency=0.05)
+        router = RoutingInference({"a": slow, "b": fast}, hedge=True, min_samples=3)
+        for _ in range(3):
+            router.stats["a"].record(0.1, succeeded=True)
+
+        started = time.perf_counter()
+        response = await router.generate("prompt")
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(response.text_response, "b")
+        # Hedge started after a's p95 (0.1s) and answered 0.05s later
+        self.assertLess(elapsed, 0.5)
+        await asyncio.sleep(0)
+        self.assertEqual(slow.cancelled, 1)
+
+    async def test_cancelled_hedge_loser_counts_as_slow(self):
+        slow = FakeProvider("a", latency=1.0)
+        fast = FakeProvider("b", latency=0.05)
+        router = RoutingInference({"a": slow, "b": fast}, hedge=True, min_samples=3, window=3)
+        for _ in range(3):
+            router.stats["a"].record(0.01, succeeded=True)
+            router.stats["b"].record(0.02, succeeded=True)
+
+        for _ in range(3):
+            self.assertEqual((await router.generate("prompt")).text_response, "b")
+
+        # The slow primary's samples now reflect how long it ran before being cancelled
+        self.assertGreater(router.stats["a"].p50, 0.05)
+        self.assertEqual(router.rank_providers(), ["b", "a"])
+
+    async def test_no_hedge_when_primary_answers_within_p95(self):
+        fast = FakeProvider("a", latency=0.01)
+        backup = FakeProvider("b")
+        router = RoutingInference({"a": fast, "b": backup}, hedge=True, hedge_default_delay=0.5)
+
+        response = await router.generate("prompt")
+
+        self.assertEqual(response.text_response, "a")
+        self.assertEqual(backup.calls, 0)
+
+    async def test_stream_fails_over_before_first_chunk(self):
+        router = RoutingInference({"a": FakeProvider("a", error="boom"), "b": FakeProvider("b")})
+
+        chunks = [chunk async for chunk in router.generate_stream("prompt")]
+
+        self.assertEqual(chunks, ["b"])
+
+    async def test_stream_raises_when_all_providers_fail(self):
+        router = RoutingInference({"a": FakeProvider("a", error="boom")})
+
+        with self.assertRaises(InferenceStreamError):
+            async for _ in router.generate_stream("prompt"):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
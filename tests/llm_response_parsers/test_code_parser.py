@@ -0,0 +1,107 @@
+import unittest
+from src.agents.llm_response_parsers.code_parser import CodeParser, IncrementalCodeParser
+from src.agents.models.parser_models import CodeFileAction, ParsedCodeFile, ReasoningStep
+from src.api.models.dataplane_models import ProgrammingLanguage, LanguageName
+
+LANGUAGE = ProgrammingLanguage(name=LanguageName.PYTHON, version="3.11")
+
+RESPONSE = """
+<Reasoning>
+<Step><Reason>Add the service</Reason></Step>
+<Step><Reason>Drop the old module</Reason></Step>
+</Reasoning>
+<NewCodeFiles>
+<CodeFile><FilePath>service.py</FilePath><Code>if a < b:
+    pass</Code></CodeFile>
+<CodeFile><FilePath>models.py</FilePath><Code>class Model: pass</Code></CodeFile>
+</NewCodeFiles>
+<UpdatedCodeFiles>
+<CodeFile><FilePath>app.py</FilePath><Code>import service</Code></CodeFile>
+</UpdatedCodeFiles>
+<DeletedCodeFiles>
+<CodeFile><FilePath>old.py</FilePath><Code></Code></CodeFile>
+</DeletedCodeFiles>
+"""
+
+
+class TestIncrementalCodeParser(unittest.TestCase):
+    def feed_in_chunks(self, chunk_size: int):
+        parser = IncrementalCodeParser(canvas_id="canvas-1", node_id="node-1", language=LANGUAGE)
+        events = []
+        for start in range(0, len(RESPONSE), chunk_size):
+            events.extend(parser.feed(RESPONSE[start:start + chunk_size]))
+        return parser, events
+
+    def test_parse_extracts_every_section(self):
+        parsed = CodeParser(canvas_id="canvas-1", node_id="node-1").parse(RESPONSE, LANGUAGE)
+
+        self.assertEqual([s.reason for s in parsed.reasoningSteps], ["Add the service", "Drop the old module"])
+        self.assertEqual([f.filePath for f in parsed.addedFiles], ["service.py", "models.py"])
+        self.assertEqual(parsed.addedFiles[0].code, "if a < b:\n    pass")
+        self.assertEqual([f.filePath for f in parsed.updatedFiles], ["app.py"])
+        self.assertEqual([f.filePath for f in parsed.deletedFiles], ["old.py"])
+        self.assertEqual({f.nodeId for f in parsed.addedFiles}, {"node-1"})
+
+    def test_canvas_files_belong_to_the_canvas(self):
+        parsed = CodeParser(canvas_id="canvas-1", node_id=None).parse(RESPONSE, LANGUAGE, isCanvas=True)
+        self.assertEqual({f.nodeId for f in parsed.addedFiles}, {"canvas-1"})
+
+    def test_chunking_does_not_change_the_result(self):
+        expected = CodeParser(canvas_id="canvas-1", node_id="node-1").parse(RESPONSE, LANGUAGE)
+        for chunk_size in (1, 2, 7, 64):
+            parser, _ = self.feed_in_chunks(chunk_size)
+            parser.close()
+            self.assertEqual(parser.response(), expected, f"chunk size {chunk_size}")
+
+    def test_tolerates_missing_closing_tags(self):
+        response = (
+            "<NewCodeFiles>"
+            "<CodeFile><FilePath>a.py</FilePath><Code>a = 1</Code>"
+            "<CodeFile><FilePath>b.py</FilePath><Code>b = 2</Code>"
+            "<DeletedCodeFiles><CodeFile><FilePath>c.py</FilePath><Code></Code>"
+        )
+        parsed = CodeParser(canvas_id="canvas-1", node_id="node-1").parse(response, LANGUAGE)
+
+        self.assertEqual([f.filePath for f in parsed.addedFiles], ["a.py", "b.py"])
+        self.assertEqual([f.filePath for f in parsed.deletedFiles], ["c.py"])
+
+    def test_drops_file_truncated_inside_code(self):
+        response = "<NewCodeFiles><CodeFile><FilePath>a.py</FilePath><Code>def trunc"
+        parsed = CodeParser(canvas_id="canvas-1", node_id="node-1").parse(response, LANGUAGE)
+        self.assertEqual(parsed.addedFiles, [])
+
+    def test_emits_each_file_when_its_closing_tag_arrives(self):
+        parser = IncrementalCodeParser(canvas_id="canvas-1", node_id="node-1", language=LANGUAGE)
+        first_file_end = RESPONSE.index("</CodeFile>") + len("</CodeFile>")
+
+        self.assertEqual(
+            [e for e in parser.feed(RESPONSE[:first_file_end - 1]) if isinstance(e, ParsedCodeFile)], []
+        )
+        events = parser.feed(RESPONSE[first_file_end - 1:first_file_end])
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].action, CodeFileAction.ADDED)
+        self.assertEqual(events[0].file.filePath, "service.py")
+
+    def test_event_order_follows_the_response(self):
+        _, events = self.feed_in_chunks(5)
+        self.assertEqual(
+            [e.reason if isinstance(e, ReasoningStep) else (e.action, e.file.filePath) for e in events],
+            [
+                "Add the service",
+                "Drop the old module",
+                (CodeFileAction.ADDED, "service.py"),
+                (CodeFileAction.ADDED, "models.py"),
+                (CodeFileAction.UPDATED, "app.py"),
+                (CodeFileAction.DELETED, "old.py"),
+            ]
+        )
+
+    def test_only_the_open_element_is_buffered(self):
+        parser = IncrementalCodeParser(canvas_id="canvas-1", node_id="node-1", language=LANGUAGE)
+        parser.feed("<NewCodeFiles>" + "<CodeFile><FilePath>a.py</FilePath><Code>x</Code></CodeFile>" * 50)
+        self.assertEqual(parser._buffer, "")
+
+
+if __name__ == '__main__':
+    unittest.main()
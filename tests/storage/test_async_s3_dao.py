@@ -0,0 +1,102 @@
+import io
+import time
+import asyncio
+import unittest
+from botocore.exceptions import ClientError, EndpointConnectionError
+from src.storage.s3.async_s3_dao import AsyncS3DAO
+from src.storage.s3.s3_dao import S3DAOError, S3DAONotFoundError, S3DAOConnectionError
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "GetObject")
+
+
+class FakeS3Client:
+    """In-memory stand-in for a boto3 S3 client whose calls block like real ones."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.objects = {}
+        self.errors = {}
+        self.closed = False
+
+    def _check(self, bucket, key):
+        time.sleep(self.delay)
+        if (bucket, key) in self.errors:
+            raise self.errors[(bucket, key)]
+
+    def get_object(self, Bucket, Key):
+        self._check(Bucket, Key)
+        if (Bucket, Key) not in self.objects:
+            raise client_error("NoSuchKey")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)].encode("utf-8"))}
+
+    def put_object(self, Bucket, Key, Body):
+        self._check(Bucket, Key)
+        self.objects[(Bucket, Key)] = Body
+
+    def delete_object(self, Bucket, Key):
+        self._check(Bucket, Key)
+        self.objects.pop((Bucket, Key), None)
+
+    def close(self):
+        self.closed = True
+
+
+class TestAsyncS3DAO(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = FakeS3Client()
+        self.dao = AsyncS3DAO(max_pool_connections=8, client=self.client)
+
+    async def asyncTearDown(self):
+        await self.dao.close()
+
+    async def test_put_get_and_delete_round_trip(self):
+        await self.dao.put_object("s3://bucket/a.json", "{}")
+        self.assertEqual(await self.dao.get_object("s3://bucket/a.json"), "{}")
+
+        await self.dao.delete_object("s3://bucket/a.json")
+        with self.assertRaises(S3DAONotFoundError):
+            await self.dao.get_object("s3://bucket/a.json")
+
+    async def test_errors_are_mapped_like_the_sync_dao(self):
+        self.client.errors[("bucket", "denied")] = client_error("AccessDenied")
+        self.client.errors[("bucket", "offline")] = EndpointConnectionError(endpoint_url="https://s3")
+
+        with self.assertRaisesRegex(S3DAOError, "Access denied"):
+            await self.dao.get_object("s3://bucket/denied")
+        with self.assertRaises(S3DAOConnectionError):
+            await self.dao.get_object("s3://bucket/offline")
+        with self.assertRaisesRegex(S3DAOError, "Invalid S3 URI"):
+            await self.dao.get_object("bucket/key")
+
+    async def test_get_many_fetches_concurrently(self):
+        self.client.delay = 0.1
+        uris = [f"s3://bucket/{i}" for i in range(8)]
+        for i, uri in enumerate(uris):
+            self.client.objects[("bucket", str(i))] = str(i)
+
+        started = time.perf_counter()
+        contents = await self.dao.get_many(uris + uris[:2])
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(contents, {uri: str(i) for i, uri in enumerate(uris)})
+        self.assertLess(elapsed, 0.5)
+
+    async def test_get_many_missing_objects(self):
+        self.client.objects[("bucket", "a")] = "a"
+
+        contents = await self.dao.get_many(["s3://bucket/a", "s3://bucket/b"], missing_ok=True)
+        self.assertEqual(contents, {"s3://bucket/a": "a", "s3://bucket/b": None})
+
+        with self.assertRaises(S3DAONotFoundError):
+            await self.dao.get_many(["s3://bucket/a", "s3://bucket/b"])
+
+    async def test_put_many_writes_every_object(self):
+        await self.dao.put_many({"s3://bucket/a": "a", "s3://other/b": "b"})
+
+        self.assertEqual(self.client.objects, {("bucket", "a"): "a", ("other", "b"): "b"})
+
+
+if __name__ == '__main__':
+    unittest.main()
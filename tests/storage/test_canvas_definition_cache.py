@@ -0,0 +1,108 @@
+import json
+import unittest
+from src.storage.canvas_definition_cache import CanvasDefinitionCache
+from src.storage.coordinator.canvas_coordinator import CanvasCoordinator
+from src.storage.models.models import CanvasDO, CanvasDefinitionDO
+
+DEFINITION_JSON = json.dumps({"nodes": [], "edges": []})
+
+
+class FakeCanvasDAO:
+    def get_canvas(self, customer_id, canvas_id, canvas_version):
+        return CanvasDO(
+            canvas_name="Canvas",
+            customer_id=customer_id,
+            canvas_id=canvas_id,
+            canvas_version=canvas_version,
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T00:00:00",
+            canvas_definition_s3_uri=f"s3://bucket/canvas-definitions/{customer_id}/{canvas_id}/{canvas_version}.json"
+        )
+
+    def save_canvas(self, canvas_do):
+        return True
+
+
+class FakeS3DAO:
+    bucket_name = "bucket"
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.calls = []
+
+    def get_object_with_etag(self, s3_uri, if_none_match=None):
+        self.calls.append((s3_uri, if_none_match))
+        if if_none_match == self.etag:
+            return None, self.etag
+        return DEFINITION_JSON, self.etag
+
+    def put_object(self, s3_uri, content):
+        return True
+
+
+class TestCanvasDefinitionCache(unittest.TestCase):
+    def test_evicts_least_recently_used_entries_by_size(self):
+        cache = CanvasDefinitionCache(max_bytes=100)
+        definition = CanvasDefinitionDO(nodes=[], edges=[])
+        cache.put("a", definition, None, 40)
+        cache.put("b", definition, None, 40)
+        cache.get_entry("a")
+        cache.put("c", definition, None, 40)
+
+        self.assertIsNotNone(cache.get_entry("a"))
+        self.assertIsNone(cache.get_entry("b"))
+        self.assertEqual(cache.size_bytes, 80)
+        self.assertEqual(cache.metrics.evictions, 1)
+
+    def test_skips_objects_larger_than_the_budget(self):
+        cache = CanvasDefinitionCache(max_bytes=100)
+        cache.put("a", CanvasDefinitionDO(nodes=[], edges=[]), None, 101)
+
+        self.assertIsNone(cache.get_entry("a"))
+
+
+class TestCanvasCoordinatorDefinitionCache(unittest.TestCase):
+    def setUp(self):
+        self.coordinator = CanvasCoordinator()
+        self.coordinator.canvas_dao = FakeCanvasDAO()
+        self.coordinator.s3_dao = FakeS3DAO()
+        self.coordinator.definition_cache = CanvasDefinitionCache(max_bytes=1024)
+
+    def test_published_versions_are_served_from_cache(self):
+        self.coordinator.get_canvas("customer", "canvas", "v1")
+        _, definition = self.coordinator.get_canvas("customer", "canvas", "v1")
+
+        self.assertEqual(definition, CanvasDefinitionDO(nodes=[], edges=[]))
+        self.assertEqual(len(self.coordinator.s3_dao.calls), 1)
+        self.assertEqual(self.coordinator.definition_cache.metrics.hits, 1)
+        self.assertEqual(self.coordinator.definition_cache.metrics.misses, 1)
+
+    def test_drafts_are_revalidated_with_their_etag(self):
+        self.coordinator.get_canvas("customer", "canvas", "draft")
+        self.coordinator.get_canvas("customer", "canvas", "draft")
+        self.coordinator.s3_dao.etag = '"v2"'
+        self.coordinator.get_canvas("customer", "canvas", "draft")
+
+        uri = "s3://bucket/canvas-definitions/customer/canvas/draft.json"
+        self.assertEqual(self.coordinator.s3_dao.calls, [(uri, None), (uri, '"v1"'), (uri, '"v1"')])
+        metrics = self.coordinator.definition_cache.metrics
+        self.assertEqual((metrics.hits, metrics.revalidated, metrics.misses), (1, 1, 2))
+        self.assertEqual(self.coordinator.definition_cache.get_entry(uri).etag, '"v2"')
+
+    def test_cached_definitions_are_copied(self):
+        _, first = self.coordinator.get_canvas("customer", "canvas", "v1")
+        first.edges.append("mutated")
+        _, second = self.coordinator.get_canvas("customer", "canvas", "v1")
+
+        self.assertEqual(second.edges, [])
+
+    def test_save_invalidates_the_definition(self):
+        canvas_do, definition = self.coordinator.get_canvas("customer", "canvas", "draft")
+        self.coordinator.save_canvas(canvas_do, definition)
+
+        self.assertIsNone(self.coordinator.definition_cache.get_entry(canvas_do.canvas_definition_s3_uri))
+        self.assertEqual(self.coordinator.definition_cache.metrics.invalidations, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from boto3.dynamodb.table import BatchWriter
+from src.storage.canvas_definition_cache import CanvasDefinitionCache
+from src.storage.coordinator.canvas_coordinator import CanvasCoordinator
+from src.storage.deletion_jobs import DeletionJobRegistry, DeletionJobStatus
+from src.storage.dynamodb.canvas_dao import CanvasDAO
+from src.storage.s3.s3_dao import S3DAO, S3DAOError
+
+
+class FakeDynamoDBClient:
+    def __init__(self, items):
+        self.items = items
+        self.batches = []
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems["canvas"]
+        self.batches.append(len(requests))
+        for request in requests:
+            key = request["DeleteRequest"]["Key"]
+            self.items.discard((key["customer_id"], key["canvas_id_and_version"]))
+        return {"UnprocessedItems": {}}
+
+
+class FakeTable:
+    page_size = 100
+
+    def __init__(self, items):
+        self.items = items
+        self.client = FakeDynamoDBClient(items)
+
+    def query(self, ExclusiveStartKey=None, **kwargs):
+        keys = sorted(key for customer_id, key in self.items if key.startswith("canvas#"))
+        start = keys.index(ExclusiveStartKey["canvas_id_and_version"]) + 1 if ExclusiveStartKey else 0
+        page = keys[start:start + self.page_size]
+        response = {"Items": [{"canvas_id_and_version": key} for key in page]}
+        if start + self.page_size < len(keys):
+            response["LastEvaluatedKey"] = {"customer_id": "customer", "canvas_id_and_version": page[-1]}
+        return response
+
+    def batch_writer(self):
+        return BatchWriter("canvas", self.client)
+
+
+class FakePaginator:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def paginate(self, Bucket, Prefix):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        for start in range(0, len(keys), 1000):
+            yield {"Contents": [{"Key": key} for key in keys[start:start + 1000]]}
+
+
+class FakeS3Client:
+    def __init__(self, objects, failing_keys=()):
+        self.objects = objects
+        self.failing_keys = set(failing_keys)
+        self.delete_calls = []
+
+    def get_paginator(self, operation_name):
+        return FakePaginator(self.objects)
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self.delete_calls.append(len(keys))
+        errors = [{"Key": key, "Code": "AccessDenied"} for key in keys if key in self.failing_keys]
+        for key in keys:
+            if key not in self.failing_keys:
+                self.objects.discard(key)
+        return {"Errors": errors} if errors else {}
+
+
+class TestBulkCanvasDeletion(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.items = {("customer", f"canvas#v{i}") for i in range(60)} | {("customer", "other#draft")}
+        self.objects = (
+            {f"canvas-definitions/customer/canvas/v{i}.json" for i in range(60)}
+            | {f"customer/canvas/v0/node{i}/code.py" for i in range(2500)}
+            | {"canvas-code/customer/canvas/draft/manifest.json"}
+            | {"canvas-code/customer/canvas/blobs/abc", "canvas-code/customer/canvas/blobs/def"}
+            | {"canvas-definitions/customer/canvas2/draft.json", "canvas-code/customer/canvas2/blobs/abc"}
+        )
+        self.table = FakeTable(self.items)
+        self.s3_client = FakeS3Client(self.objects)
+
+        canvas_dao = CanvasDAO()
+        canvas_dao.table = self.table
+        s3_dao = S3DAO()
+        s3_dao.manager = SimpleNamespace(client=self.s3_client)
+        s3_dao.bucket_name = "bucket"
+        self.coordinator = CanvasCoordinator()
+        self.coordinator.canvas_dao = canvas_dao
+        self.coordinator.s3_dao = s3_dao
+        self.coordinator.definition_cache = CanvasDefinitionCache(max_bytes=0)
+
+    async def test_deletes_items_and_objects_in_batches(self):
+        deleted_items, deleted_objects = await self.coordinator.delete_canvas_all_versions("customer", "canvas")
+
+        self.assertEqual(deleted_items, 60)
+        self.assertEqual(deleted_objects, 2563)
+        self.assertEqual(self.items, {("customer", "other#draft")})
+        # The canvas's file contents go with it; another canvas's identical contents stay
+        self.assertEqual(self.objects, {"canvas-definitions/customer/canvas2/draft.json", "canvas-code/customer/canvas2/blobs/abc"})
+        self.assertEqual(self.table.client.batches, [25, 25, 10])
+        self.assertTrue(all(size <= 1000 for size in self.s3_client.delete_calls))
+        self.assertEqual(sorted(self.s3_client.delete_calls), [3, 60, 500, 1000, 1000])
+
+    async def test_objects_that_cannot_be_deleted_fail_the_deletion(self):
+        self.s3_client.failing_keys.add("canvas-definitions/customer/canvas/v1.json")
+
+        with self.assertRaises(S3DAOError):
+            await self.coordinator.delete_canvas_all_versions("customer", "canvas")
+
+
+class TestDeletionJobRegistry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.registry = DeletionJobRegistry(max_finished_jobs=2)
+
+    async def wait_for(self, job):
+        while not job.finished:
+            await asyncio.sleep(0)
+
+    async def test_job_reports_progress_and_result(self):
+        release = asyncio.Event()
+
+        async def delete():
+            await release.wait()
+            return 3, 7
+
+        job = self.registry.start("customer", "canvas", delete)
+        self.assertEqual(job.status, DeletionJobStatus.PENDING)
+        await asyncio.sleep(0)
+        self.assertEqual(self.registry.get("customer", job.job_id).status, DeletionJobStatus.RUNNING)
+        self.assertIs(self.registry.start("customer", "canvas", delete), job)
+        self.assertIsNone(self.registry.get("someone-else", job.job_id))
+
+        release.set()
+        await self.wait_for(job)
+
+        self.assertEqual(job.status, DeletionJobStatus.SUCCEEDED)
+        self.assertEqual((job.deleted_items, job.deleted_objects), (3, 7))
+        self.assertIsNotNone(job.finished_at)
+
+    async def test_failed_job_keeps_the_error(self):
+        async def delete():
+            raise S3DAOError("boom")
+
+        job = self.registry.start("customer", "canvas", delete)
+        await self.wait_for(job)
+
+        self.assertEqual(job.status, DeletionJobStatus.FAILED)
+        self.assertEqual(job.error_message, "boom")
+
+    async def test_only_recent_finished_jobs_are_kept(self):
+        async def delete():
+            return 0, 0
+
+        jobs = [self.registry.start("customer", f"canvas{i}", delete) for i in range(3)]
+        for job in jobs:
+            await self.wait_for(job)
+
+        self.assertIsNone(self.registry.get("customer", jobs[0].job_id))
+        self.assertIsNotNone(self.registry.get("customer", jobs[2].job_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+from src.api.handlers.canvas_handler import CanvasApiHandler, splice_definition
+from src.api.models.canvas_models import CanvasNode, CanvasEdge, GetCanvasRequest
+from src.api.models.json_encoder import EnumEncoder
+from src.api.models.node_models import CanvasNodeType, NodePosition
+from src.api.models.node_configs.custom_service_node_config import CustomServiceNodeConfig
+from src.api.response_encoder import encode_response
+from src.storage.canvas_definition_cache import CanvasDefinitionCache
+from src.storage.models.models import CanvasDO, CanvasDefinitionDO
+from src.storage.s3.s3_dao import S3DAONotFoundError
+
+
+class FakeCanvasDAO:
+    def __init__(self):
+        self.canvases = {}
+
+    def get_canvas(self, customer_id, canvas_id, canvas_version):
+        return self.canvases.get((customer_id, canvas_id, canvas_version))
+
+
+class FakeBody(io.BytesIO):
+    def __init__(self, content, opened):
+        super().__init__(content)
+        self.opened = opened
+        opened.append(self)
+
+
+class FakeS3DAO:
+    bucket_name = "bucket"
+
+    def __init__(self):
+        self.objects = {}
+        self.opened = []
+
+    def open_object(self, s3_uri):
+        if s3_uri not in self.objects:
+            raise S3DAONotFoundError(s3_uri)
+        return FakeBody(self.objects[s3_uri], self.opened)
+
+    def get_object_with_etag(self, s3_uri, if_none_match=None):
+        if s3_uri not in self.objects:
+            raise S3DAONotFoundError(s3_uri)
+        return self.objects[s3_uri].decode('utf-8'), None
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def stream(*parts):
+    for part in parts:
+        yield part
+
+
+def make_definition():
+    return CanvasDefinitionDO(
+        nodes=[
+            CanvasNode(
+                nodeId="worker",
+                nodeName="Wörker \"1\"",
+                nodeType=CanvasNodeType.CUSTOM_SERVICE,
+                nodePosition=NodePosition(x=1, y=2),
+                nodeConfig=CustomServiceNodeConfig(description="Reconciles orders")
+            )
+        ],
+        edges=[CanvasEdge(edgeType="composition", source="worker", target="worker")]
+    )
+
+
+class TestRawCanvasDefinition(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.handler = CanvasApiHandler()
+        self.coordinator = self.handler.coordinator
+        self.coordinator.canvas_dao = FakeCanvasDAO()
+        self.coordinator.s3_dao = FakeS3DAO()
+        self.coordinator.definition_cache = CanvasDefinitionCache(max_bytes=0)
+        self.definition_uri = self.coordinator.get_definition_s3_uri("customer", "canvas", "draft")
+        self.canvas = CanvasDO(
+            canvas_name="Canvas",
+            customer_id="customer",
+            canvas_id="canvas",
+            canvas_version="draft",
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-02T00:00:00",
+            canvas_definition_s3_uri=self.definition_uri
+        )
+        self.coordinator.canvas_dao.canvases[("customer", "canvas", "draft")] = self.canvas
+        # Stored the way save_canvas writes it
+        self.coordinator.s3_dao.objects[self.definition_uri] = json.dumps(make_definition(), cls=EnumEncoder).encode()
+        self.request = GetCanvasRequest(canvasId="canvas", canvasVersion="draft", raw=True)
+
+    async def get_parsed(self):
+        result = await self.handler.get_canvas("customer", self.request)
+        return json.loads(encode_response(result["data"]))
+
+    async def get_raw(self):
+        result = await self.handler.stream_canvas("customer", self.request)
+        if isinstance(result, dict):
+            return json.loads(encode_response(result["data"]))
+        return json.loads(await collect(result))
+
+    async def test_raw_response_matches_parsed_response(self):
+        self.assertEqual(await self.get_raw(), await self.get_parsed())
+
+    async def test_streams_in_chunks_and_closes_the_body(self):
+        self.coordinator.s3_dao.objects[self.definition_uri] = json.dumps(
+            {"nodes": [{"nodeId": f"node-{i}"} for i in range(5000)], "edges": []}
+        ).encode()
+
+        with patch(
+            "src.storage.coordinator.canvas_coordinator.CANVAS_DEFINITION_STREAM_CHUNK_BYTES", 1024
+        ):
+            result = await self.handler.stream_canvas("customer", self.request)
+            chunks = [chunk async for chunk in result]
+
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(len(json.loads(b"".join(chunks))["nodes"]), 5000)
+        self.assertTrue(all(body.closed for body in self.coordinator.s3_dao.opened))
+
+    async def test_follows_an_item_that_points_elsewhere(self):
+        other_uri = "s3://bucket/canvas-definitions/customer/canvas/moved.json"
+        self.coordinator.s3_dao.objects[other_uri] = b'{"nodes": [], "edges": []}'
+        self.canvas.canvas_definition_s3_uri = other_uri
+
+        self.assertEqual((await self.get_raw())["nodes"], [])
+        self.assertTrue(all(body.closed for body in self.coordinator.s3_dao.opened))
+
+    async def test_canvas_without_definition(self):
+        self.canvas.canvas_definition_s3_uri = None
+
+        self.assertEqual(await self.get_raw(), await self.get_parsed())
+        self.assertIsNone((await self.get_raw())["nodes"])
+        self.assertTrue(all(body.closed for body in self.coordinator.s3_dao.opened))
+
+    async def test_missing_canvas(self):
+        self.request.canvasId = "missing"
+
+        result = await self.handler.stream_canvas("customer", self.request)
+
+        self.assertEqual(result["status_code"], 404)
+        self.assertTrue(all(body.closed for body in self.coordinator.s3_dao.opened))
+
+    async def test_rejects_a_definition_that_is_not_an_object(self):
+        self.coordinator.s3_dao.objects[self.definition_uri] = b'["nodes"]'
+
+        result = await self.handler.stream_canvas("customer", self.request)
+
+        self.assertEqual(result["status_code"], 500)
+        self.assertTrue(all(body.closed for body in self.coordinator.s3_dao.opened))
+
+
+class TestSpliceDefinition(unittest.IsolatedAsyncioTestCase):
+    async def splice(self, envelope, *parts):
+        return json.loads(await collect(await splice_definition(envelope, stream(*parts))))
+
+    async def test_splits_across_chunks(self):
+        self.assertEqual(
+            await self.splice(b'{"canvasId":"c"}', b"  ", b"\n{", b"  ", b' "nodes"', b': [1, 2]}'),
+            {"canvasId": "c", "nodes": [1, 2]}
+        )
+
+    async def test_empty_object_and_empty_envelope(self):
+        self.assertEqual(await self.splice(b'{"canvasId":"c"}', b"{ }"), {"canvasId": "c"})
+        self.assertEqual(await self.splice(b"{}", b'{"nodes":[]}'), {"nodes": []})
+
+    async def test_rejects_documents_that_are_not_objects(self):
+        for parts in ([b"[1]"], [b""], [b"{"], [b"  "], []):
+            with self.assertRaises(ValueError):
+                await splice_definition(b'{"canvasId":"c"}', stream(*parts))
+
+
+if __name__ == '__main__':
+    unittest.main()
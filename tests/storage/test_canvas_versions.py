@@ -0,0 +1,106 @@
+import unittest
+from src.storage.canvas_definition_cache import CanvasDefinitionCache
+from src.storage.coordinator.canvas_coordinator import CanvasCoordinator
+from src.storage.models.models import CanvasDO, CanvasDefinitionDO
+from src.storage.s3.s3_dao import S3DAONotFoundError
+
+
+class FakeCanvasDAO:
+    def __init__(self):
+        self.canvases = {}
+
+    def get_canvas(self, customer_id, canvas_id, canvas_version):
+        return self.canvases.get((customer_id, canvas_id, canvas_version))
+
+    def create_canvas(self, canvas):
+        key = (canvas.customer_id, canvas.canvas_id, canvas.canvas_version)
+        assert key not in self.canvases
+        self.canvases[key] = canvas
+        return True
+
+
+class CopyOnlyS3DAO:
+    """Object store that fails the test if anything is downloaded or uploaded."""
+    bucket_name = "bucket"
+
+    def __init__(self):
+        self.objects = {}
+        self.copies = []
+
+    def copy_object(self, source_s3_uri, destination_s3_uri):
+        if source_s3_uri not in self.objects:
+            raise S3DAONotFoundError(source_s3_uri)
+        self.copies.append((source_s3_uri, destination_s3_uri))
+        self.objects[destination_s3_uri] = self.objects[source_s3_uri]
+        return '"etag"'
+
+
+class TestCreateCanvasVersion(unittest.TestCase):
+    def setUp(self):
+        self.coordinator = CanvasCoordinator()
+        self.coordinator.canvas_dao = FakeCanvasDAO()
+        self.coordinator.s3_dao = CopyOnlyS3DAO()
+        self.coordinator.definition_cache = CanvasDefinitionCache(max_bytes=1024)
+        self.definition_uri = self.coordinator.get_definition_s3_uri("customer", "canvas", "draft")
+        self.draft = CanvasDO(
+            canvas_name="Canvas",
+            customer_id="customer",
+            canvas_id="canvas",
+            canvas_version="draft",
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T00:00:00",
+            canvas_definition_s3_uri=self.definition_uri
+        )
+        self.coordinator.canvas_dao.canvases[("customer", "canvas", "draft")] = self.draft
+        self.coordinator.s3_dao.objects[self.definition_uri] = "definition"
+
+    def test_copies_definition_and_committed_code_server_side(self):
+        self.draft.canvas_code_s3_uri = "s3://bucket/canvas-code/customer/canvas/draft/manifests/abc.json"
+        self.draft.code_version = 7
+        self.coordinator.s3_dao.objects[self.draft.canvas_code_s3_uri] = "manifest"
+
+        version = self.coordinator.create_canvas_version("customer", "canvas")
+
+        snapshot = self.coordinator.canvas_dao.canvases[("customer", "canvas", version)]
+        definition_uri = self.coordinator.get_definition_s3_uri("customer", "canvas", version)
+        manifest_uri = self.coordinator.get_code_manifest_s3_uri("customer", "canvas", version)
+        self.assertEqual(snapshot.canvas_definition_s3_uri, definition_uri)
+        self.assertEqual(snapshot.canvas_code_s3_uri, manifest_uri)
+        self.assertEqual(snapshot.code_version, 7)
+        self.assertEqual(self.coordinator.s3_dao.copies, [
+            (self.definition_uri, definition_uri),
+            (self.draft.canvas_code_s3_uri, manifest_uri)
+        ])
+
+    def test_copies_code_stored_as_a_single_document(self):
+        legacy_uri = self.coordinator.get_code_s3_uri("customer", "canvas", "draft")
+        self.coordinator.s3_dao.objects[legacy_uri] = "code"
+
+        version = self.coordinator.create_canvas_version("customer", "canvas")
+
+        snapshot = self.coordinator.canvas_dao.canvases[("customer", "canvas", version)]
+        self.assertIsNone(snapshot.canvas_code_s3_uri)
+        self.assertEqual(self.coordinator.s3_dao.objects[self.coordinator.get_code_s3_uri("customer", "canvas", version)], "code")
+
+    def test_draft_without_code_is_snapshotted(self):
+        version = self.coordinator.create_canvas_version("customer", "canvas")
+
+        snapshot = self.coordinator.canvas_dao.canvases[("customer", "canvas", version)]
+        self.assertIsNone(snapshot.canvas_code_s3_uri)
+        self.assertEqual(snapshot.code_version, 0)
+
+    def test_cached_draft_definition_is_shared_with_the_snapshot(self):
+        definition = CanvasDefinitionDO(nodes=[], edges=[])
+        self.coordinator.definition_cache.put(self.definition_uri, definition, '"etag"', 10)
+
+        version = self.coordinator.create_canvas_version("customer", "canvas")
+
+        definition_uri = self.coordinator.get_definition_s3_uri("customer", "canvas", version)
+        self.assertEqual(self.coordinator.definition_cache.get_entry(definition_uri).definition, definition)
+
+    def test_missing_draft_returns_none(self):
+        self.assertIsNone(self.coordinator.create_canvas_version("customer", "missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,420 @@
+import json
+import time
+import asyncio
+import threading
+import unittest
+from src.storage.canvas_definition_cache import CanvasDefinitionCache
+from src.storage.coordinator.base_coordinator import StorageCoordinatorError, CodeConflictError
+from src.storage.coordinator.dataplane_coordinator import DataplaneCoordinator
+from src.storage.dynamodb.canvas_dao import CodeVersionConflictError
+from src.storage.models.models import CanvasDO, CodeDO, CanvasDefinitionDO
+from src.storage.s3.s3_dao import S3DAONotFoundError
+from src.api.models.dataplane_models import CodeFile, ProgrammingLanguage, RegenerateDirtyCodeRequest
+from src.agents.coordinator.canvas_generation_scheduler import CanvasGenerationResult, NodeGenerationResult
+from src.agents.models.parser_models import CodeParserResponse
+
+DELAY = 0.2
+
+
+def code_file(path, code, node_id="node"):
+    return CodeFile(
+        nodeId=node_id,
+        filePath=path,
+        code=code,
+        programmingLanguage=ProgrammingLanguage(name="Python", version="3.11")
+    )
+
+
+class FakeCanvasDAO:
+    """In-memory canvas table with the same conditional code pointer update as CanvasDAO."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.canvases = {}
+        self.lock = threading.Lock()
+
+    def get_canvas(self, customer_id, canvas_id, canvas_version):
+        time.sleep(self.delay)
+        with self.lock:
+            canvas = self.canvases.get((customer_id, canvas_id, canvas_version))
+            return CanvasDO(**canvas.__dict__) if canvas else None
+
+    def update_code_pointer(self, customer_id, canvas_id, canvas_version, code_s3_uri, expected_code_version):
+        with self.lock:
+            canvas = self.canvases[(customer_id, canvas_id, canvas_version)]
+            if canvas.code_version != expected_code_version:
+                raise CodeVersionConflictError("conflict")
+            canvas.canvas_code_s3_uri = code_s3_uri
+            canvas.code_version += 1
+            return canvas.code_version
+
+
+class FakeS3DAO:
+    bucket_name = "bucket"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.objects = {}
+
+    def get_object_with_etag(self, s3_uri, if_none_match=None):
+        time.sleep(self.delay)
+        if s3_uri not in self.objects:
+            raise S3DAONotFoundError(s3_uri)
+        return self.objects[s3_uri], None
+
+
+class FakeAsyncS3DAO:
+    bucket_name = "bucket"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.objects = {}
+        self.writes = []
+
+    async def get_object(self, s3_uri):
+        await asyncio.sleep(self.delay)
+        if s3_uri not in self.objects:
+            raise S3DAONotFoundError(s3_uri)
+        return self.objects[s3_uri]
+
+    async def get_many(self, s3_uris, missing_ok=False):
+        unique_uris = list(dict.fromkeys(s3_uris))
+        contents = await asyncio.gather(*(self.get_object(s3_uri) for s3_uri in unique_uris))
+        return dict(zip(unique_uris, contents))
+
+    async def put_object(self, s3_uri, content):
+        await asyncio.sleep(0)
+        self.writes.append(s3_uri)
+        self.objects[s3_uri] = content
+        return True
+
+    async def put_many(self, objects):
+        await asyncio.gather(*(self.put_object(s3_uri, content) for s3_uri, content in objects.items()))
+
+
+class DataplaneCoordinatorTestCase(unittest.IsolatedAsyncioTestCase):
+    delay = 0.0
+
+    def setUp(self):
+        self.coordinator = DataplaneCoordinator()
+        canvas_coordinator = self.coordinator.canvas_coordinator
+        canvas_coordinator.canvas_dao = FakeCanvasDAO(self.delay)
+        canvas_coordinator.s3_dao = FakeS3DAO(self.delay)
+        canvas_coordinator.definition_cache = CanvasDefinitionCache(max_bytes=0)
+        self.dao = FakeAsyncS3DAO(self.delay)
+        self.coordinator.async_s3_dao = self.dao
+
+    def add_canvas(self, definition_uri=None):
+        canvas_coordinator = self.coordinator.canvas_coordinator
+        definition_uri = definition_uri or canvas_coordinator.get_definition_s3_uri("customer", "canvas", "draft")
+        canvas_coordinator.canvas_dao.canvases[("customer", "canvas", "draft")] = CanvasDO(
+            canvas_name="Canvas",
+            customer_id="customer",
+            canvas_id="canvas",
+            canvas_version="draft",
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T00:00:00",
+            canvas_definition_s3_uri=definition_uri
+        )
+        canvas_coordinator.s3_dao.objects[definition_uri] = json.dumps({"nodes": [], "edges": []})
+
+    async def commit(self, added=(), updated=(), deleted=(), **kwargs):
+        return await self.coordinator.commit_code_changes(
+            "customer", "canvas", "draft", list(added), list(updated), list(deleted), **kwargs
+        )
+
+
+class TestLoadCanvasContent(DataplaneCoordinatorTestCase):
+    delay = DELAY
+
+    async def test_reads_item_definition_and_code_concurrently(self):
+        self.add_canvas()
+        await self.commit(added=[code_file("a.py", "print('a')")], fingerprints={"node": "abc"})
+
+        started = time.perf_counter()
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(content.canvas.canvas_id, "canvas")
+        self.assertEqual(content.canvas_definition, CanvasDefinitionDO(nodes=[], edges=[]))
+        self.assertEqual(content.code.files, [code_file("a.py", "print('a')")])
+        self.assertEqual(content.code.fingerprints, {"node": "abc"})
+        # Item, definition and manifest in parallel, then the file contents
+        self.assertLess(elapsed, 3 * DELAY)
+
+    async def test_follows_a_definition_stored_elsewhere(self):
+        self.add_canvas(definition_uri="s3://bucket/legacy/definition.json")
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+
+        self.assertEqual(content.canvas_definition, CanvasDefinitionDO(nodes=[], edges=[]))
+
+    async def test_missing_canvas_raises(self):
+        with self.assertRaises(StorageCoordinatorError):
+            await self.coordinator.load_canvas_content("customer", "missing", "draft")
+
+
+class TestPerFileCodeStorage(DataplaneCoordinatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_canvas()
+
+    async def test_round_trips_files_and_fingerprints(self):
+        files = [code_file("a.py", "a"), code_file("b.py", "b"), code_file("c.py", "a")]
+        await self.commit(added=files, fingerprints={"node": "f"})
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+
+        self.assertEqual(content.code, CodeDO(files=files, fingerprints={"node": "f"}))
+        self.assertEqual(content.code_manifest.code_version, 1)
+        # Identical contents are stored once, under the canvas's code prefix
+        blob_uris = [uri for uri in self.dao.writes if "/blobs/" in uri]
+        self.assertEqual(len(blob_uris), 2)
+        blob_prefix = self.coordinator.get_code_blob_s3_uri("customer", "canvas", "")
+        self.assertTrue(all(uri.startswith(blob_prefix) for uri in blob_uris))
+        self.assertTrue(blob_prefix.startswith(self.coordinator.canvas_coordinator.get_canvas_s3_prefixes("customer", "canvas")[1]))
+
+    async def test_only_changed_files_are_uploaded(self):
+        await self.commit(added=[code_file(f"f{i}.py", f"code {i}") for i in range(10)])
+        self.dao.writes.clear()
+
+        await self.commit(updated=[code_file("f3.py", "changed")])
+
+        changed_uri = self.coordinator.get_code_blob_s3_uri("customer", "canvas", self.coordinator.hash_code("changed"))
+        manifest_copy_uri = self.coordinator.get_code_manifest_s3_uri("customer", "canvas", "draft")
+        self.assertEqual(self.dao.writes[0], changed_uri)
+        self.assertEqual(self.dao.writes[-1], manifest_copy_uri)
+        self.assertEqual(len(self.dao.writes), 3)
+
+    async def test_reads_code_stored_as_a_single_document(self):
+        legacy_uri = self.coordinator.get_s3_uri("customer", "canvas", "draft")
+        self.dao.objects[legacy_uri] = json.dumps({"files": [code_file("a.py", "a").to_dict()]})
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+
+        self.assertIsNone(content.code_manifest)
+        self.assertEqual([f.filePath for f in content.code.files], ["a.py"])
+
+    async def test_stale_manifest_copy_is_ignored(self):
+        await self.commit(added=[code_file("a.py", "v1")])
+        manifest_copy_uri = self.coordinator.get_code_manifest_s3_uri("customer", "canvas", "draft")
+        stale_copy = self.dao.objects[manifest_copy_uri]
+        await self.commit(updated=[code_file("a.py", "v2")])
+        self.dao.objects[manifest_copy_uri] = stale_copy
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+
+        self.assertEqual(content.code.files, [code_file("a.py", "v2")])
+
+
+class TestConcurrentCodeChanges(DataplaneCoordinatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_canvas()
+
+    async def test_parallel_appliers_lose_no_updates(self):
+        await self.commit(added=[code_file("shared.py", "base")])
+
+        appliers = 20
+        versions = await asyncio.gather(*(
+            self.commit(added=[code_file(f"node{i}.py", f"code {i}", node_id=f"node{i}")])
+            for i in range(appliers)
+        ))
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        self.assertEqual(
+            sorted(f.filePath for f in content.code.files),
+            sorted(["shared.py"] + [f"node{i}.py" for i in range(appliers)])
+        )
+        self.assertEqual(sorted(versions), list(range(2, appliers + 2)))
+        self.assertEqual(content.canvas.code_version, appliers + 1)
+
+    async def test_change_is_rebased_onto_a_concurrent_change_to_other_files(self):
+        await self.commit(added=[code_file("a.py", "a"), code_file("b.py", "b")])
+        stale = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        await self.commit(updated=[code_file("a.py", "a2")])
+
+        await self.commit(updated=[code_file("b.py", "b2")], base=stale)
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        self.assertEqual(
+            sorted((f.filePath, f.code) for f in content.code.files),
+            [("a.py", "a2"), ("b.py", "b2")]
+        )
+
+    async def test_change_to_a_concurrently_changed_file_conflicts(self):
+        await self.commit(added=[code_file("a.py", "a")])
+        stale = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        await self.commit(updated=[code_file("a.py", "theirs")])
+
+        with self.assertRaises(CodeConflictError):
+            await self.commit(updated=[code_file("a.py", "ours")], base=stale)
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        self.assertEqual(content.code.files, [code_file("a.py", "theirs")])
+
+    async def test_change_based_on_a_stale_version_is_rejected(self):
+        await self.commit(added=[code_file("a.py", "a"), code_file("b.py", "b")])
+        await self.commit(updated=[code_file("a.py", "a2")])
+
+        with self.assertRaises(CodeConflictError):
+            await self.commit(updated=[code_file("b.py", "b2")], expected_code_version=1)
+        version = await self.commit(updated=[code_file("b.py", "b2")], expected_code_version=2)
+
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        self.assertEqual(version, 3)
+        self.assertEqual(
+            sorted((f.filePath, f.code) for f in content.code.files),
+            [("a.py", "a2"), ("b.py", "b2")]
+        )
+
+
+def canvas_node(node_id, description="service", x=0, y=0):
+    return {
+        "nodeId": node_id,
+        "nodeName": node_id,
+        "nodeType": "CUSTOM_SERVICE",
+        "nodePosition": {"x": x, "y": y},
+        "nodeConfig": {"description": description}
+    }
+
+
+def canvas_definition(nodes, edges=()):
+    return {
+        "nodes": nodes,
+        "edges": [{"edgeType": "composition", "source": source, "target": target} for source, target in edges]
+    }
+
+
+class FakeAgentCoordinator:
+    """Generates one file per requested node, failing the nodes in ``failing``."""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+        self.generation = 0
+
+    async def generate_canvas_code(self, canvas_definition, canvas, language, existing_code, node_ids, **kwargs):
+        self.calls.append(set(node_ids))
+        self.generation += 1
+        result = CanvasGenerationResult(final_code=list(existing_code))
+        for node_id in node_ids:
+            if node_id in self.failing:
+                result.node_results[node_id] = NodeGenerationResult(node_id=node_id, error_message="failed")
+                continue
+            file = code_file(f"{node_id}.py", f"{node_id} v{self.generation}", node_id=node_id)
+            result.node_results[node_id] = NodeGenerationResult(
+                node_id=node_id,
+                code_parser_response=CodeParserResponse(
+                    addedFiles=[file], updatedFiles=[], deletedFiles=[], reasoningSteps=[]
+                )
+            )
+            result.final_code = [f for f in result.final_code if f.filePath != file.filePath] + [file]
+        return result
+
+
+class TestDirtyNodeRegeneration(DataplaneCoordinatorTestCase):
+    """Nodes a -> b -> c form a chain; d stands alone."""
+
+    def setUp(self):
+        super().setUp()
+        self.add_canvas()
+        self.agents = FakeAgentCoordinator()
+        self.coordinator.agent_coordinator = self.agents
+        self.nodes = {node_id: canvas_node(node_id) for node_id in "abcd"}
+        self.save_definition()
+
+    def save_definition(self):
+        canvas_coordinator = self.coordinator.canvas_coordinator
+        definition_uri = canvas_coordinator.get_definition_s3_uri("customer", "canvas", "draft")
+        canvas_coordinator.s3_dao.objects[definition_uri] = json.dumps(
+            canvas_definition(list(self.nodes.values()), edges=[("a", "b"), ("b", "c")])
+        )
+
+    async def regenerate(self):
+        request = RegenerateDirtyCodeRequest(
+            canvasId="canvas",
+            canvasVersion="draft",
+            programmingLanguage=ProgrammingLanguage(name="Python", version="3.11")
+        )
+        return await self.coordinator.regenerate_dirty("customer", request)
+
+    async def stored_fingerprints(self):
+        content = await self.coordinator.load_canvas_content("customer", "canvas", "draft")
+        return content.code.fingerprints
+
+    async def test_first_run_generates_every_node(self):
+        response = await self.regenerate()
+
+        self.assertEqual(sorted(response.regeneratedNodeIds), ["a", "b", "c", "d"])
+        self.assertEqual(sorted(await self.stored_fingerprints()), ["a", "b", "c", "d"])
+
+    async def test_unchanged_nodes_are_skipped(self):
+        await self.regenerate()
+
+        response = await self.regenerate()
+
+        self.assertEqual(response.regeneratedNodeIds, [])
+        self.assertEqual(len(self.agents.calls), 1)
+
+    async def test_changed_node_marks_its_transitive_dependents_dirty(self):
+        await self.regenerate()
+        self.nodes["a"] = canvas_node("a", description="changed")
+        self.save_definition()
+
+        response = await self.regenerate()
+
+        self.assertEqual(sorted(response.regeneratedNodeIds), ["a", "b", "c"])
+        self.assertEqual(self.agents.calls[-1], {"a", "b", "c"})
+
+    async def test_change_in_the_middle_of_the_chain_skips_upstream_nodes(self):
+        await self.regenerate()
+        self.nodes["b"] = canvas_node("b", description="changed")
+        self.save_definition()
+
+        response = await self.regenerate()
+
+        self.assertEqual(sorted(response.regeneratedNodeIds), ["b", "c"])
+
+    async def test_moving_a_node_does_not_make_it_dirty(self):
+        await self.regenerate()
+        self.nodes["a"] = canvas_node("a", x=300, y=-40)
+        self.save_definition()
+
+        response = await self.regenerate()
+
+        self.assertEqual(response.regeneratedNodeIds, [])
+        self.assertEqual(len(self.agents.calls), 1)
+
+    async def test_failed_node_keeps_its_old_fingerprint_and_is_retried(self):
+        await self.regenerate()
+        before = await self.stored_fingerprints()
+        self.nodes["d"] = canvas_node("d", description="changed")
+        self.save_definition()
+        self.agents.failing = {"d"}
+
+        response = await self.regenerate()
+
+        self.assertEqual(response.nodeErrors[0].nodeId, "d")
+        self.assertEqual((await self.stored_fingerprints())["d"], before["d"])
+
+        self.agents.failing = set()
+        response = await self.regenerate()
+
+        self.assertEqual(response.regeneratedNodeIds, ["d"])
+        self.assertNotEqual((await self.stored_fingerprints())["d"], before["d"])
+
+    async def test_node_that_never_succeeded_is_retried(self):
+        self.agents.failing = {"b"}
+        await self.regenerate()
+
+        self.assertNotIn("b", await self.stored_fingerprints())
+
+        self.agents.failing = set()
+        response = await self.regenerate()
+
+        self.assertEqual(sorted(response.regeneratedNodeIds), ["b", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
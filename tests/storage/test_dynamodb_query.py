@@ -0,0 +1,215 @@
+import unittest
+from src.storage.dynamodb.base_dao import (
+    InvalidContinuationTokenError,
+    decode_continuation_token,
+    encode_continuation_token
+)
+from src.infra.dynamodb.manager import add_missing_indexes
+from src.infra.dynamodb.tables import CANVAS_TABLE
+from src.storage.dynamodb.canvas_dao import CanvasDAO
+from src.storage.models.models import CanvasDO
+from src.api.handlers.canvas_handler import get_page_limit
+from src.config.settings import LIST_PAGE_DEFAULT_LIMIT, LIST_PAGE_MAX_LIMIT
+
+
+def canvas_item(canvas_id, version):
+    return {
+        "customer_id": "customer",
+        "canvas_id_and_version": f"{canvas_id}#{version}",
+        "canvas_name": f"Canvas {canvas_id}",
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+        "canvas_definition_s3_uri": f"s3://bucket/{canvas_id}/{version}.json"
+    }
+
+
+class PagingTable:
+    """Returns at most ``page_size`` items per query, like DynamoDB's 1 MB limit."""
+
+    def __init__(self, items, page_size):
+        self.items = sorted(items, key=lambda item: item["canvas_id_and_version"])
+        self.page_size = page_size
+        self.queries = []
+
+    def query(self, KeyConditionExpression, ExclusiveStartKey=None, Limit=None, ProjectionExpression=None, **kwargs):
+        self.queries.append({"Limit": Limit, "ProjectionExpression": ProjectionExpression, **kwargs})
+        keys = [item["canvas_id_and_version"] for item in self.items]
+        start = keys.index(ExclusiveStartKey["canvas_id_and_version"]) + 1 if ExclusiveStartKey else 0
+        count = min(self.page_size, Limit or self.page_size)
+        page = self.items[start:start + count]
+        if ProjectionExpression:
+            attributes = [name.strip() for name in ProjectionExpression.split(",")]
+            page = [{name: item[name] for name in attributes if name in item} for item in page]
+        response = {"Items": page}
+        if start + count < len(self.items):
+            response["LastEvaluatedKey"] = {
+                "customer_id": "customer",
+                "canvas_id_and_version": page[-1]["canvas_id_and_version"]
+            }
+        return response
+
+
+class TestContinuationTokens(unittest.TestCase):
+    def test_round_trips_a_key(self):
+        key = {"customer_id": "customer", "canvas_id_and_version": "canvas#draft"}
+
+        token = encode_continuation_token(key)
+
+        self.assertEqual(decode_continuation_token(token), key)
+        self.assertNotIn("=", token)
+
+    def test_no_key_means_no_token(self):
+        self.assertIsNone(encode_continuation_token(None))
+        self.assertIsNone(decode_continuation_token(None))
+
+    def test_rejects_malformed_tokens(self):
+        for token in ("not base64!", encode_continuation_token({"k": "v"})[:-3] + "@@@", "WzFd"):
+            with self.assertRaises(InvalidContinuationTokenError):
+                decode_continuation_token(token)
+
+
+class TestPaginatedQueries(unittest.TestCase):
+    def setUp(self):
+        items = [canvas_item(f"c{i:03d}", version) for i in range(250) for version in ("draft", "v1")]
+        self.table = PagingTable(items, page_size=100)
+        self.dao = CanvasDAO()
+        self.dao.table = self.table
+
+    def test_unique_canvases_follow_every_page(self):
+        canvases = self.dao.get_unique_canvases("customer")
+
+        self.assertEqual(len(canvases), 250)
+        self.assertEqual(len(self.table.queries), 5)
+        self.assertTrue(all("canvas_definition_s3_uri" not in q["ProjectionExpression"] for q in self.table.queries))
+
+    def test_versions_read_only_keys_across_pages(self):
+        self.table.items = [canvas_item("c000", "draft"), canvas_item("c000", "v1")]
+        self.table.page_size = 1
+
+        versions = self.dao.list_canvas_versions("customer", "c000")
+
+        self.assertEqual(versions, ["draft", "v1"])
+        self.assertEqual(len(self.table.queries), 2)
+        self.assertEqual(self.table.queries[0]["ProjectionExpression"], "canvas_id_and_version")
+
+    def test_query_page_returns_a_token_for_the_next_page(self):
+        first = self.dao._query_page("customer_id = :cid", {":cid": "customer"}, limit=30)
+        second = self.dao._query_page("customer_id = :cid", {":cid": "customer"}, limit=30, continuation_token=first.next_token)
+
+        self.assertEqual(len(first.items), 30)
+        self.assertEqual(second.items[0]["canvas_id_and_version"], "c015#draft")
+        self.assertIsNotNone(second.next_token)
+
+
+class RecordingTable:
+    def __init__(self):
+        self.updates = []
+
+    def update_item(self, **kwargs):
+        self.updates.append(kwargs)
+
+
+class TestCanvasListing(unittest.TestCase):
+    def setUp(self):
+        self.dao = CanvasDAO()
+
+    def canvas(self, version):
+        return CanvasDO(
+            canvas_name="Canvas",
+            customer_id="customer",
+            canvas_id="canvas",
+            canvas_version=version,
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-02T00:00:00"
+        )
+
+    def test_only_drafts_are_in_the_drafts_index(self):
+        self.assertEqual(self.dao.get_listing_attributes(self.canvas("draft")), {
+            "customer_canvas_id": "customer#canvas",
+            "draft_updated_at": "2024-01-02T00:00:00"
+        })
+        self.assertEqual(self.dao.get_listing_attributes(self.canvas("v1")), {"customer_canvas_id": "customer#canvas"})
+
+    def test_saving_a_draft_moves_it_to_the_top_of_the_listing(self):
+        self.dao.table = RecordingTable()
+
+        self.dao.save_canvas(self.canvas("draft"))
+
+        values = self.dao.table.updates[0]["ExpressionAttributeValues"]
+        self.assertEqual(values[":draft_updated_at"], values[":updated_at"])
+        self.assertEqual(values[":customer_canvas_id"], "customer#canvas")
+
+    def test_committing_draft_code_moves_it_to_the_top_of_the_listing(self):
+        self.dao.table = RecordingTable()
+
+        self.dao.update_code_pointer("customer", "canvas", "draft", "s3://bucket/code.json", 0)
+        self.dao.update_code_pointer("customer", "canvas", "v1", "s3://bucket/code.json", 0)
+
+        draft_update, version_update = self.dao.table.updates
+        self.assertIn("draft_updated_at = :updated_at", draft_update["UpdateExpression"])
+        self.assertNotIn("draft_updated_at", version_update["UpdateExpression"])
+
+    def test_pages_come_from_the_listing_indexes_newest_first(self):
+        self.dao.table = PagingTable([canvas_item(f"c{i}", "draft") for i in range(5)], page_size=100)
+
+        canvases, next_cursor = self.dao.list_canvases_page("customer", limit=2)
+        versions, _ = self.dao.list_canvas_versions_page("customer", "c0", limit=2, continuation_token=next_cursor)
+
+        self.assertEqual(len(canvases), 2)
+        self.assertIsNotNone(next_cursor)
+        canvases_query, versions_query = self.dao.table.queries
+        self.assertEqual(canvases_query["IndexName"], "canvas_drafts_by_updated_at")
+        self.assertEqual(versions_query["IndexName"], "canvas_versions_by_updated_at")
+        self.assertFalse(canvases_query["ScanIndexForward"])
+        self.assertEqual(versions_query["Limit"], 2)
+
+    def test_page_limit_is_bounded(self):
+        self.assertEqual(get_page_limit(None), LIST_PAGE_DEFAULT_LIMIT)
+        self.assertEqual(get_page_limit(10), 10)
+        self.assertEqual(get_page_limit(10 ** 6), LIST_PAGE_MAX_LIMIT)
+
+
+class IndexingClient:
+    """A table that builds each new index over two describe_table calls."""
+
+    def __init__(self, index_names):
+        self.indexes = {name: 'ACTIVE' for name in index_names}
+        self.updates = []
+
+    def describe_table(self, TableName):
+        indexes = [{'IndexName': name, 'IndexStatus': status} for name, status in self.indexes.items()]
+        for name, status in self.indexes.items():
+            if status == 'CREATING':
+                self.indexes[name] = 'ACTIVE'
+        return {'Table': {'TableName': TableName, 'GlobalSecondaryIndexes': indexes}}
+
+    def update_table(self, **kwargs):
+        assert all(status == 'ACTIVE' for status in self.indexes.values()), "one index at a time"
+        self.updates.append(kwargs)
+        for update in kwargs['GlobalSecondaryIndexUpdates']:
+            self.indexes[update['Create']['IndexName']] = 'CREATING'
+
+
+class TestAddMissingIndexes(unittest.TestCase):
+    def test_adds_each_missing_index_once_the_previous_is_active(self):
+        client = IndexingClient([])
+
+        added = add_missing_indexes(client, CANVAS_TABLE, poll_seconds=0)
+
+        self.assertEqual(added, ["canvas_drafts_by_updated_at", "canvas_versions_by_updated_at"])
+        drafts_update = client.updates[0]
+        self.assertEqual(
+            {attribute["AttributeName"] for attribute in drafts_update["AttributeDefinitions"]},
+            {"customer_id", "draft_updated_at"}
+        )
+        self.assertEqual(add_missing_indexes(client, CANVAS_TABLE, poll_seconds=0), [])
+
+    def test_leaves_existing_indexes_alone(self):
+        client = IndexingClient(["canvas_drafts_by_updated_at"])
+
+        self.assertEqual(add_missing_indexes(client, CANVAS_TABLE, poll_seconds=0), ["canvas_versions_by_updated_at"])
+        self.assertEqual(len(client.updates), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import time
+import asyncio
+import threading
+import unittest
+from src.storage.io_executor import run_storage_io, shutdown_storage_io_executor
+from src.storage.coordinator.base_coordinator import BaseCoordinator
+
+
+class TestStorageIOExecutor(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        shutdown_storage_io_executor()
+
+    async def test_blocking_calls_do_not_block_the_event_loop(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await asyncio.gather(*(run_storage_io(time.sleep, 0.2) for _ in range(8)))
+        elapsed = time.perf_counter() - started
+        ticker_task.cancel()
+
+        # The calls overlap on the pool and the loop keeps running meanwhile
+        self.assertLess(elapsed, 1.0)
+        self.assertGreater(ticks, 5)
+
+    async def test_run_io_passes_arguments_and_runs_off_the_loop_thread(self):
+        loop_thread = threading.get_ident()
+
+        def call(a, b=None):
+            return a, b, threading.get_ident()
+
+        a, b, thread = await BaseCoordinator().run_io(call, 1, b=2)
+
+        self.assertEqual((a, b), (1, 2))
+        self.assertNotEqual(thread, loop_thread)
+
+    async def test_errors_propagate_to_the_caller(self):
+        def fail():
+            raise KeyError("missing")
+
+        with self.assertRaises(KeyError):
+            await run_storage_io(fail)
+
+
+if __name__ == '__main__':
+    unittest.main()